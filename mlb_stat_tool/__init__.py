@@ -0,0 +1,4 @@
+"""
+MLB Stat Tool
+Data-access layers around the MLB Stats API for the trade engine
+"""
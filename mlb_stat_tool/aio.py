@@ -0,0 +1,442 @@
+"""
+Async Stats API
+Awaitable versions of the statsapi entry points the scripts use
+
+AsyncStatsAPI lets one coroutine gather hundreds of lookups at once over a
+single pool of keep-alive connections, with a semaphore bounding how many
+are in flight. Requests are built like statsapi.get() builds them
+(streaming.endpoint_url) and awaited directly; each method then shapes the
+response the way its statsapi (1.x) counterpart does, so results match the
+sync library.
+
+The transport is a small HTTP/1.1 client on asyncio streams (stdlib only),
+so no async HTTP package is required. Like requests, it follows redirects
+and decodes chunked and gzip/deflate bodies.
+"""
+
+import asyncio
+import gzip
+import json
+import ssl
+import zlib
+from datetime import datetime
+from urllib.parse import urljoin, urlsplit
+
+import requests
+import statsapi
+from statsapi.endpoints import ENDPOINTS
+
+from .keys import canonical, request_key
+from .records import parse_roster
+from .singleflight import AsyncSingleFlight
+from .streaming import endpoint_url
+
+REDIRECT_STATUSES = {301, 302, 303, 307, 308}
+
+# The fields= values statsapi's own functions send
+LOOKUP_FIELDS = ("people,id,fullName,firstName,lastName,primaryNumber,currentTeam,id,"
+                 "primaryPosition,code,abbreviation,useName,boxscoreName,nickName,mlbDebutDate,"
+                 "nameFirstLast,firstLastName,lastFirstName,lastInitName,initLastName,"
+                 "fullFMLName,fullLFMName,nameSlug")
+STANDINGS_FIELDS = ("records,standingsType,teamRecords,team,name,division,id,nameShort,"
+                    "abbreviation,divisionRank,gamesBack,wildCardRank,wildCardGamesBack,"
+                    "wildCardEliminationNumber,divisionGamesBack,clinched,eliminationNumber,"
+                    "winningPercentage,type,wins,losses,leagueRank,sportRank")
+TEAM_LEADER_FIELDS = "teamLeaders,leaders,rank,value,person,fullName"
+LEAGUE_LEADER_FIELDS = "leagueLeaders,leaders,rank,value,team,name,league,name,person,fullName"
+ROSTER_FIELDS = "roster,person,id,fullName,jerseyNumber,position,abbreviation,status,code"
+
+
+def http_error(status, reason, url):
+    """Build the HTTPError statsapi.get would raise (via raise_for_status)."""
+    response = requests.Response()
+    response.status_code = status
+    response.reason = reason
+    response.url = url
+    return requests.HTTPError(f"{status} Client Error: {reason} for url: {url}",
+                              response=response)
+
+
+async def _read_chunked(reader):
+    """Read a chunked body (RFC 9112 section 7.1), skipping extensions and trailers."""
+    chunks = []
+    while True:
+        line = await reader.readline()
+        if not line.endswith(b"\n"):
+            raise asyncio.IncompleteReadError(line, None)
+        try:
+            size = int(line.split(b";", 1)[0].strip(), 16)
+        except ValueError:
+            raise requests.exceptions.ChunkedEncodingError(f"Bad chunk size line {line!r}")
+        if size == 0:
+            break
+        chunks.append(await reader.readexactly(size))
+        if await reader.readline() not in (b"\r\n", b"\n"):
+            raise requests.exceptions.ChunkedEncodingError("Chunk not followed by CRLF")
+    while (line := await reader.readline()) not in (b"\r\n", b"\n"):
+        if not line.endswith(b"\n"):
+            raise asyncio.IncompleteReadError(line, None)
+    return b"".join(chunks)
+
+
+def _decode(body, encoding):
+    if encoding == "gzip":
+        return gzip.decompress(body)
+    if encoding == "deflate":
+        # Servers send either zlib-wrapped or raw deflate under this name
+        try:
+            return zlib.decompress(body)
+        except zlib.error:
+            return zlib.decompress(body, -zlib.MAX_WBITS)
+    return body
+
+
+class AsyncHTTPClient:
+    """Minimal HTTP/1.1 GET client with per-host keep-alive pooling.
+
+    At most `max_connections` requests are in flight; idle connections are
+    reused, and a reused connection the server already closed is retried
+    once on a fresh one. Up to `max_redirects` redirects are followed.
+    """
+
+    def __init__(self, max_connections=16, timeout=30.0, max_redirects=10):
+        self.timeout = timeout
+        self.max_redirects = max_redirects
+        self.requests = 0
+        self.connections_opened = 0
+        self._limit = asyncio.Semaphore(max_connections)
+        self._idle = {}
+        self._ssl = None
+
+    async def get(self, url, headers=None):
+        """Return (status, reason, headers, body) for `url`, after any redirects."""
+        for _ in range(self.max_redirects + 1):
+            status, reason, response_headers, body = await self._get_once(url, headers or {})
+            location = response_headers.get("location")
+            if status not in REDIRECT_STATUSES or not location:
+                return status, reason, response_headers, body
+            url = urljoin(url, location)
+        raise requests.TooManyRedirects(f"Exceeded {self.max_redirects} redirects.")
+
+    async def _get_once(self, url, headers):
+        parts = urlsplit(url)
+        secure = parts.scheme == "https"
+        key = (parts.hostname, parts.port or (443 if secure else 80), secure)
+        target = (parts.path or "/") + ("?" + parts.query if parts.query else "")
+        async with self._limit:
+            for attempt in range(2):
+                connection, reused = await self._acquire(key)
+                try:
+                    result, keep_alive = await asyncio.wait_for(
+                        self._exchange(connection, parts.netloc, target, headers),
+                        self.timeout)
+                except (ConnectionError, asyncio.IncompleteReadError):
+                    connection[1].close()
+                    if reused and attempt == 0:
+                        continue
+                    raise
+                except BaseException:
+                    connection[1].close()
+                    raise
+                self.requests += 1
+                if keep_alive:
+                    self._idle.setdefault(key, []).append(connection)
+                else:
+                    connection[1].close()
+                return result
+
+    async def _acquire(self, key):
+        idle = self._idle.get(key)
+        while idle:
+            reader, writer = idle.pop()
+            if not reader.at_eof() and not writer.is_closing():
+                return (reader, writer), True
+            writer.close()
+        host, port, secure = key
+        if secure and self._ssl is None:
+            self._ssl = ssl.create_default_context()
+        connection = await asyncio.wait_for(
+            asyncio.open_connection(host, port, ssl=self._ssl if secure else None),
+            self.timeout)
+        self.connections_opened += 1
+        return connection, False
+
+    async def _read_head(self, reader):
+        status_line = await reader.readline()
+        if not status_line:
+            raise ConnectionError("Connection closed before a response was received")
+        version, status, reason = (status_line.decode("latin-1").rstrip("\r\n").split(" ", 2)
+                                   + [""])[:3]
+        headers = {}
+        while (line := await reader.readline()) not in (b"\r\n", b"\n"):
+            if not line:
+                raise asyncio.IncompleteReadError(b"", None)
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        return version, int(status), reason, headers
+
+    async def _exchange(self, connection, host, target, headers):
+        reader, writer = connection
+        lines = [f"GET {target} HTTP/1.1", f"Host: {host}", "Accept-Encoding: gzip, deflate",
+                 "Connection: keep-alive"]
+        lines += [f"{name}: {value}" for name, value in headers.items()]
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"))
+        await writer.drain()
+
+        # Interim 1xx responses come before the real one
+        version, status, reason, response_headers = await self._read_head(reader)
+        while 100 <= status < 200:
+            version, status, reason, response_headers = await self._read_head(reader)
+
+        connection_header = response_headers.get("connection", "").lower()
+        keep_alive = ("close" not in connection_header
+                      and (version == "HTTP/1.1" or "keep-alive" in connection_header))
+        codings = [c.strip() for c in
+                   response_headers.get("transfer-encoding", "").lower().split(",") if c.strip()]
+        if status in (204, 304):
+            body = b""
+        elif codings:
+            if codings[-1] != "chunked":
+                # Without chunked framing the body runs to the end of the connection
+                body, keep_alive = await reader.read(), False
+            else:
+                body = await _read_chunked(reader)
+        elif "content-length" in response_headers:
+            body = await reader.readexactly(int(response_headers["content-length"]))
+        else:
+            body, keep_alive = await reader.read(), False
+
+        body = _decode(body, response_headers.get("content-encoding", "").lower())
+        return (status, reason, response_headers, body), keep_alive
+
+    async def aclose(self):
+        for connections in self._idle.values():
+            for _, writer in connections:
+                writer.close()
+        self._idle.clear()
+
+
+class AsyncStatsAPI:
+    """Awaitable statsapi: `await api.roster(143)`, `await api.get("teams", {...})`.
+
+    get(), lookup_player(), player_stat_data(), roster(), standings(),
+    standings_data(), team_leaders(), team_leader_data(), league_leaders(),
+    league_leader_data() and latest_season() take statsapi's arguments and
+    return what statsapi returns; roster_data() returns records.Roster.
+    `base_url` replaces statsapi.BASE_URL (e.g. to point at a test server).
+    With `coalesce`, concurrent identical requests share one fetch (see
+    singleflight), so responses must be treated as read-only.
+    """
+
+    def __init__(self, max_concurrency=16, timeout=30.0, base_url=None, coalesce=True):
+        self.client = AsyncHTTPClient(max_concurrency, timeout)
+        self.base_url = base_url
+        self.flight = AsyncSingleFlight() if coalesce else None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.aclose()
+
+    async def aclose(self):
+        await self.client.aclose()
+
+    def url(self, endpoint, params, force=False):
+        url = endpoint_url(endpoint, params)
+        if force:
+            ep = ENDPOINTS[endpoint]
+            extra = [f"{k}={v}" for k, v in params.items()
+                     if k not in ep["path_params"] and k not in ep["query_params"]]
+            if extra:
+                url += ("&" if "?" in url else "?") + "&".join(extra)
+        if self.base_url:
+            url = url.replace(statsapi.BASE_URL, self.base_url, 1)
+        return url
+
+    async def get(self, endpoint, params={}, force=False):
+        """Awaitable statsapi.get(): fetch `endpoint` and return decoded JSON."""
+        if self.flight is not None:
+            key = request_key(endpoint, canonical({"params": params, "force": force}))
+            return await self.flight.do(key, self._fetch, endpoint, params, force)
+        return await self._fetch(endpoint, params, force)
+
+    async def _fetch(self, endpoint, params, force):
+        url = self.url(endpoint, params, force)
+        status, reason, _, body = await self.client.get(url)
+        if status not in (200, 201):
+            raise http_error(status, reason, url)
+        return json.loads(body)
+
+    async def latest_season(self, sportId=1):
+        """Awaitable statsapi.latest_season()."""
+        seasons = await self.get("season", {"sportId": sportId, "seasonId": "all"})
+        today = datetime.today().strftime("%Y-%m-%d")
+        return next((s for s in seasons.get("seasons", [])
+                     if today < s.get("seasonEndDate", "")), seasons["seasons"][-1])
+
+    async def lookup_player(self, lookup_value, gameType=None, season=None, sportId=1):
+        """Awaitable statsapi.lookup_player()."""
+        params = {"sportId": sportId, "fields": LOOKUP_FIELDS}
+        if gameType:
+            params["gameType"] = gameType
+        if not season:
+            season = (await self.latest_season(sportId)).get("seasonId", datetime.now().year)
+        params["season"] = season
+        response = await self.get("sports_players", params)
+        lookup_values = str(lookup_value).lower().split()
+        return [player for player in response["people"]
+                if all(any(value in str(v).lower() for v in player.values())
+                       for value in lookup_values)]
+
+    async def player_stat_data(self, personId, group="[hitting,pitching,fielding]",
+                               type="season", sportId=1, season=None):
+        """Awaitable statsapi.player_stat_data()."""
+        if season is not None and "season" not in type:
+            raise ValueError("The 'season' parameter is only valid when using the 'season' type.")
+        hydrate = (f"stats(group={group},type={type}"
+                   + (f",season={season}" if season else "") + f",sportId={sportId}),currentTeam")
+        response = await self.get("person", {"personId": personId, "hydrate": hydrate})
+        person = response["people"][0]
+        return {
+            "id": person["id"],
+            "first_name": person["useName"],
+            "last_name": person["lastName"],
+            "active": person["active"],
+            "current_team": person["currentTeam"]["name"],
+            "position": person["primaryPosition"]["abbreviation"],
+            "nickname": person.get("nickName"),
+            "last_played": person.get("lastPlayedDate"),
+            "mlb_debut": person.get("mlbDebutDate"),
+            "bat_side": person["batSide"]["description"],
+            "pitch_hand": person["pitchHand"]["description"],
+            "stats": [{"type": s["type"]["displayName"], "group": s["group"]["displayName"],
+                       "season": split.get("season"), "stats": split["stat"]}
+                      for s in person.get("stats", []) for split in s["splits"]],
+        }
+
+    async def roster(self, teamId, rosterType=None, season=None, date=None):
+        """Awaitable statsapi.roster()."""
+        params = {"rosterType": rosterType or "active", "season": season or datetime.now().year,
+                  "teamId": teamId}
+        if date:
+            params["date"] = date
+        response = await self.get("team_roster", params)
+        return "".join("#{:<3} {:<3} {}\n".format(x["jerseyNumber"], x["position"]["abbreviation"],
+                                                  x["person"]["fullName"])
+                       for x in response["roster"])
+
+    async def roster_data(self, teamId, rosterType="active", season=None, date=None):
+        """Awaitable records.roster_records()."""
+        params = {"teamId": teamId, "rosterType": rosterType,
+                  "season": season or datetime.now().year, "fields": ROSTER_FIELDS}
+        if date:
+            params["date"] = date
+        return parse_roster(teamId, await self.get("team_roster", params))
+
+    async def standings_data(self, leagueId="103,104", division="all", include_wildcard=True,
+                             season=None, standingsTypes=None, date=None):
+        """Awaitable statsapi.standings_data()."""
+        params = {"leagueId": leagueId}
+        if date:
+            params["date"] = date
+        params.update({"season": season or (date[-4:] if date else datetime.now().year),
+                       "standingsTypes": standingsTypes or "regularSeason",
+                       "hydrate": "team(division)", "fields": STANDINGS_FIELDS})
+        response = await self.get("standings", params)
+        wanted = str(division).lower()
+        divisions = {}
+        for record in response["records"]:
+            for x in record["teamRecords"]:
+                div = x["team"]["division"]
+                if wanted not in ("all", div["abbreviation"].lower()) \
+                        and str(division) != str(div["id"]):
+                    continue
+                divisions.setdefault(div["id"], {"div_name": div["name"], "teams": []})
+                divisions[div["id"]]["teams"].append({
+                    "name": x["team"]["name"],
+                    "div_rank": x["divisionRank"],
+                    "w": x["wins"],
+                    "l": x["losses"],
+                    "gb": x["gamesBack"],
+                    "wc_rank": x.get("wildCardRank", "-"),
+                    "wc_gb": x.get("wildCardGamesBack", "-"),
+                    "wc_elim_num": x.get("wildCardEliminationNumber", "-"),
+                    "elim_num": x.get("eliminationNumber", "-"),
+                    "team_id": x["team"]["id"],
+                    "league_rank": x.get("leagueRank", "-"),
+                    "sport_rank": x.get("sportRank", "-"),
+                })
+        return divisions
+
+    async def standings(self, leagueId="103,104", division="all", include_wildcard=True,
+                        season=None, standingsTypes=None, date=None):
+        """Awaitable statsapi.standings()."""
+        divisions = await self.standings_data(leagueId, division, include_wildcard, season,
+                                              standingsTypes, date)
+        text = ""
+        for div in divisions.values():
+            text += div["div_name"] + "\n"
+            if include_wildcard:
+                text += "{:^4} {:<21} {:^3} {:^3} {:^4} {:^4} {:^7} {:^5} {:^4}\n".format(
+                    "Rank", "Team", "W", "L", "GB", "(E#)", "WC Rank", "WC GB", "(E#)")
+                row = ("{div_rank:^4} {name:<21} {w:^3} {l:^3} {gb:^4} {elim_num:^4} "
+                       "{wc_rank:^7} {wc_gb:^5} {wc_elim_num:^4}\n")
+            else:
+                text += "{:^4} {:<21} {:^3} {:^3} {:^4} {:^4}\n".format(
+                    "Rank", "Team", "W", "L", "GB", "(E#)")
+                row = "{div_rank:^4} {name:<21} {w:^3} {l:^3} {gb:^4} {elim_num:^4}\n"
+            text += "".join(row.format(**t) for t in div["teams"]) + "\n"
+        return text
+
+    async def team_leader_data(self, teamId, leaderCategories, season=None, leaderGameTypes="R",
+                               limit=10):
+        """Awaitable statsapi.team_leader_data()."""
+        params = {"leaderCategories": leaderCategories, "season": season or datetime.now().year,
+                  "teamId": teamId, "leaderGameTypes": leaderGameTypes, "limit": limit,
+                  "fields": TEAM_LEADER_FIELDS}
+        response = await self.get("team_leaders", params)
+        return [[x["rank"], x["person"]["fullName"], x["value"]]
+                for x in response["teamLeaders"][0]["leaders"]]
+
+    async def team_leaders(self, teamId, leaderCategories, season=None, leaderGameTypes="R",
+                           limit=10):
+        """Awaitable statsapi.team_leaders()."""
+        lines = await self.team_leader_data(teamId, leaderCategories, season, leaderGameTypes,
+                                            limit)
+        return "{:<4} {:<20} {:<5}\n".format("Rank", "Name", "Value") + "".join(
+            "{:^4} {:<20} {:^5}\n".format(*line) for line in lines)
+
+    async def league_leader_data(self, leaderCategories, season=None, limit=10, statGroup=None,
+                                 leagueId=None, gameTypes=None, playerPool=None, sportId=1,
+                                 statType=None):
+        """Awaitable statsapi.league_leader_data()."""
+        params = {"leaderCategories": leaderCategories, "sportId": sportId, "limit": limit}
+        if season:
+            params["season"] = season
+        if statType:
+            params["statType"] = statType
+        if not season and not statType:
+            params["season"] = datetime.now().year
+        if statGroup:
+            params["statGroup"] = "hitting" if statGroup == "batting" else statGroup
+        if gameTypes:
+            params["leaderGameTypes"] = gameTypes
+        if leagueId:
+            params["leagueId"] = leagueId
+        if playerPool:
+            params["playerPool"] = playerPool
+        params["fields"] = LEAGUE_LEADER_FIELDS
+        response = await self.get("stats_leaders", params)
+        return [[x["rank"], x["person"]["fullName"], x["team"].get("name", ""), x["value"]]
+                for x in response["leagueLeaders"][0]["leaders"]]
+
+    async def league_leaders(self, leaderCategories, season=None, limit=10, statGroup=None,
+                             leagueId=None, gameTypes=None, playerPool=None, sportId=1,
+                             statType=None):
+        """Awaitable statsapi.league_leaders()."""
+        lines = await self.league_leader_data(leaderCategories, season, limit, statGroup,
+                                              leagueId, gameTypes, playerPool, sportId,
+                                              statType)
+        return "{:<4} {:<20} {:<23} {:<5}\n".format("Rank", "Name", "Team", "Value") + "".join(
+            "{:^4} {:<20} {:<23} {:^5}\n".format(*line) for line in lines)
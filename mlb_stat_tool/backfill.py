@@ -0,0 +1,175 @@
+"""
+Historical Backfill
+Resumable multi-season pull of yearByYear and gameLog stats into partitioned columns
+
+Stages:
+    1. enumerate players with the roster crawl (or take a given list)
+    2. fetch yearByYear / gameLog stats in bulk batches
+    3. flatten each batch into columns on a process pool
+    4. write one partition per (group, season, batch) under `root`
+
+A checkpoint file records the player list and finished batches, so a
+rerun after an interruption picks up at the first unfinished batch.
+
+    python -m mlb_stat_tool.backfill ./history --first-season 2014 --workers 8
+"""
+
+import argparse
+import json
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from datetime import datetime
+
+import numpy as np
+
+from .bulk import CHUNK_SIZE, bulk_player_stat_data, chunked
+from .crawl import SPORT_IDS, crawl_rosters
+from .store import StatTable, build_tables, concat_tables
+
+STAT_GROUPS = ["hitting", "pitching", "fielding"]
+CHECKPOINT = "_checkpoint.json"
+
+
+def parse_batch(players):
+    """Flatten one batch of player records; runs in a worker process."""
+    return {group: table.columns for group, table in build_tables(players).items()}
+
+
+def write_partitions(root, batch, tables):
+    """Write each group's rows split by season; return the partition paths."""
+    paths = []
+    for group, columns in tables.items():
+        table = StatTable(columns, group)
+        for season in np.unique(table["season"]):
+            path = os.path.join(root, group, f"season={season}", f"part-{batch:05d}")
+            table.filter(table["season"] == season).save(path)
+            paths.append(path)
+    return paths
+
+
+def load_partitions(root, group, seasons=None, mmap=True):
+    """Concatenate a group's partitions, optionally only some seasons."""
+    group_dir = os.path.join(root, group)
+    parts = []
+    for season_dir in sorted(os.listdir(group_dir)):
+        season = int(season_dir.split("=", 1)[1])
+        if seasons is not None and season not in seasons:
+            continue
+        for part in sorted(os.listdir(os.path.join(group_dir, season_dir))):
+            parts.append(StatTable.load(os.path.join(group_dir, season_dir, part), mmap))
+    table = concat_tables(parts)
+    table.group = group
+    return table
+
+
+class Backfill:
+    """One resumable backfill run rooted at a directory."""
+
+    def __init__(self, root, seasons, sport_ids=SPORT_IDS, groups=STAT_GROUPS, game_logs=True,
+                 chunk_size=CHUNK_SIZE, workers=None, get=None):
+        self.root = root
+        self.seasons = list(seasons)
+        self.sport_ids = list(sport_ids)
+        self.groups = list(groups)
+        self.game_logs = game_logs
+        self.chunk_size = chunk_size
+        self.workers = workers or os.cpu_count()
+        self.get = get
+        self.checkpoint_path = os.path.join(root, CHECKPOINT)
+        self.state = {"players": None, "done": []}
+        if os.path.exists(self.checkpoint_path):
+            with open(self.checkpoint_path) as f:
+                self.state.update(json.load(f))
+
+    def save_checkpoint(self):
+        os.makedirs(self.root, exist_ok=True)
+        tmp = self.checkpoint_path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(self.state, f)
+        os.replace(tmp, self.checkpoint_path)
+
+    def players(self):
+        """Stage 1: the player IDs to backfill, crawled once and checkpointed."""
+        if self.state["players"] is None:
+            ids = {pid for _, pid, _ in crawl_rosters(self.sport_ids, get=self.get)}
+            self.state["players"] = sorted(ids)
+            self.save_checkpoint()
+        return self.state["players"]
+
+    def fetch(self, player_ids):
+        """Stage 2: every requested stat for one batch, merged per player."""
+        merged = {}
+
+        def add(records):
+            for pid, record in records.items():
+                if pid in merged:
+                    merged[pid]["stats"].extend(record["stats"])
+                else:
+                    merged[pid] = record
+
+        for sport_id in self.sport_ids:
+            add(bulk_player_stat_data(player_ids, self.groups, ["yearByYear"], sport_id,
+                                      chunk_size=self.chunk_size, get=self.get))
+            if self.game_logs:
+                for season in self.seasons:
+                    add(bulk_player_stat_data(player_ids, self.groups, ["gameLog"], sport_id,
+                                              season=season, chunk_size=self.chunk_size,
+                                              get=self.get))
+        wanted = {str(s) for s in self.seasons}
+        for record in merged.values():
+            record["stats"] = [s for s in record["stats"] if s["season"] in wanted]
+        return list(merged.values())
+
+    def run(self, on_batch=None):
+        """Run or resume the backfill; return the number of batches written now."""
+        batches = list(enumerate(chunked(self.players(), self.chunk_size)))
+        done = set(self.state["done"])
+        todo = [(i, ids) for i, ids in batches if i not in done]
+        written = 0
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            pending = {}
+            try:
+                for index, ids in todo:
+                    pending[pool.submit(parse_batch, self.fetch(ids))] = index
+                    # Keep fetching ahead, but only as far as the pool can absorb
+                    while len(pending) >= 2 * self.workers:
+                        written += self._finish(pending, on_batch)
+            finally:
+                # Batches already fetched are kept even if a later fetch fails
+                while pending:
+                    written += self._finish(pending, on_batch)
+        return written
+
+    def _finish(self, pending, on_batch):
+        finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+        for future in finished:
+            index = pending.pop(future)
+            paths = write_partitions(self.root, index, future.result())
+            self.state["done"].append(index)
+            self.save_checkpoint()
+            if on_batch:
+                on_batch(index, paths)
+        return len(finished)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Backfill multi-season stats")
+    parser.add_argument("root")
+    parser.add_argument("--first-season", type=int, default=datetime.now().year - 10)
+    parser.add_argument("--last-season", type=int, default=datetime.now().year)
+    parser.add_argument("--sport-ids", default=",".join(str(s) for s in SPORT_IDS))
+    parser.add_argument("--no-game-logs", action="store_true")
+    parser.add_argument("--workers", type=int)
+    args = parser.parse_args(argv)
+
+    backfill = Backfill(args.root, range(args.first_season, args.last_season + 1),
+                        [int(s) for s in args.sport_ids.split(",")],
+                        game_logs=not args.no_game_logs, workers=args.workers)
+    total = len(list(chunked(backfill.players(), backfill.chunk_size)))
+    written = backfill.run(lambda index, paths: print(
+        f"batch {index + 1}/{total}: {len(paths)} partitions"))
+    print(f"{written} batches written, {len(backfill.state['done'])}/{total} complete")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,223 @@
+"""
+Ingestion Benchmarks
+End-to-end throughput of the roster crawl, stat pulls and leader pulls
+
+Runs against FakeStatsAPI with a configurable per-request latency and
+writes results as JSON so runs can be compared:
+
+    python -m mlb_stat_tool.bench --latency 0.02 --output bench.json
+    python -m mlb_stat_tool.bench --latency 0.02 --compare bench.json
+
+Each scenario's time is split into JSON decoding, the rest of the time
+spent inside get() (network latency), and traversal: wall time outside
+get(), i.e. walking the decoded dicts. The first two are summed over
+worker threads, so for the concurrent crawl they can exceed wall time.
+Peak memory is the scenario's own tracemalloc high-water mark above what
+was allocated when it started; tracemalloc slows allocation-heavy code, so
+--no-memory gives cleaner timings.
+"""
+
+import argparse
+import json
+import resource
+import sys
+import threading
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+import statsapi
+
+from . import transport
+from .bulk import bulk_player_stat_data
+from .crawl import SPORT_IDS, crawl_rosters, list_teams
+from .fake import FakeStatsAPI
+
+# Metrics where a bigger number is an improvement
+HIGHER_IS_BETTER = {"requests_per_sec", "players_per_sec"}
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def peak_rss_bytes():
+    # ru_maxrss is KiB on Linux and bytes on macOS
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss if sys.platform == "darwin" else rss * 1024
+
+
+class TimedGet:
+    """Wraps a get and records the wall time of every call."""
+
+    def __init__(self, get):
+        self.get = get
+        self.latencies = []
+        self._lock = threading.Lock()
+
+    def __call__(self, endpoint, params={}, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return self.get(endpoint, params, *args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self.latencies.append(elapsed)
+
+
+def measure(name, api, run, trace_memory=True):
+    """Run `run(get)` once and summarize it; `run` returns players processed."""
+    timed = TimedGet(api)
+    bytes_before, decode_before = api.bytes_decoded, api.decode_seconds
+    started = trace_memory and not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    if trace_memory:
+        tracemalloc.reset_peak()
+        allocated_before = tracemalloc.get_traced_memory()[0]
+    start = time.perf_counter()
+    try:
+        with transport.using(timed):
+            players = run(timed)
+        elapsed = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1] - allocated_before if trace_memory else None
+    finally:
+        if started:
+            tracemalloc.stop()
+    latencies = sorted(timed.latencies)
+    in_get = sum(latencies)
+    decode = api.decode_seconds - decode_before
+    return name, {
+        "seconds": round(elapsed, 4),
+        "requests": len(latencies),
+        "players": players,
+        "requests_per_sec": round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+        "players_per_sec": round(players / elapsed, 2) if elapsed else 0.0,
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 3),
+        "bytes_decoded": api.bytes_decoded - bytes_before,
+        "decode_seconds": round(decode, 4),
+        "request_seconds": round(max(in_get - decode, 0.0), 4),
+        "traversal_seconds": round(max(elapsed - in_get, 0.0), 4),
+        "peak_alloc_bytes": peak,
+    }
+
+
+def run_benchmarks(latency=0.0, mlb_teams=30, milb_teams=120, roster_size=26, max_workers=8,
+                   stat_players=20, trace_memory=True):
+    """Run every scenario and return the results document."""
+    api = FakeStatsAPI(mlb_teams, milb_teams, roster_size, latency)
+    player_ids = []
+
+    def roster_crawl(get):
+        player_ids.extend(pid for _, pid, _ in crawl_rosters(SPORT_IDS, get=get,
+                                                             max_workers=max_workers))
+        return len(player_ids)
+
+    def per_player_stats(get):
+        # The shape of test_bradley_hanner: one call per (player, group, type)
+        for player_id in player_ids[:stat_players]:
+            for group in ("hitting", "pitching", "fielding"):
+                for stat_type in ("career", "season"):
+                    statsapi.player_stat_data(player_id, group=f"[{group}]", type=stat_type)
+        return min(stat_players, len(player_ids))
+
+    def bulk_stats(get):
+        return len(bulk_player_stat_data(player_ids, get=get))
+
+    def leaders_and_standings(get):
+        statsapi.standings_data()
+        for category in ("homeRuns", "battingAverage", "earnedRunAverage"):
+            statsapi.league_leader_data(category)
+        teams = list_teams([1], get)
+        for team in teams:
+            statsapi.team_leader_data(team["id"], "homeRuns")
+        return 0
+
+    scenarios = dict(measure(name, api, run, trace_memory) for name, run in (
+        ("roster_crawl", roster_crawl),
+        ("per_player_stats", per_player_stats),
+        ("bulk_stats", bulk_stats),
+        ("leaders_and_standings", leaders_and_standings),
+    ))
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "config": {"latency": latency, "mlb_teams": mlb_teams, "milb_teams": milb_teams,
+                   "roster_size": roster_size, "max_workers": max_workers,
+                   "stat_players": stat_players},
+        "scenarios": scenarios,
+        # High-water mark of the whole run (it never goes down, so not per scenario)
+        "peak_rss_bytes": peak_rss_bytes(),
+    }
+
+
+def compare(current, previous, tolerance=0.10):
+    """Return (scenario, metric, previous, current) for metrics worse by > tolerance.
+
+    The run's peak RSS is reported under the scenario name "process".
+    """
+    regressions = []
+    checks = [(name, metrics, previous.get("scenarios", {}).get(name, {}),
+               ("seconds", "requests", "requests_per_sec", "players_per_sec", "p95_ms",
+                "bytes_decoded", "decode_seconds", "peak_alloc_bytes"))
+              for name, metrics in current["scenarios"].items()]
+    checks.append(("process", current, previous, ("peak_rss_bytes",)))
+    for name, metrics, before, names in checks:
+        for metric in names:
+            old, new = before.get(metric), metrics.get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            worse = -change if metric in HIGHER_IS_BETTER else change
+            if worse > tolerance:
+                regressions.append((name, metric, old, new))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark ingestion against a fake Stats API")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds per request")
+    parser.add_argument("--mlb-teams", type=int, default=30)
+    parser.add_argument("--milb-teams", type=int, default=120)
+    parser.add_argument("--roster-size", type=int, default=26)
+    parser.add_argument("--max-workers", type=int, default=8)
+    parser.add_argument("--stat-players", type=int, default=20)
+    parser.add_argument("--no-memory", action="store_true",
+                        help="skip tracemalloc peak memory tracking")
+    parser.add_argument("--output", help="write results JSON here")
+    parser.add_argument("--compare", help="earlier results JSON to check for regressions")
+    parser.add_argument("--tolerance", type=float, default=0.10)
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.latency, args.mlb_teams, args.milb_teams, args.roster_size,
+                             args.max_workers, args.stat_players, not args.no_memory)
+    for name, m in results["scenarios"].items():
+        print(f"{name:<24} {m['seconds']:>8.3f}s {m['requests']:>6} req "
+              f"{m['requests_per_sec']:>9.1f} req/s {m['players_per_sec']:>9.1f} players/s "
+              f"p50 {m['p50_ms']:.2f}ms p95 {m['p95_ms']:.2f}ms p99 {m['p99_ms']:.2f}ms "
+              f"{m['bytes_decoded'] / 1e6:.2f}MB")
+        peak = f"{m['peak_alloc_bytes'] / 1e6:.1f}MB" if m["peak_alloc_bytes"] is not None else "-"
+        print(f"{'':<24} decode {m['decode_seconds']:.3f}s request {m['request_seconds']:.3f}s "
+              f"traversal {m['traversal_seconds']:.3f}s peak alloc {peak}")
+    print(f"process peak RSS {results['peak_rss_bytes'] / 1e6:.1f}MB")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for name, metric, old, new in regressions:
+            print(f"REGRESSION {name}.{metric}: {old} -> {new}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
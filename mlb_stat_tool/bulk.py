@@ -0,0 +1,96 @@
+"""
+Bulk Stat Fetch
+Stats for many players per request via the people?personIds= endpoint
+"""
+
+import statsapi
+
+STAT_GROUPS = ["hitting", "pitching", "fielding"]
+STAT_TYPES = ["career", "season"]
+
+# personIds is a query string; keep URLs well under common length limits
+CHUNK_SIZE = 50
+
+
+def _as_list(value):
+    if isinstance(value, str):
+        value = value.strip("[]").split(",")
+    return [v.strip() for v in value if v.strip()]
+
+
+def stats_hydrate(groups=STAT_GROUPS, types=STAT_TYPES, sport_id=1, season=None):
+    """Build the hydrate string for several stat groups and types at once."""
+    return (
+        "stats(group=[" + ",".join(_as_list(groups)) + "]"
+        + ",type=[" + ",".join(_as_list(types)) + "]"
+        + (",season=" + str(season) if season else "")
+        + ",sportId=" + str(sport_id)
+        + "),currentTeam"
+    )
+
+
+def player_record(person, sport_id=1):
+    """Shape one hydrated person like statsapi.player_stat_data() does.
+
+    Each stat entry also carries the team and sport of its split where
+    the API reports one, falling back to the player's current team.
+    """
+    current_team = person.get("currentTeam", {})
+    player = {
+        "id": person["id"],
+        "first_name": person.get("useName", person.get("firstName")),
+        "last_name": person.get("lastName"),
+        "active": person.get("active"),
+        "current_team": current_team.get("name"),
+        "team_id": current_team.get("id"),
+        "position": person.get("primaryPosition", {}).get("abbreviation"),
+        "nickname": person.get("nickName"),
+        "last_played": person.get("lastPlayedDate"),
+        "mlb_debut": person.get("mlbDebutDate"),
+        "birth_date": person.get("birthDate"),
+        "bat_side": person.get("batSide", {}).get("description"),
+        "pitch_hand": person.get("pitchHand", {}).get("description"),
+    }
+    stat_groups = []
+    for s in person.get("stats", []):
+        for split in s.get("splits", []):
+            stat_groups.append({
+                "type": s["type"]["displayName"],
+                "group": s["group"]["displayName"],
+                "season": split.get("season"),
+                "team_id": split.get("team", {}).get("id", current_team.get("id")),
+                "sport_id": split.get("sport", {}).get("id", sport_id),
+                "game_pk": split.get("game", {}).get("gamePk"),
+                "stats": split["stat"],
+            })
+    player["stats"] = stat_groups
+    return player
+
+
+def chunked(items, size):
+    items = list(items)
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def bulk_player_stat_data(player_ids, groups=STAT_GROUPS, types=STAT_TYPES, sport_id=1,
+                          season=None, chunk_size=CHUNK_SIZE, get=None, fields=None):
+    """Return {player_id: record} for every player, `chunk_size` per request.
+
+    One request covers every group and type for up to `chunk_size`
+    players, replacing len(groups) * len(types) player_stat_data() calls
+    per player. Players the API does not return are left out. `fields`
+    is passed through as the server-side fields= filter (see
+    schema.stats_fields()).
+    """
+    get = get or statsapi.get
+    hydrate = stats_hydrate(groups, types, sport_id, season)
+    players = {}
+    for chunk in chunked(dict.fromkeys(player_ids), chunk_size):
+        params = {"personIds": ",".join(str(i) for i in chunk), "hydrate": hydrate}
+        if fields:
+            params["fields"] = fields
+        r = get("people", params)
+        for person in r.get("people", []):
+            players[person["id"]] = player_record(person, sport_id)
+    return players
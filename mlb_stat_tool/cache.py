@@ -0,0 +1,174 @@
+"""
+Response Cache
+Persistent SQLite cache with per-endpoint TTLs for statsapi entry points
+"""
+
+import functools
+import json
+import os
+import sqlite3
+import threading
+import time
+
+import statsapi
+
+from . import transport
+from .keys import canonical, normalize_arguments, request_key
+
+MINUTE = 60
+HOUR = 60 * MINUTE
+DAY = 24 * HOUR
+
+DEFAULT_PATH = os.path.join(os.path.expanduser("~"), ".cache", "mlb_stat_tool", "responses.sqlite")
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+# statsapi entry points install() wraps, with their base TTL
+CACHED_FUNCTIONS = {
+    "lookup_player": DAY,
+    "player_stat_data": 6 * HOUR,
+    "roster": HOUR,
+    "standings": 10 * MINUTE,
+    "team_leaders": HOUR,
+}
+
+
+def default_ttl(name, arguments):
+    """Return how long a result of `name(**arguments)` stays fresh, in seconds."""
+    if name == "player_stat_data" and "career" in str(arguments.get("type", "")).lower():
+        # Career lines only move once a game is played, and never mid-run
+        return 7 * DAY
+    return CACHED_FUNCTIONS.get(name, HOUR)
+
+
+class ResponseCache:
+    """Key/value store on SQLite with expiry and least-recently-used eviction."""
+
+    def __init__(self, path=DEFAULT_PATH, max_bytes=DEFAULT_MAX_BYTES):
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        # key -> last read time, written out with the next set() or close()
+        self._touched = {}
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            "key TEXT PRIMARY KEY, value BLOB NOT NULL, size INTEGER NOT NULL, "
+            "expires REAL NOT NULL, accessed REAL NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed)")
+        self._db.commit()
+
+    def get(self, key):
+        """Return (True, value) for a fresh entry, else (False, None).
+
+        Reads never write to disk: access times are kept in memory and
+        flushed before the next eviction.
+        """
+        now = time.time()
+        with self._lock:
+            row = self._db.execute(
+                "SELECT value, expires FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or row[1] <= now:
+                self.misses += 1
+                return False, None
+            self._touched[key] = now
+            self.hits += 1
+        return True, json.loads(row[0])
+
+    def set(self, key, value, ttl):
+        """Store `value` under `key` for `ttl` seconds."""
+        blob = json.dumps(value).encode("utf-8")
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?)",
+                (key, blob, len(blob), now + ttl, now),
+            )
+            self._evict(now)
+            self._db.commit()
+
+    def _flush_touched(self):
+        if self._touched:
+            self._db.executemany("UPDATE entries SET accessed = ? WHERE key = ?",
+                                 [(accessed, key) for key, accessed in self._touched.items()])
+            self._touched.clear()
+
+    def _evict(self, now):
+        self._flush_touched()
+        self._db.execute("DELETE FROM entries WHERE expires <= ?", (now,))
+        total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        doomed = []
+        for key, size in self._db.execute("SELECT key, size FROM entries ORDER BY accessed"):
+            if total <= self.max_bytes:
+                break
+            doomed.append((key,))
+            total -= size
+        self._db.executemany("DELETE FROM entries WHERE key = ?", doomed)
+
+    def size(self):
+        """Return the total stored payload size in bytes."""
+        with self._lock:
+            return self._db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+
+    def clear(self):
+        """Drop every entry."""
+        with self._lock:
+            self._db.execute("DELETE FROM entries")
+            self._touched.clear()
+            self._db.commit()
+
+    def close(self):
+        with self._lock:
+            self._flush_touched()
+            self._db.commit()
+            self._db.close()
+
+    def wrap(self, func, name=None, ttl=default_ttl):
+        """Return `func` memoized in this cache.
+
+        `ttl` is a number of seconds or a callable taking (name, arguments).
+        Arguments are bound to `func`'s signature first, so positional and
+        keyword spellings of the same call share an entry.
+        """
+        name = name or func.__name__
+
+        @functools.wraps(func)
+        def cached(*args, **kwargs):
+            arguments = normalize_arguments(func, args, kwargs)
+            key = request_key(name, canonical(arguments))
+            found, value = self.get(key)
+            if found:
+                return value
+            value = func(*args, **kwargs)
+            if value:
+                self.set(key, value, ttl(name, arguments) if callable(ttl) else ttl)
+            return value
+
+        cached.__wrapped__ = func
+        return cached
+
+
+def install(cache=None, names=CACHED_FUNCTIONS):
+    """Route the named statsapi functions through `cache` and return it.
+
+    statsapi's own helpers look these names up on the module, so e.g.
+    player_stats() picks up the cached player_stat_data() as well. The cache
+    is the innermost layer and replaces any cache installed before it.
+    """
+    cache = cache or ResponseCache()
+    for name in names:
+        transport.add_layer(name, "cache", functools.partial(cache.wrap, name=name))
+    return cache
+
+
+def uninstall(names=CACHED_FUNCTIONS):
+    """Remove the cache layer install() added."""
+    for name in names:
+        transport.remove_layer(name, "cache")
@@ -0,0 +1,190 @@
+"""
+Parameter Capabilities
+Valid stat groups, stat types, sports and leader categories, probed once
+
+The Stats API publishes its accepted parameter values through the meta
+endpoints (statGroups, statTypes, leagueLeaderTypes, ...) and /sports.
+Capabilities.load() fetches those once, keeps them in a local JSON file,
+and checks statsapi arguments against them, so a misspelled group or an
+unusable stat type fails immediately with the list of valid values rather
+than after a round-trip. Accepted spellings are normalized on the way:
+"Hitting", "[hitting]" and "hitting" all become "[hitting]", and
+"yearbyyear" becomes "yearByYear".
+"""
+
+import functools
+import inspect
+import json
+import os
+import time
+
+import statsapi
+
+from . import transport
+from .cache import DAY, DEFAULT_PATH as CACHE_PATH
+from .schema import ALIASES
+
+DEFAULT_PATH = os.path.join(os.path.dirname(CACHE_PATH), "capabilities.json")
+MAX_AGE = 7 * DAY
+
+# meta types probed, and the field holding each value's parameter spelling
+META_TYPES = {
+    "statGroups": "displayName",
+    "statTypes": "displayName",
+    "leagueLeaderTypes": "displayName",
+    "rosterTypes": "parameter",
+    "standingsTypes": "name",
+}
+
+# Stat types that need parameters player_stat_data()/player_stats() cannot send
+NEEDS_PARAMS = {
+    "vsTeam": "opposingTeamId",
+    "vsTeamTotal": "opposingTeamId",
+    "vsTeam5Y": "opposingTeamId",
+    "vsPlayer": "opposingPlayerId",
+    "vsPlayerTotal": "opposingPlayerId",
+    "vsPlayer5Y": "opposingPlayerId",
+    "byDateRange": "startDate",
+    "byDateRangeAdvanced": "startDate",
+    "lastXGames": "limit",
+}
+
+# statsapi argument -> capability it is checked against, per function
+VALIDATED = {
+    "player_stat_data": {"group": "statGroups", "type": "statTypes", "sportId": "sports"},
+    "player_stats": {"group": "statGroups", "type": "statTypes"},
+    "team_leaders": {"leaderCategories": "leagueLeaderTypes"},
+    "team_leader_data": {"leaderCategories": "leagueLeaderTypes"},
+    "league_leaders": {"leaderCategories": "leagueLeaderTypes", "statGroup": "statGroups",
+                       "sportId": "sports"},
+    "league_leader_data": {"leaderCategories": "leagueLeaderTypes", "statGroup": "statGroups",
+                           "sportId": "sports"},
+    "roster": {"rosterType": "rosterTypes"},
+    "standings": {"standingsTypes": "standingsTypes"},
+    "standings_data": {"standingsTypes": "standingsTypes"},
+}
+
+# Arguments statsapi passes through as bracketed lists
+BRACKETED = {("player_stat_data", "group"), ("player_stat_data", "type"),
+             ("player_stats", "group"), ("player_stats", "type")}
+
+
+class InvalidParameter(ValueError):
+    """An argument value the Stats API does not accept."""
+
+
+class Capabilities:
+    """Accepted values per capability, plus sport ids mapped to their codes."""
+
+    def __init__(self, values, sports, probed=None):
+        self.values = {name: list(v) for name, v in values.items()}
+        self.sports = {int(k): v for k, v in sports.items()}
+        self.probed = probed or time.time()
+        self._lookup = {name: {v.lower(): v for v in vs} for name, vs in self.values.items()}
+
+    @classmethod
+    def probe(cls, get=None):
+        """Fetch every capability from the API (one request per meta type)."""
+        get = get or statsapi.get
+        values = {}
+        for meta_type, field in META_TYPES.items():
+            response = get("meta", {"type": meta_type})
+            values[meta_type] = [item[field] for item in response if item.get(field)]
+        sports = {s["id"]: s.get("code", "") for s in get("sports", {}).get("sports", [])}
+        return cls(values, sports)
+
+    @classmethod
+    def load(cls, path=DEFAULT_PATH, max_age=MAX_AGE, get=None):
+        """Read capabilities saved at `path`, probing again when missing or stale."""
+        try:
+            with open(path) as f:
+                saved = json.load(f)
+            if time.time() - saved["probed"] < max_age:
+                return cls(saved["values"], saved["sports"], saved["probed"])
+        except (OSError, ValueError, KeyError):
+            pass
+        capabilities = cls.probe(get)
+        capabilities.save(path)
+        return capabilities
+
+    def save(self, path=DEFAULT_PATH):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, "w") as f:
+            json.dump({"probed": self.probed, "values": self.values, "sports": self.sports}, f)
+
+    def normalize(self, capability, value):
+        """Return the API's spelling of each comma-separated item in `value`.
+
+        Raises InvalidParameter listing the accepted values when an item is
+        unknown.
+        """
+        if capability == "sports":
+            items = [i.strip() for i in str(value).split(",") if i.strip()]
+            bad = [i for i in items if not i.isdigit() or int(i) not in self.sports]
+            if bad:
+                raise InvalidParameter(f"Unknown sportId {', '.join(bad)}; "
+                                       f"valid: {sorted(self.sports)}")
+            return ",".join(items)
+        lookup = self._lookup[capability]
+        result = []
+        for item in str(value).strip().strip("[]").split(","):
+            item = item.strip().lower()
+            item = ALIASES.get(item, item) if capability == "statGroups" else item
+            if item not in lookup:
+                raise InvalidParameter(f"Unknown {capability} value '{item}'; "
+                                       f"valid: {', '.join(self.values[capability])}")
+            result.append(lookup[item])
+        return ",".join(result)
+
+    def validate(self, name, arguments):
+        """Check and normalize bound arguments for statsapi.`name`; return them."""
+        checks = VALIDATED.get(name, {})
+        arguments = dict(arguments)
+        for argument, capability in checks.items():
+            value = arguments.get(argument)
+            if value in (None, ""):
+                continue
+            value = self.normalize(capability, value)
+            if capability == "statTypes":
+                for stat_type in value.split(","):
+                    if stat_type in NEEDS_PARAMS:
+                        raise InvalidParameter(
+                            f"type '{stat_type}' needs {NEEDS_PARAMS[stat_type]}, "
+                            f"which statsapi.{name} cannot send")
+            if (name, argument) in BRACKETED:
+                value = "[" + value + "]"
+            arguments[argument] = value
+        return arguments
+
+    def wrap(self, func, name=None):
+        """Return `func` with its arguments validated and normalized first."""
+        name = name or func.__name__
+
+        @functools.wraps(func)
+        def validated(*args, **kwargs):
+            try:
+                bound = inspect.signature(func).bind(*args, **kwargs)
+            except (TypeError, ValueError):
+                # Not a call validate() can read; let func handle it as it would unwrapped
+                return func(*args, **kwargs)
+            bound.apply_defaults()
+            bound.arguments.update(self.validate(name, bound.arguments))
+            return func(*bound.args, **bound.kwargs)
+
+        validated.__wrapped__ = func
+        return validated
+
+
+def install(capabilities=None, names=VALIDATED):
+    """Validate arguments to the named statsapi functions; return the capabilities."""
+    capabilities = capabilities or Capabilities.load()
+    for name in names:
+        transport.add_layer(name, "capabilities",
+                            functools.partial(capabilities.wrap, name=name))
+    return capabilities
+
+
+def uninstall(names=VALIDATED):
+    """Remove the validating wrappers install() added."""
+    for name in names:
+        transport.remove_layer(name, "capabilities")
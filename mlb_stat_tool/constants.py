@@ -0,0 +1,7 @@
+"""
+Constants
+Identifiers shared across the crawl, sync and analysis modules
+"""
+
+# Lower rank = higher level: MLB, AAA, AA, High-A, Single-A, Rookie
+LEVELS = {1: 0, 11: 1, 12: 2, 13: 3, 14: 4, 16: 5}
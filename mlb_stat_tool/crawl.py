@@ -0,0 +1,114 @@
+"""
+Roster Crawler
+Fetches every team roster for a set of sport IDs with bounded concurrency
+"""
+
+import heapq
+import itertools
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+import statsapi
+
+from .ratelimit import CircuitOpen, RateLimiter
+
+# MLB = 1, MiLB = 11
+SPORT_IDS = [1, 11]
+# Triple-A, Double-A, High-A, Single-A, Rookie
+MILB_SPORT_IDS = [11, 12, 13, 14, 16]
+
+
+def list_teams(sport_ids=SPORT_IDS, get=None):
+    """Return the team dicts for every sport ID, in order."""
+    get = get or statsapi.get
+    teams = []
+    for sport_id in sport_ids:
+        teams.extend(get("teams", {"sportId": sport_id}).get("teams", []))
+    return teams
+
+
+def fetch_roster(team_id, get=None, roster_type="active"):
+    """Return the raw roster entries for one team."""
+    get = get or statsapi.get
+    roster = get("team_roster", {"teamId": team_id, "rosterType": roster_type})
+    return roster.get("roster", [])
+
+
+def crawl_roster_entries(sport_ids=SPORT_IDS, get=None, max_workers=8, rate=None,
+                         teams=None, on_error=None, retry_rounds=0):
+    """Yield (team, raw roster entry) for every rostered player.
+
+    Rosters are fetched on a thread pool with at most `max_workers` requests
+    in flight, started no faster than `rate` per second (statsapi talks to a
+    single host, so one limiter covers it). Entries for a team are yielded
+    as soon as its roster arrives. A failed roster goes to the back of a
+    retry queue up to `retry_rounds` times; after that it is passed to
+    `on_error(team, exc)` and the crawl continues. A CircuitOpen rejection
+    does not count as an attempt: the team is held until the breaker is
+    due to let a call through, then tried again.
+    """
+    get = get or statsapi.get
+    if teams is None:
+        teams = list_teams(sport_ids, get)
+    limiter = RateLimiter(rate)
+
+    def fetch(team):
+        limiter.wait()
+        return fetch_roster(team["id"], get)
+
+    teams = iter(teams)
+    # (time it may be retried, tie-breaker, team)
+    retries = []
+    order = itertools.count()
+    attempts = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        pending = {}
+
+        def fill():
+            # Only keep max_workers futures queued so huge team lists stay lazy.
+            # Fresh teams first, so retries wait out whatever made them fail
+            while len(pending) < max_workers:
+                team = next(teams, None)
+                if team is None and retries and retries[0][0] <= time.monotonic():
+                    team = heapq.heappop(retries)[2]
+                if team is None:
+                    return
+                pending[pool.submit(fetch, team)] = team
+
+        fill()
+        while pending or retries:
+            if not pending:
+                time.sleep(max(0.0, retries[0][0] - time.monotonic()))
+                fill()
+                continue
+            timeout = max(0.0, retries[0][0] - time.monotonic()) if retries else None
+            done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            for future in done:
+                team = pending.pop(future)
+                error = future.exception()
+                if isinstance(error, CircuitOpen):
+                    heapq.heappush(retries, (time.monotonic() + error.retry_in, next(order), team))
+                elif error is not None:
+                    attempts[team["id"]] = attempts.get(team["id"], 0) + 1
+                    if attempts[team["id"]] <= retry_rounds:
+                        heapq.heappush(retries, (time.monotonic(), next(order), team))
+                    elif on_error:
+                        on_error(team, error)
+                fill()
+                if error is not None:
+                    continue
+                for player in future.result():
+                    yield team, player
+            fill()
+
+
+def crawl_rosters(sport_ids=SPORT_IDS, get=None, max_workers=8, rate=None,
+                  teams=None, on_error=None, retry_rounds=0):
+    """Yield (team_id, player_id, full_name) for every rostered player.
+
+    See crawl_roster_entries() for concurrency, rate limiting and retries.
+    """
+    for team, player in crawl_roster_entries(sport_ids, get, max_workers, rate, teams,
+                                             on_error, retry_rounds):
+        person = player["person"]
+        yield team["id"], person["id"], person["fullName"]
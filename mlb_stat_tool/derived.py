@@ -0,0 +1,284 @@
+"""
+Derived Metrics
+wOBA, ISO, K-BB%, wRC+, FIP and FIP- over whole stat columns at once
+
+League constants (wOBA scale, runs per PA, the FIP constant, ...) are
+aggregated per (season, sportId) from the same StatStore, so every level is
+normalized against its own league and a saved store is all that is needed
+to recompute them. Park factors are optional (team_id -> run factor,
+1.0 = neutral). MiLB lines also get an MLB-equivalent wOBA and FIP using
+per-level translation factors, estimated from players with lines at both a
+level and MLB in the same season when there are enough of them: hitting
+factors from their wOBA, pitching factors from their ERA.
+"""
+
+import json
+from typing import NamedTuple
+
+import numpy as np
+
+from .store import KEY_COLUMNS, TYPE_CODES, StatTable
+
+# Run values above an out; each league's wOBA scale rescales them so that
+# league wOBA equals league OBP (giving the familiar ~.69 BB ... ~2.1 HR)
+RUN_VALUES = {"uBB": 0.55, "HBP": 0.57, "1B": 0.71, "2B": 1.01, "3B": 1.29, "HR": 1.68}
+# Runs per plate appearance when the store has no "runs" column
+RUNS_PER_PA = 0.118
+
+# Rough MLB-equivalence multipliers by sportId, used where too few players
+# have lines at both levels: wOBA is multiplied, FIP divided
+TRANSLATION = {1: 1.0, 11: 0.92, 12: 0.88, 13: 0.84, 14: 0.80, 16: 0.75}
+MIN_PAIRS = 20
+
+
+class LeagueConstants(NamedTuple):
+    woba_scale: float
+    lg_woba: float
+    lg_obp: float
+    runs_per_pa: float
+    fip_constant: float
+    lg_fip: float
+
+
+def _rows(table, stat_type, season):
+    mask = table["type"] == TYPE_CODES[stat_type.lower()]
+    if season is not None:
+        mask &= table["season"] == season
+    return np.flatnonzero(mask)
+
+
+def _league_keys(table, rows):
+    """Row -> league index, and the (season, sport_id) of each league."""
+    keys = table["season"][rows].astype(np.int64) * 1000 + table["sport_id"][rows]
+    unique, inverse = np.unique(keys, return_inverse=True)
+    return inverse, [(int(k // 1000), int(k % 1000)) for k in unique]
+
+
+def _lookup(keys, mapping, default):
+    """Vectorized dict lookup of int `keys`."""
+    result = np.full(len(keys), default, np.float64)
+    if mapping:
+        known = np.fromiter(mapping, np.int64)
+        values = np.fromiter(mapping.values(), np.float64, len(mapping))
+        order = np.argsort(known)
+        known, values = known[order], values[order]
+        position = np.clip(np.searchsorted(known, keys), 0, len(known) - 1)
+        hit = known[position] == keys
+        result[hit] = values[position[hit]]
+    return result
+
+
+def _hitting_columns(table, rows):
+    c = {name: table.column(name, rows) for name in (
+        "plateAppearances", "atBats", "hits", "doubles", "triples", "homeRuns", "baseOnBalls",
+        "intentionalWalks", "hitByPitch", "sacFlies", "strikeOuts", "runs")}
+    c["singles"] = c["hits"] - c["doubles"] - c["triples"] - c["homeRuns"]
+    c["unintentional"] = c["baseOnBalls"] - c["intentionalWalks"]
+    c["woba_numerator"] = (RUN_VALUES["uBB"] * c["unintentional"]
+                           + RUN_VALUES["HBP"] * c["hitByPitch"]
+                           + RUN_VALUES["1B"] * c["singles"] + RUN_VALUES["2B"] * c["doubles"]
+                           + RUN_VALUES["3B"] * c["triples"] + RUN_VALUES["HR"] * c["homeRuns"])
+    c["woba_denominator"] = (c["atBats"] + c["unintentional"] + c["hitByPitch"]
+                             + c["sacFlies"])
+    c["on_base"] = c["hits"] + c["baseOnBalls"] + c["hitByPitch"]
+    c["obp_denominator"] = c["atBats"] + c["baseOnBalls"] + c["hitByPitch"] + c["sacFlies"]
+    return c
+
+
+def _pitching_columns(table, rows):
+    c = {name: table.column(name, rows) for name in (
+        "battersFaced", "outs", "homeRuns", "baseOnBalls", "hitByPitch", "strikeOuts",
+        "earnedRuns")}
+    c["innings"] = c["outs"] / 3
+    c["fip_core"] = 13 * c["homeRuns"] + 3 * (c["baseOnBalls"] + c["hitByPitch"]) \
+        - 2 * c["strikeOuts"]
+    return c
+
+
+def _ratio(numerator, denominator):
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(denominator > 0, numerator / denominator, np.nan)
+
+
+def league_constants(store, stat_type="season", season=None):
+    """{(season, sport_id): LeagueConstants} aggregated from the store's lines."""
+    sums = {}
+    if "hitting" in store:
+        table = store["hitting"]
+        rows = _rows(table, stat_type, season)
+        inverse, leagues = _league_keys(table, rows)
+        c = _hitting_columns(table, rows)
+        for name in ("woba_numerator", "woba_denominator", "on_base", "obp_denominator",
+                     "runs", "plateAppearances"):
+            total = np.bincount(inverse, c[name], minlength=len(leagues))
+            for league, value in zip(leagues, total.tolist()):
+                sums.setdefault(league, {})[name] = value
+        has_runs = "runs" in table and bool(np.isfinite(table["runs"][rows]).any())
+    else:
+        has_runs = False
+    if "pitching" in store:
+        table = store["pitching"]
+        rows = _rows(table, stat_type, season)
+        inverse, leagues = _league_keys(table, rows)
+        c = _pitching_columns(table, rows)
+        for name in ("fip_core", "innings", "earnedRuns"):
+            total = np.bincount(inverse, c[name], minlength=len(leagues))
+            for league, value in zip(leagues, total.tolist()):
+                sums.setdefault(league, {})[name] = value
+
+    constants = {}
+    for league, s in sums.items():
+        lg_obp = s.get("on_base", 0) / s["obp_denominator"] if s.get("obp_denominator") else 0.0
+        raw_woba = (s.get("woba_numerator", 0) / s["woba_denominator"]
+                    if s.get("woba_denominator") else 0.0)
+        runs_per_pa = (s["runs"] / s["plateAppearances"]
+                       if has_runs and s.get("plateAppearances") else RUNS_PER_PA)
+        innings = s.get("innings", 0)
+        lg_era = 9 * s.get("earnedRuns", 0) / innings if innings else 0.0
+        fip_constant = lg_era - s.get("fip_core", 0) / innings if innings else 0.0
+        constants[league] = LeagueConstants(
+            woba_scale=lg_obp / raw_woba if raw_woba else 1.0, lg_woba=lg_obp, lg_obp=lg_obp,
+            runs_per_pa=runs_per_pa, fip_constant=fip_constant, lg_fip=lg_era)
+    return constants
+
+
+def save_constants(constants, path):
+    with open(path, "w") as f:
+        json.dump([[season, sport_id, *c] for (season, sport_id), c in constants.items()], f)
+
+
+def load_constants(path):
+    with open(path) as f:
+        return {(row[0], row[1]): LeagueConstants(*row[2:]) for row in json.load(f)}
+
+
+def _constant_columns(table, rows, constants):
+    inverse, leagues = _league_keys(table, rows)
+    missing = LeagueConstants(1.0, np.nan, np.nan, RUNS_PER_PA, np.nan, np.nan)
+    values = np.array([constants.get(league, missing) for league in leagues], np.float64)
+    values = values.reshape(len(leagues), len(LeagueConstants._fields))
+    return {name: values[inverse, i] for i, name in enumerate(LeagueConstants._fields)}
+
+
+def _keys(table, rows):
+    return {name: np.asarray(table[name][rows]) for name in KEY_COLUMNS if name in table}
+
+
+def hitting_metrics(table, constants, stat_type="season", season=None, park_factors=None,
+                    translation=None):
+    """StatTable of wOBA, ISO, BB%, K%, K-BB%, wRAA, wRC+ and MLB-equivalent wOBA."""
+    rows = _rows(table, stat_type, season)
+    c = _hitting_columns(table, rows)
+    k = _constant_columns(table, rows, constants)
+    park = _lookup(table["team_id"][rows], park_factors, 1.0)
+    level = _lookup(table["sport_id"][rows], translation or TRANSLATION, 1.0)
+
+    woba = _ratio(c["woba_numerator"], c["woba_denominator"]) * k["woba_scale"]
+    wraa_per_pa = (woba - k["lg_woba"]) / k["woba_scale"]
+    lg_r = k["runs_per_pa"]
+    wrc_plus = 100 * (wraa_per_pa + lg_r + (lg_r - park * lg_r)) / lg_r
+    columns = _keys(table, rows)
+    columns.update({
+        "woba": woba,
+        "iso": _ratio(c["doubles"] + 2 * c["triples"] + 3 * c["homeRuns"], c["atBats"]),
+        "bb_pct": _ratio(c["baseOnBalls"], c["plateAppearances"]),
+        "k_pct": _ratio(c["strikeOuts"], c["plateAppearances"]),
+        "k_minus_bb": _ratio(c["strikeOuts"] - c["baseOnBalls"], c["plateAppearances"]),
+        "wraa": wraa_per_pa * c["plateAppearances"],
+        "wrc_plus": wrc_plus,
+        "woba_mlb": woba * level,
+    })
+    return StatTable(columns, "hitting")
+
+
+def pitching_metrics(table, constants, stat_type="season", season=None, park_factors=None,
+                     translation=None):
+    """StatTable of FIP, FIP-, K%, BB%, K-BB% and MLB-equivalent FIP."""
+    rows = _rows(table, stat_type, season)
+    c = _pitching_columns(table, rows)
+    k = _constant_columns(table, rows, constants)
+    park = _lookup(table["team_id"][rows], park_factors, 1.0)
+    level = _lookup(table["sport_id"][rows], translation or TRANSLATION, 1.0)
+
+    fip = _ratio(c["fip_core"], c["innings"]) + k["fip_constant"]
+    columns = _keys(table, rows)
+    columns.update({
+        "fip": fip,
+        "fip_minus": 100 * (fip + (fip - fip * park)) / k["lg_fip"],
+        "k_pct": _ratio(c["strikeOuts"], c["battersFaced"]),
+        "bb_pct": _ratio(c["baseOnBalls"], c["battersFaced"]),
+        "k_minus_bb": _ratio(c["strikeOuts"] - c["baseOnBalls"], c["battersFaced"]),
+        "fip_mlb": fip / level,
+    })
+    return StatTable(columns, "pitching")
+
+
+def _paired_rates(table, stat_type, columns, numerator, denominator, min_pairs):
+    """{sport_id: (level rate, MLB rate)} pooled over players with lines at both.
+
+    Only lines of players who also have an MLB line in the same season
+    count; levels with fewer than `min_pairs` such players are left out.
+    """
+    rows = _rows(table, stat_type, None)
+    c = columns(table, rows)
+    player_season = (table["player_id"][rows].astype(np.int64) * 10000
+                     + table["season"][rows])
+    sport = table["sport_id"][rows]
+    mlb = np.unique(player_season[sport == 1])
+    rates = {}
+    for level in np.unique(sport[sport != 1]).tolist():
+        at_level = sport == level
+        paired_keys = np.intersect1d(np.unique(player_season[at_level]), mlb)
+        if len(paired_keys) < min_pairs:
+            continue
+        paired = np.isin(player_season, paired_keys)
+        in_level, in_mlb = paired & at_level, paired & (sport == 1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rates[level] = (c[numerator][in_level].sum() / c[denominator][in_level].sum(),
+                            c[numerator][in_mlb].sum() / c[denominator][in_mlb].sum())
+    return rates
+
+
+def translation_factors(store, stat_type="season", min_pairs=MIN_PAIRS, defaults=TRANSLATION,
+                        group="hitting"):
+    """{sport_id: factor} from players with lines at both a level and MLB.
+
+    For "hitting" the factor is MLB wOBA / level wOBA (wOBA is multiplied by
+    it); for "pitching" it is level ERA / MLB ERA (FIP is divided by it).
+    Levels with fewer than `min_pairs` paired players keep the default.
+    """
+    factors = dict(defaults)
+    if group not in store:
+        return factors
+    if group == "hitting":
+        rates = _paired_rates(store[group], stat_type, _hitting_columns, "woba_numerator",
+                              "woba_denominator", min_pairs)
+        factors.update({level: mlb / at_level for level, (at_level, mlb) in rates.items()
+                        if at_level > 0})
+    else:
+        rates = _paired_rates(store[group], stat_type, _pitching_columns, "earnedRuns",
+                              "innings", min_pairs)
+        factors.update({level: at_level / mlb for level, (at_level, mlb) in rates.items()
+                        if at_level > 0 and mlb > 0})
+    return factors
+
+
+def derive(store, stat_type="season", season=None, constants=None, park_factors=None,
+           translation=None, pitching_translation=None):
+    """{"hitting": StatTable, "pitching": StatTable} of derived metrics for the store.
+
+    `translation` and `pitching_translation` are translation_factors() for
+    each group; by default both are estimated from the store.
+    """
+    constants = constants or league_constants(store, stat_type, season)
+    result = {}
+    if "hitting" in store:
+        translation = translation or translation_factors(store, stat_type)
+        result["hitting"] = hitting_metrics(store["hitting"], constants, stat_type, season,
+                                            park_factors, translation)
+    if "pitching" in store:
+        pitching_translation = pitching_translation or translation_factors(
+            store, stat_type, group="pitching")
+        result["pitching"] = pitching_metrics(store["pitching"], constants, stat_type, season,
+                                              park_factors, pitching_translation)
+    return result
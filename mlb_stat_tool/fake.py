@@ -0,0 +1,365 @@
+"""
+Fake Stats API
+Deterministic in-process stand-in for statsapi.get, sized like a real league
+"""
+
+import asyncio
+import gzip
+import json
+import random
+import re
+import threading
+import time
+from urllib.parse import parse_qsl, urlsplit
+
+HITTING = ["gamesPlayed", "plateAppearances", "atBats", "hits", "doubles", "triples", "homeRuns",
+           "baseOnBalls", "hitByPitch", "strikeOuts", "sacFlies", "stolenBases", "caughtStealing"]
+PITCHING = ["gamesPlayed", "gamesStarted", "battersFaced", "outs", "hits", "homeRuns",
+            "baseOnBalls", "hitByPitch", "strikeOuts", "earnedRuns", "wins", "losses"]
+FIELDING = ["gamesPlayed", "chances", "putOuts", "assists", "errors"]
+POSITIONS = ["P", "C", "1B", "2B", "3B", "SS", "LF", "CF", "RF", "DH"]
+
+
+def _hitting(rng):
+    pa = rng.randint(20, 700)
+    bb, hbp, so, sf = (int(pa * rng.uniform(a, b)) for a, b in
+                       ((0.04, 0.14), (0, 0.02), (0.12, 0.32), (0, 0.01)))
+    ab = pa - bb - hbp - sf
+    hits = int(ab * rng.uniform(0.18, 0.32))
+    hr = int(hits * rng.uniform(0.03, 0.25))
+    doubles = int((hits - hr) * rng.uniform(0.15, 0.3))
+    triples = int((hits - hr - doubles) * rng.uniform(0, 0.05))
+    stat = dict(zip(HITTING, (pa // 4, pa, ab, hits, doubles, triples, hr, bb, hbp, so, sf,
+                              rng.randint(0, 30), rng.randint(0, 8))))
+    obp = (hits + bb + hbp) / max(ab + bb + hbp + sf, 1)
+    slg = (hits + doubles + 2 * triples + 3 * hr) / max(ab, 1)
+    stat.update({"avg": f"{hits / max(ab, 1):.3f}".lstrip("0"), "obp": f"{obp:.3f}".lstrip("0"),
+                 "slg": f"{slg:.3f}".lstrip("0"), "ops": f"{obp + slg:.3f}".lstrip("0")})
+    return stat
+
+
+def _pitching(rng):
+    outs = rng.randint(9, 600)
+    bf = int(outs * rng.uniform(1.25, 1.55))
+    so = int(bf * rng.uniform(0.15, 0.35))
+    bb, hbp = int(bf * rng.uniform(0.05, 0.12)), int(bf * rng.uniform(0, 0.015))
+    hits = int(bf * rng.uniform(0.17, 0.27))
+    hr = int(hits * rng.uniform(0.05, 0.18))
+    er = int(outs / 27 * rng.uniform(2.5, 6))
+    stat = dict(zip(PITCHING, (outs // 15, rng.randint(0, 30), bf, outs, hits, hr, bb, hbp, so,
+                               er, rng.randint(0, 15), rng.randint(0, 12))))
+    innings = outs / 3
+    stat.update({"inningsPitched": f"{outs // 3}.{outs % 3}", "era": f"{9 * er / innings:.2f}",
+                 "whip": f"{(bb + hits) / innings:.2f}"})
+    return stat
+
+
+def _fielding(rng):
+    chances = rng.randint(10, 600)
+    errors = int(chances * rng.uniform(0, 0.04))
+    putouts = int((chances - errors) * rng.uniform(0.3, 0.9))
+    stat = dict(zip(FIELDING, (rng.randint(10, 162), chances, putouts,
+                               chances - errors - putouts, errors)))
+    stat["fielding"] = f"{(chances - errors) / chances:.3f}"
+    return stat
+
+
+GENERATORS = {"hitting": _hitting, "pitching": _pitching, "fielding": _fielding}
+
+
+# Values the meta endpoints return (a subset of the live API's)
+META = {
+    "statGroups": ["hitting", "pitching", "fielding", "catching", "running", "game", "team",
+                   "streak"],
+    "statTypes": ["projected", "yearByYear", "yearByYearAdvanced", "season", "career",
+                  "gameLog", "vsTeam", "vsPlayer", "byDateRange", "lastXGames", "homeAndAway"],
+    "leagueLeaderTypes": ["homeRuns", "battingAverage", "runsBattedIn", "stolenBases",
+                          "earnedRunAverage", "strikeouts", "wins", "saves"],
+    "rosterTypes": ["40Man", "fullSeason", "fullRoster", "nonRosterInvitees", "active",
+                    "allTime", "depthChart", "gameday", "coach"],
+    "standingsTypes": ["regularSeason", "wildCard", "divisionLeaders", "wildCardWithLeaders",
+                       "firstHalf", "secondHalf", "springTraining", "postseason", "byDivision",
+                       "byConference", "byLeague", "byOrganization"],
+}
+SPORTS = {1: "mlb", 11: "aaa", 12: "aax", 13: "afa", 14: "afx", 16: "rok"}
+
+
+class FakeStatsAPI:
+    """Serves teams, rosters, people, seasons, standings, leaders and meta like statsapi.get.
+
+    Every response is kept as encoded JSON and decoded per call, so decode
+    cost and bytes_decoded resemble a real client's. `latency` (seconds)
+    is slept on each call to model the network round-trip.
+    `milb_sport_ids` spreads the MiLB clubs over several levels.
+    """
+
+    def __init__(self, mlb_teams=30, milb_teams=120, roster_size=26, latency=0.0, seed=0,
+                 season=2024, milb_sport_ids=(11,)):
+        self.latency = latency
+        self.seed = seed
+        self.season = season
+        self.calls = 0
+        self.bytes_decoded = 0
+        self.decode_seconds = 0.0
+        self._lock = threading.Lock()
+        self._encoded = {}
+        self.teams = {}
+        for level, count, first_id in ((1, mlb_teams, 100), (11, milb_teams, 1000)):
+            for i in range(count):
+                team_id = first_id + i
+                parent = 100 + i % mlb_teams if level != 1 else None
+                # MiLB clubs fill one level per organization before the next
+                sport_id = level if level == 1 else \
+                    milb_sport_ids[i // mlb_teams % len(milb_sport_ids)]
+                self.teams[team_id] = {
+                    "id": team_id,
+                    "name": f"Team {team_id}",
+                    "abbreviation": f"T{team_id}",
+                    "sport": {"id": sport_id},
+                    "league": {"id": 103 + i % 2},
+                    "division": {"id": 200 + i % 6, "name": f"Division {i % 6}",
+                                 "abbreviation": f"D{i % 6}"},
+                    **({"parentOrgId": parent} if parent else {}),
+                }
+        self.rosters = {team_id: [team_id * 100 + i for i in range(roster_size)]
+                        for team_id in self.teams}
+        self.team_of = {pid: tid for tid, pids in self.rosters.items() for pid in pids}
+
+    def _respond(self, key, build):
+        with self._lock:
+            encoded = self._encoded.get(key)
+        if encoded is None:
+            encoded = json.dumps(build()).encode("utf-8")
+            with self._lock:
+                self._encoded[key] = encoded
+        with self._lock:
+            self.calls += 1
+            self.bytes_decoded += len(encoded)
+        if self.latency:
+            time.sleep(self.latency)
+        start = time.perf_counter()
+        decoded = json.loads(encoded)
+        elapsed = time.perf_counter() - start
+        with self._lock:
+            self.decode_seconds += elapsed
+        return decoded
+
+    def person(self, player_id, groups=("hitting", "pitching", "fielding"),
+               types=("career", "season"), sport_id=None):
+        """A hydrated person; stats only when `sport_id` is the player's level."""
+        team = self.teams[self.team_of[player_id]]
+        if sport_id is not None and sport_id != team["sport"]["id"]:
+            groups = ()
+        rng = random.Random(self.seed * 1_000_003 + player_id)
+        position = POSITIONS[player_id % len(POSITIONS)]
+        stats = []
+        for stat_type in types:
+            for group in groups:
+                if group == "pitching" and position != "P" or group == "hitting" and position == "P":
+                    continue
+                split = {"stat": GENERATORS[group](rng), "team": {"id": team["id"]},
+                         "sport": {"id": team["sport"]["id"]}}
+                if stat_type != "career":
+                    split["season"] = str(self.season)
+                stats.append({"type": {"displayName": stat_type},
+                              "group": {"displayName": group}, "splits": [split]})
+        return {
+            "id": player_id, "fullName": f"Player {player_id}", "useName": "Player",
+            "firstName": "Player", "lastName": str(player_id), "active": True,
+            "birthDate": f"{1990 + player_id % 15}-0{1 + player_id % 9}-15",
+            "currentTeam": {"id": team["id"], "name": team["name"]},
+            "primaryPosition": {"abbreviation": position},
+            "batSide": {"description": "Right"}, "pitchHand": {"description": "Right"},
+            "stats": stats,
+        }
+
+    def __call__(self, endpoint, params={}, *args, **kwargs):
+        handler = getattr(self, "_" + endpoint, None)
+        if handler is None:
+            raise ValueError("Invalid endpoint (" + str(endpoint) + ").")
+        key = endpoint + ":" + json.dumps(params, sort_keys=True, default=str)
+        return self._respond(key, lambda: handler(params))
+
+    def _teams(self, params):
+        sport_ids = {int(s) for s in str(params.get("sportId", params.get("sportIds", 1))).split(",")}
+        return {"teams": [t for t in self.teams.values() if t["sport"]["id"] in sport_ids]}
+
+    def _season(self, params):
+        return {"seasons": [{"seasonId": str(self.season),
+                             "seasonEndDate": f"{self.season}-12-31"}]}
+
+    def _sports_players(self, params):
+        return {"people": [{"id": pid, "fullName": f"Player {pid}", "firstName": "Player",
+                            "lastName": str(pid), "currentTeam": {"id": tid}}
+                           for pid, tid in self.team_of.items()]}
+
+    def _meta(self, params):
+        field = {"rosterTypes": "parameter", "standingsTypes": "name"}.get(params["type"],
+                                                                          "displayName")
+        return [{field: value} for value in META[params["type"]]]
+
+    def _sports(self, params):
+        return {"sports": [{"id": sport_id, "code": code} for sport_id, code in SPORTS.items()]}
+
+    def _team_roster(self, params):
+        team_id = int(params["teamId"])
+        return {"roster": [{"person": {"id": pid, "fullName": f"Player {pid}"},
+                            "jerseyNumber": str(pid % 100),
+                            "position": {"abbreviation": POSITIONS[pid % len(POSITIONS)]},
+                            "status": {"code": "A"}}
+                           for pid in self.rosters[team_id]]}
+
+    @staticmethod
+    def _hydrated(params):
+        """(groups, types, sport_id) from a stats(...) hydrate string."""
+        hydrate = params.get("hydrate", "")
+
+        def values(name):
+            value = hydrate.split(name + "=", 1)[1]
+            if value.startswith("["):
+                return value[1:value.index("]")].split(",")
+            return [value.split(",")[0].split(")")[0]]
+
+        sport_id = int(values("sportId")[0]) if "sportId=" in hydrate else 1
+        return [g.strip().lower() for g in values("group")], values("type"), sport_id
+
+    def _person(self, params):
+        return {"people": [self.person(int(params["personId"]), *self._hydrated(params))]}
+
+    def _people(self, params):
+        hydrated = self._hydrated(params)
+        ids = [int(i) for i in str(params["personIds"]).split(",")]
+        return {"people": [self.person(i, *hydrated) for i in ids if i in self.team_of]}
+
+    def _standings(self, params):
+        records = {}
+        for team in self.teams.values():
+            if team["sport"]["id"] == 1:
+                rng = random.Random(team["id"])
+                wins = rng.randint(60, 100)
+                records.setdefault(team["division"]["id"], []).append({
+                    "team": team, "divisionRank": "1", "wins": wins, "losses": 162 - wins,
+                    "gamesBack": "-", "leagueRank": "1", "sportRank": "1"})
+        return {"records": [{"teamRecords": r} for r in records.values()]}
+
+    def _leaders(self, player_ids, params):
+        leaders = []
+        for rank, pid in enumerate(player_ids[: int(params.get("limit", 10))], 1):
+            team = self.teams[self.team_of[pid]]
+            leaders.append({"rank": rank, "value": str(40 - rank),
+                            "person": {"id": pid, "fullName": f"Player {pid}"},
+                            "team": {"id": team["id"], "name": team["name"]}})
+        return [{"leaderCategory": category, "leaders": leaders}
+                for category in str(params["leaderCategories"]).split(",")]
+
+    def _team_leaders(self, params):
+        return {"teamLeaders": self._leaders(self.rosters[int(params["teamId"])], params)}
+
+    def _stats_leaders(self, params):
+        return {"leagueLeaders": self._leaders(sorted(self.team_of), params)}
+
+
+# Path patterns for the endpoints FakeStatsAPI implements, most specific first
+ROUTES = [(re.compile(pattern), endpoint) for pattern, endpoint in (
+    (r"/api/v1/teams/(?P<teamId>\d+)/roster", "team_roster"),
+    (r"/api/v1/teams/(?P<teamId>\d+)/leaders", "team_leaders"),
+    (r"/api/v1/teams", "teams"),
+    (r"/api/v1/people/(?P<personId>\d+)", "person"),
+    (r"/api/v1/people", "people"),
+    (r"/api/v1/standings", "standings"),
+    (r"/api/v1/stats/leaders", "stats_leaders"),
+    (r"/api/v1/seasons(?:/(?P<seasonId>\w+))?", "season"),
+    (r"/api/v1/sports/(?P<sportId>\d+)/players", "sports_players"),
+    (r"/api/v1/sports", "sports"),
+    (r"/api/v1/(?P<type>%s)" % "|".join(META), "meta"),
+)]
+
+
+class FakeStatsServer:
+    """Serves a FakeStatsAPI over HTTP/1.1 keep-alive on localhost (asyncio).
+
+    Set `chunked` to send bodies with chunked transfer encoding (with chunk
+    extensions and a trailer); gzip is used whenever the client accepts it.
+    `redirects` maps request paths to the Location sent back with a 301.
+    """
+
+    def __init__(self, api=None, chunked=False, redirects=None):
+        self.api = api or FakeStatsAPI()
+        self.chunked = chunked
+        self.redirects = dict(redirects or {})
+        self.connections = 0
+        self.requests = 0
+        self._server = None
+
+    async def start(self):
+        """Start listening and return the base URL to use instead of statsapi's."""
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        port = self._server.sockets[0].getsockname()[1]
+        return f"http://127.0.0.1:{port}/api/"
+
+    async def stop(self):
+        self._server.close()
+        await self._server.wait_closed()
+
+    def route(self, target):
+        parts = urlsplit(target)
+        for pattern, endpoint in ROUTES:
+            match = pattern.fullmatch(parts.path)
+            if match:
+                params = dict(parse_qsl(parts.query))
+                params.update({k: v for k, v in match.groupdict().items() if v is not None})
+                return endpoint, params
+        return None, None
+
+    async def _handle(self, reader, writer):
+        self.connections += 1
+        try:
+            while True:
+                request = await reader.readline()
+                if not request:
+                    break
+                headers = {}
+                while (line := await reader.readline()) not in (b"\r\n", b""):
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                self.requests += 1
+                await self._respond(writer, request.split()[1].decode(), headers)
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def _respond(self, writer, target, headers):
+        parts = urlsplit(target)
+        location = self.redirects.get(parts.path)
+        if location:
+            if parts.query and "?" not in location:
+                location += "?" + parts.query
+            writer.write(f"HTTP/1.1 301 Moved Permanently\r\nLocation: {location}\r\n"
+                         "Content-Length: 0\r\n\r\n".encode())
+            await writer.drain()
+            return
+        endpoint, params = self.route(target)
+        status = "200 OK"
+        try:
+            body = json.dumps(self.api(endpoint, params)).encode() if endpoint else None
+        except (LookupError, ValueError):
+            body = None
+        if body is None:
+            status, body = "404 Not Found", b'{"message": "Object not found"}'
+        head = [f"HTTP/1.1 {status}", "Content-Type: application/json"]
+        if "gzip" in headers.get("accept-encoding", ""):
+            body = gzip.compress(body)
+            head.append("Content-Encoding: gzip")
+        if self.chunked:
+            head.append("Transfer-Encoding: chunked")
+            third = len(body) // 3 + 1
+            parts = [body[i:i + third] for i in range(0, len(body), third)]
+            payload = b"".join(b"%x;part=%d\r\n%s\r\n" % (len(part), i, part)
+                               for i, part in enumerate(parts))
+            payload += b"0\r\nX-Served-By: fake\r\n\r\n"
+        else:
+            head.append(f"Content-Length: {len(body)}")
+            payload = body
+        writer.write(("\r\n".join(head) + "\r\n\r\n").encode() + payload)
+        await writer.drain()
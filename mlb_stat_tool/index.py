@@ -0,0 +1,147 @@
+"""
+Player Name Index
+Local name -> ID resolution over players seen by the roster crawl
+"""
+
+import bisect
+import json
+import re
+import unicodedata
+from collections import defaultdict
+from typing import NamedTuple
+
+from .crawl import SPORT_IDS, crawl_rosters
+
+SUFFIXES = {"jr", "sr", "ii", "iii", "iv"}
+
+
+class IndexedPlayer(NamedTuple):
+    player_id: int
+    full_name: str
+    team_id: int
+
+
+def normalize_name(name):
+    """Lowercase, strip accents and punctuation, and drop name suffixes."""
+    name = unicodedata.normalize("NFKD", name)
+    name = "".join(c for c in name if not unicodedata.combining(c)).lower()
+    tokens = re.sub(r"[^a-z0-9 ]+", " ", name.replace("'", "")).split()
+    return " ".join(t for t in tokens if t not in SUFFIXES)
+
+
+def trigrams(text):
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class PlayerIndex:
+    """Exact, prefix and trigram lookups over a fixed set of players."""
+
+    def __init__(self, players=()):
+        self.players = {}
+        self._names = defaultdict(list)
+        self._tokens = defaultdict(list)
+        self._trigrams = defaultdict(set)
+        self._prefixes = []
+        for player in players:
+            self.add(*player)
+
+    @classmethod
+    def from_crawl(cls, sport_ids=SPORT_IDS, **crawl_kwargs):
+        """Build an index from a full roster crawl."""
+        index = cls()
+        for team_id, player_id, full_name in crawl_rosters(sport_ids, **crawl_kwargs):
+            index.add(player_id, full_name, team_id)
+        return index
+
+    def add(self, player_id, full_name, team_id=None):
+        """Index one player; re-adding an ID replaces its team only."""
+        if player_id in self.players:
+            self.players[player_id] = self.players[player_id]._replace(team_id=team_id)
+            return
+        self.players[player_id] = IndexedPlayer(player_id, full_name, team_id)
+        name = normalize_name(full_name)
+        self._names[name].append(player_id)
+        keys = {name, *name.split()}
+        for token in name.split():
+            self._tokens[token].append(player_id)
+        for key in keys:
+            bisect.insort(self._prefixes, (key, player_id))
+        for gram in trigrams(name):
+            self._trigrams[gram].add(player_id)
+
+    def __len__(self):
+        return len(self.players)
+
+    def __contains__(self, player_id):
+        return player_id in self.players
+
+    def get(self, player_id):
+        """Return the player for an ID, or None."""
+        return self.players.get(player_id)
+
+    def exact(self, name):
+        """Players whose full normalized name matches exactly."""
+        return [self.players[i] for i in self._names.get(normalize_name(name), ())]
+
+    def tokens(self, name):
+        """Players having every name token, e.g. a bare surname."""
+        ids = None
+        for token in normalize_name(name).split():
+            found = set(self._tokens.get(token, ()))
+            ids = found if ids is None else ids & found
+        return [self.players[i] for i in sorted(ids or ())]
+
+    def prefix(self, text, limit=25):
+        """Players with a full name or name token starting with `text`."""
+        text = normalize_name(text)
+        if not text:
+            return []
+        start = bisect.bisect_left(self._prefixes, (text, -1))
+        seen = []
+        for key, player_id in self._prefixes[start:]:
+            if not key.startswith(text) or len(seen) >= limit:
+                break
+            if player_id not in seen:
+                seen.append(player_id)
+        return [self.players[i] for i in seen]
+
+    def fuzzy(self, text, limit=10, threshold=0.3):
+        """Players ranked by trigram similarity to `text`."""
+        query = trigrams(normalize_name(text))
+        shared = defaultdict(int)
+        for gram in query:
+            for player_id in self._trigrams.get(gram, ()):
+                shared[player_id] += 1
+        scored = []
+        for player_id, count in shared.items():
+            size = len(trigrams(normalize_name(self.players[player_id].full_name)))
+            score = count / (len(query) + size - count)
+            if score >= threshold:
+                scored.append((score, player_id))
+        scored.sort(key=lambda s: (-s[0], s[1]))
+        return [self.players[i] for _, i in scored[:limit]]
+
+    def resolve(self, name, team_id=None):
+        """Return every candidate for `name`, narrowest match first.
+
+        Tries exact full name, then all tokens, then prefix, then fuzzy.
+        Common surnames yield several candidates; pass `team_id` to narrow
+        them when the caller knows the club.
+        """
+        for search in (self.exact, self.tokens, self.prefix, self.fuzzy):
+            found = search(name)
+            if team_id is not None:
+                found = [p for p in found if p.team_id == team_id] or found
+            if found:
+                return found
+        return []
+
+    def save(self, path):
+        with open(path, "w") as f:
+            json.dump([list(p) for p in self.players.values()], f)
+
+    @classmethod
+    def load(cls, path):
+        with open(path) as f:
+            return cls(tuple(p) for p in json.load(f))
@@ -0,0 +1,378 @@
+"""
+Instrumentation
+Per-endpoint counts, latency histograms, bytes and decode time
+
+install() wraps each statsapi entry point (lookup_player, roster, ...),
+statsapi.get itself (labelled by endpoint) and the HTTP client statsapi
+uses, so one Metrics object sees how often each function and endpoint is
+called, how long calls take, how many bytes come back and how long JSON
+decoding takes. Decode time is the part of a get() spent after the HTTP
+response arrived. Cache hit/miss counts come from a ResponseCache when one
+is given.
+
+Named stages (`with metrics.stage("parse"): ...`) time parse/transform
+steps; with a Sampler attached, the stacks of threads inside a stage are
+sampled periodically to show where that time goes.
+
+Export with to_prometheus() (text exposition format) or to_json().
+"""
+
+import bisect
+import functools
+import json
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+
+import statsapi
+
+from . import transport
+
+# Upper bounds in seconds
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# statsapi entry points install() wraps by default
+INSTRUMENTED_FUNCTIONS = [
+    "lookup_player", "lookup_team", "player_stats", "player_stat_data", "roster", "standings",
+    "standings_data", "team_leaders", "team_leader_data", "league_leaders",
+    "league_leader_data", "meta",
+]
+
+PREFIX = "mlb_stat_tool"
+
+
+class Histogram:
+    """Cumulative-bucket histogram in the Prometheus style."""
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, q):
+        """Upper bound of the bucket holding the q-th quantile (inf past the last)."""
+        if not self.count:
+            return None
+        rank, seen = q * self.count, 0
+        for bound, n in zip(self.buckets + (float("inf"),), self.counts):
+            seen += n
+            if seen >= rank:
+                return bound
+        return float("inf")
+
+    def cumulative(self):
+        """[(le, cumulative count)] including +Inf."""
+        total, result = 0, []
+        for bound, n in zip(self.buckets + (float("inf"),), self.counts):
+            total += n
+            result.append((bound, total))
+        return result
+
+    def to_dict(self):
+        return {"count": self.count, "sum": round(self.sum, 6),
+                "p50": self.quantile(0.5), "p95": self.quantile(0.95),
+                "buckets": {_le(bound): n for bound, n in self.cumulative()}}
+
+
+def _le(bound):
+    return "+Inf" if bound == float("inf") else repr(bound)
+
+
+def _labels(**labels):
+    return "{" + ",".join(f'{k}="{v}"' for k, v in labels.items()) + "}"
+
+
+class Metrics:
+    """Thread-safe counters and histograms for statsapi traffic."""
+
+    def __init__(self, cache=None, buckets=LATENCY_BUCKETS):
+        self.cache = cache
+        self.buckets = buckets
+        self.sampler = None
+        self.calls = Counter()
+        self.errors = Counter()
+        self.latency = defaultdict(lambda: Histogram(self.buckets))
+        self.requests = Counter()
+        self.request_latency = defaultdict(lambda: Histogram(self.buckets))
+        self.response_bytes = Counter()
+        self.decode_seconds = Counter()
+        self.stages = defaultdict(lambda: Histogram(self.buckets))
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def record_call(self, function, seconds, error=None):
+        with self._lock:
+            self.calls[function] += 1
+            self.latency[function].observe(seconds)
+            if error is not None:
+                self.errors[(function, type(error).__name__)] += 1
+
+    def record_request(self, endpoint, seconds, nbytes=0, decode=0.0, error=None):
+        with self._lock:
+            self.requests[endpoint] += 1
+            self.request_latency[endpoint].observe(seconds)
+            self.response_bytes[endpoint] += nbytes
+            self.decode_seconds[endpoint] += decode
+            if error is not None:
+                self.errors[("get:" + endpoint, type(error).__name__)] += 1
+
+    def wrap(self, func, name=None):
+        """Return `func` with its calls counted and timed under `name`."""
+        name = name or func.__name__
+
+        @functools.wraps(func)
+        def instrumented(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                result = func(*args, **kwargs)
+            except Exception as e:
+                self.record_call(name, time.perf_counter() - start, e)
+                raise
+            self.record_call(name, time.perf_counter() - start)
+            return result
+
+        instrumented.__wrapped__ = func
+        return instrumented
+
+    def wrap_get(self, get):
+        """Return a statsapi.get replacement recording per-endpoint metrics."""
+
+        @functools.wraps(get)
+        def instrumented_get(endpoint, params={}, *args, **kwargs):
+            self._local.transfer = None
+            start = time.perf_counter()
+            error = None
+            try:
+                return get(endpoint, params, *args, **kwargs)
+            except Exception as e:
+                error = e
+                raise
+            finally:
+                elapsed = time.perf_counter() - start
+                transfer, nbytes = self._local.transfer or (elapsed, 0)
+                self.record_request(endpoint, elapsed, nbytes,
+                                    max(elapsed - transfer, 0.0) if nbytes else 0.0, error)
+
+        instrumented_get.__wrapped__ = get
+        return instrumented_get
+
+    @contextmanager
+    def stage(self, name):
+        """Time a parse/transform stage; the sampler attributes samples to it."""
+        thread = threading.get_ident()
+        sampler = self.sampler
+        if sampler is not None:
+            sampler.enter(thread, name)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            if sampler is not None:
+                sampler.exit(thread)
+            with self._lock:
+                self.stages[name].observe(elapsed)
+
+    def timed(self, name):
+        """Decorator form of stage()."""
+        def decorate(func):
+            @functools.wraps(func)
+            def staged(*args, **kwargs):
+                with self.stage(name):
+                    return func(*args, **kwargs)
+            return staged
+        return decorate
+
+    def cache_stats(self):
+        if self.cache is None:
+            return None
+        hits, misses = self.cache.hits, self.cache.misses
+        return {"hits": hits, "misses": misses,
+                "hit_ratio": round(hits / (hits + misses), 4) if hits + misses else None}
+
+    def to_json(self):
+        """All metrics as a JSON-serializable dict."""
+        with self._lock:
+            result = {
+                "functions": {name: {"calls": self.calls[name], **self.latency[name].to_dict()}
+                              for name in sorted(self.calls)},
+                "endpoints": {name: {"requests": self.requests[name],
+                                     "bytes": self.response_bytes[name],
+                                     "decode_seconds": round(self.decode_seconds[name], 6),
+                                     **self.request_latency[name].to_dict()}
+                              for name in sorted(self.requests)},
+                "errors": {f"{where}:{error}": n for (where, error), n in self.errors.items()},
+                "stages": {name: h.to_dict() for name, h in sorted(self.stages.items())},
+            }
+        result["cache"] = self.cache_stats()
+        if self.sampler is not None:
+            result["profile"] = {stage: self.sampler.top(stage)
+                                 for stage in sorted(self.sampler.samples)}
+        return result
+
+    def to_prometheus(self):
+        """All metrics in the Prometheus text exposition format."""
+        lines = []
+
+        def metric(name, kind, help_text, samples):
+            lines.append(f"# HELP {PREFIX}_{name} {help_text}")
+            lines.append(f"# TYPE {PREFIX}_{name} {kind}")
+            lines.extend(f"{PREFIX}_{name}{suffix} {value}" for suffix, value in samples)
+
+        def histogram(name, help_text, label, histograms):
+            samples = []
+            for key, h in sorted(histograms.items()):
+                for bound, n in h.cumulative():
+                    samples.append(("_bucket" + _labels(**{label: key, "le": _le(bound)}), n))
+                samples.append(("_sum" + _labels(**{label: key}), round(h.sum, 6)))
+                samples.append(("_count" + _labels(**{label: key}), h.count))
+            metric(name, "histogram", help_text, samples)
+
+        with self._lock:
+            metric("calls_total", "counter", "Calls per statsapi entry point.",
+                   [(_labels(function=k), v) for k, v in sorted(self.calls.items())])
+            histogram("call_seconds", "Entry point latency.", "function", self.latency)
+            metric("requests_total", "counter", "Requests per Stats API endpoint.",
+                   [(_labels(endpoint=k), v) for k, v in sorted(self.requests.items())])
+            histogram("request_seconds", "Request latency per endpoint.", "endpoint",
+                      self.request_latency)
+            metric("response_bytes_total", "counter", "Decoded response body bytes.",
+                   [(_labels(endpoint=k), v) for k, v in sorted(self.response_bytes.items())])
+            metric("decode_seconds_total", "counter", "Time spent decoding JSON.",
+                   [(_labels(endpoint=k), round(v, 6))
+                    for k, v in sorted(self.decode_seconds.items())])
+            metric("errors_total", "counter", "Exceptions raised, by call and type.",
+                   [(_labels(call=where, error=error), n)
+                    for (where, error), n in sorted(self.errors.items())])
+            histogram("stage_seconds", "Parse/transform stage duration.", "stage", self.stages)
+        cache = self.cache_stats()
+        if cache is not None:
+            metric("cache_hits_total", "counter", "Response cache hits.", [("", cache["hits"])])
+            metric("cache_misses_total", "counter", "Response cache misses.",
+                   [("", cache["misses"])])
+        return "\n".join(lines) + "\n"
+
+    def write(self, path):
+        """Write JSON or, for a .prom/.txt path, Prometheus text."""
+        with open(path, "w") as f:
+            if path.endswith((".prom", ".txt")):
+                f.write(self.to_prometheus())
+            else:
+                json.dump(self.to_json(), f, indent=2)
+
+
+class InstrumentedClient:
+    """Stands in for statsapi.requests and times each HTTP exchange.
+
+    Streamed responses (stream=True) are passed through without reading
+    the body, so their bytes are not counted.
+    """
+
+    def __init__(self, target, metrics):
+        self.target = target
+        self.metrics = metrics
+
+    def get(self, url, **kwargs):
+        start = time.perf_counter()
+        response = self.target.get(url, **kwargs)
+        nbytes = 0 if kwargs.get("stream") else len(response.content)
+        self.metrics._local.transfer = (time.perf_counter() - start, nbytes)
+        return response
+
+    def __getattr__(self, name):
+        return getattr(self.target, name)
+
+
+def _unwrap_client(client):
+    while isinstance(client, InstrumentedClient):
+        client = client.target
+    return client
+
+
+class Sampler:
+    """Samples the stacks of threads inside Metrics.stage() every `interval` s.
+
+    top(stage) returns the most frequently seen frames ("func (file:line)")
+    for that stage, a cheap statistical profile of the parse/transform code.
+    """
+
+    def __init__(self, interval=0.005, depth=8):
+        self.interval = interval
+        self.depth = depth
+        self.samples = defaultdict(Counter)
+        self._active = {}
+        self._stop = threading.Event()
+        self._thread = None
+
+    def enter(self, thread, stage):
+        self._active[thread] = stage
+
+    def exit(self, thread):
+        self._active.pop(thread, None)
+
+    def start(self):
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="stage-sampler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            active = dict(self._active)
+            if not active:
+                continue
+            frames = sys._current_frames()
+            for thread, stage in active.items():
+                frame = frames.get(thread)
+                seen = set()
+                for _ in range(self.depth):
+                    if frame is None:
+                        break
+                    code = frame.f_code
+                    seen.add(f"{code.co_name} ({code.co_filename}:{frame.f_lineno})")
+                    frame = frame.f_back
+                for location in seen:
+                    self.samples[stage][location] += 1
+
+    def top(self, stage, n=10):
+        return self.samples[stage].most_common(n)
+
+
+def install(metrics=None, names=INSTRUMENTED_FUNCTIONS, cache=None, sampler=None):
+    """Instrument statsapi's entry points, get and HTTP client; return the Metrics.
+
+    The function wrappers are the outermost layer, so their timings cover
+    the cache and the other layers. A Sampler passed here is started and
+    attached.
+    """
+    metrics = metrics or Metrics(cache)
+    if sampler is not None:
+        metrics.sampler = sampler.start()
+    for name in names:
+        transport.add_layer(name, "instrument", functools.partial(metrics.wrap, name=name))
+    transport.add_layer("get", "instrument", metrics.wrap_get)
+    # Replace, never stack, an earlier install's client wrapper
+    statsapi.requests = InstrumentedClient(_unwrap_client(statsapi.requests), metrics)
+    return metrics
+
+
+def uninstall(metrics=None, names=INSTRUMENTED_FUNCTIONS):
+    """Remove the wrappers install() added and stop the sampler."""
+    for name in names + ["get"]:
+        transport.remove_layer(name, "instrument")
+    statsapi.requests = _unwrap_client(statsapi.requests)
+    if metrics is not None and metrics.sampler is not None:
+        metrics.sampler.stop()
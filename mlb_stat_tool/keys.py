@@ -0,0 +1,62 @@
+"""
+Request Keys
+Stable, normalized keys for statsapi calls, shared by the caching layers
+"""
+
+import inspect
+import json
+import re
+
+
+def normalize_arguments(func, args, kwargs):
+    """Bind a call to `func`'s signature and fill in defaults."""
+    try:
+        bound = inspect.signature(func).bind(*args, **kwargs)
+    except (TypeError, ValueError):
+        return {"args": list(args), **kwargs}
+    bound.apply_defaults()
+    return dict(bound.arguments)
+
+
+def request_key(name, arguments):
+    """Return a deterministic string key for `name` called with `arguments`."""
+    return name + ":" + json.dumps(arguments, sort_keys=True, default=str)
+
+
+# Parameters whose values are stat group/type lists; statsapi accepts
+# "hitting", "[hitting]" and "Hitting" alike
+LIST_PARAMS = {"group", "groups", "type", "types", "stats", "statGroup", "statType"}
+# The API's group names are all lowercase; stat types are camelCase
+# ("gameLog") and keep their case
+GROUP_PARAMS = {"group", "groups", "statGroup"}
+HYDRATE_LISTS = re.compile(r"\b(group|type)=(\[[^\]]*\]|[^,)]*)")
+
+
+def canonical_list(value, lower=False):
+    """'[hitting, pitching]' -> '[hitting,pitching]'; `lower` also folds case."""
+    items = (i.strip() for i in str(value).strip().strip("[]").split(","))
+    items = [i.lower() if lower else i for i in items if i]
+    return "[" + ",".join(dict.fromkeys(items)) + "]"
+
+
+def canonical(arguments):
+    """Return `arguments` with equivalent stat group/type list spellings made equal.
+
+    Applies to list-valued parameters at any depth (e.g. inside a `params`
+    dict) and to the group=/type= lists inside a hydrate string. Group
+    names are lowercased; stat types keep their case.
+    """
+    if isinstance(arguments, dict):
+        result = {}
+        for name, value in arguments.items():
+            if name in LIST_PARAMS and isinstance(value, str):
+                value = canonical_list(value, lower=name in GROUP_PARAMS)
+            elif name == "hydrate" and isinstance(value, str):
+                value = HYDRATE_LISTS.sub(
+                    lambda m: m.group(1) + "=" + canonical_list(m.group(2), m.group(1) == "group"),
+                    value)
+            else:
+                value = canonical(value)
+            result[name] = value
+        return result
+    return arguments
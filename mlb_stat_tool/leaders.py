@@ -0,0 +1,107 @@
+"""
+Local Leaderboards
+League and team leaders computed from StatTable columns instead of the API
+"""
+
+from typing import NamedTuple
+
+import numpy as np
+
+from .store import TYPE_CODES
+
+# Stats where the smallest value leads, per stat group
+LOWER_IS_BETTER = {
+    "hitting": {"strikeOuts", "groundIntoDoublePlay", "caughtStealing"},
+    "pitching": {
+        "era", "whip", "avg", "obp", "slg", "ops", "hits", "homeRuns", "baseOnBalls",
+        "earnedRuns", "walksPer9Inn", "hitsPer9Inn", "homeRunsPer9", "losses",
+    },
+    "fielding": {"errors", "passedBall"},
+}
+
+# Default qualification column and minimum per stat group
+QUALIFIERS = {
+    "hitting": ("plateAppearances", 100),
+    "pitching": ("inningsPitched", 30),
+    "fielding": ("chances", 50),
+}
+
+
+class Leader(NamedTuple):
+    rank: int
+    player_id: int
+    team_id: int
+    value: float
+
+
+def row_mask(table, stat_type="season", season=None, team_id=None, sport_id=None,
+             minimums=None, qualified=False):
+    """Boolean mask of rows matching the filters.
+
+    `team_id` and `sport_id` accept a single ID or a collection of IDs;
+    `minimums` maps stat column -> smallest qualifying value, and
+    `qualified` adds the group's default threshold from QUALIFIERS.
+    """
+    minimums = dict(minimums or {})
+    if qualified and table.group in QUALIFIERS:
+        minimums.setdefault(*QUALIFIERS[table.group])
+    mask = np.ones(len(table), bool)
+    if stat_type is not None:
+        mask &= table["type"] == TYPE_CODES[stat_type.lower()]
+    if season is not None:
+        mask &= table["season"] == season
+    for name, wanted in (("team_id", team_id), ("sport_id", sport_id)):
+        if wanted is not None:
+            mask &= np.isin(table[name], np.atleast_1d(wanted))
+    for name, minimum in minimums.items():
+        mask &= np.nan_to_num(table[name], nan=-np.inf) >= minimum
+    return mask
+
+
+def _top_indexes(values, k, ascending):
+    """Indexes of the best `k` values, best first; NaN never leads."""
+    keys = values if ascending else -values
+    keys = np.where(np.isnan(keys), np.inf, keys)
+    k = min(k, int(np.count_nonzero(np.isfinite(keys))))
+    if k <= 0:
+        return np.empty(0, np.intp)
+    best = np.argpartition(keys, k - 1)[:k]
+    return best[np.argsort(keys[best], kind="stable")]
+
+
+def top_k(table, stat, k=10, ascending=None, **filters):
+    """Return the top `k` Leader rows for `stat` among rows matching `filters`."""
+    if ascending is None:
+        ascending = stat in LOWER_IS_BETTER.get(table.group, ())
+    rows = np.flatnonzero(row_mask(table, **filters))
+    best = rows[_top_indexes(table[stat][rows], k, ascending)]
+    return [Leader(rank, int(table["player_id"][i]), int(table["team_id"][i]),
+                   float(table[stat][i]))
+            for rank, i in enumerate(best, 1)]
+
+
+def leaderboards(table, stats, k=10, by="team_id", **filters):
+    """Return {group_id: {stat: [Leader, ...]}} for every value of `by`.
+
+    Rows are sorted by the `by` column once, then each group's slice is
+    ranked with argpartition, so every team (or sport) comes out of a
+    single pass over the table.
+    """
+    rows = np.flatnonzero(row_mask(table, **filters))
+    rows = rows[np.argsort(table[by][rows], kind="stable")]
+    keys = table[by][rows]
+    group_ids, starts = np.unique(keys, return_index=True)
+    ends = np.append(starts[1:], len(rows))
+
+    boards = {}
+    for group_id, start, end in zip(group_ids, starts, ends):
+        segment = rows[start:end]
+        board = {}
+        for stat in stats:
+            ascending = stat in LOWER_IS_BETTER.get(table.group, ())
+            best = segment[_top_indexes(table[stat][segment], k, ascending)]
+            board[stat] = [Leader(rank, int(table["player_id"][i]), int(table["team_id"][i]),
+                                  float(table[stat][i]))
+                           for rank, i in enumerate(best, 1)]
+        boards[int(group_id)] = board
+    return boards
@@ -0,0 +1,286 @@
+"""
+Live Game Streaming
+Near-real-time boxscore lines for watched players, from game feed diffs
+
+A GameFeed loads a game's live feed once, then on each refresh asks
+game_timestamps for the latest timecode and, when it has moved, fetches
+only the JSON Patch operations between the two (game_diff) and applies
+them to its copy. LiveStream polls the schedule for live games involving
+the watched teams, refreshes their feeds, and publishes a PlayerLine to
+subscribers (callbacks, or `async for line in stream.updates()`) whenever a
+watched player's batting, pitching or fielding line changes.
+"""
+
+import asyncio
+import copy
+import re
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+
+import statsapi
+
+from .crawl import MILB_SPORT_IDS
+
+# Watched teams can be at any level, so the schedule is searched across all of them
+ALL_SPORT_IDS = [1] + MILB_SPORT_IDS
+
+PLAYER_PATH = re.compile(r"^/liveData/boxscore/teams/(?:away|home)/players/ID(\d+)(?:/|$)")
+# Paths at or above a team's players object, which affect every player
+ALL_PLAYERS = re.compile(r"^(/liveData(/boxscore(/teams(/(away|home)(/players)?)?)?)?)?$")
+
+
+@dataclass(frozen=True, slots=True)
+class PlayerLine:
+    player_id: int
+    full_name: str
+    team_id: int
+    game_pk: int
+    timecode: str
+    batting: dict
+    pitching: dict
+    fielding: dict
+
+    def same_stats(self, other):
+        return (other is not None and self.batting == other.batting
+                and self.pitching == other.pitching and self.fielding == other.fielding)
+
+
+class PatchConflict(ValueError):
+    """A patch operation does not fit the document it is applied to."""
+
+
+def _tokens(path):
+    return [t.replace("~1", "/").replace("~0", "~") for t in path.split("/")[1:]]
+
+
+def _child(container, token):
+    return container[int(token)] if isinstance(container, list) else container[token]
+
+
+def _pointer(document, path):
+    value = document
+    for token in _tokens(path):
+        value = _child(value, token)
+    return value
+
+
+def apply_patch(document, operations):
+    """Apply JSON Patch (RFC 6902) `operations` to `document` in place; return it.
+
+    Raises PatchConflict when a path does not resolve or a test fails.
+    """
+    for operation in operations:
+        kind, path = operation["op"], operation["path"]
+        try:
+            if kind == "test":
+                if _pointer(document, path) != operation["value"]:
+                    raise PatchConflict(f"test failed at {path}")
+                continue
+            if kind in ("copy", "move"):
+                value = _pointer(document, operation["from"])
+                if kind == "copy":
+                    # The copy must not share containers with its source
+                    value = copy.deepcopy(value)
+                else:
+                    apply_patch(document, [{"op": "remove", "path": operation["from"]}])
+                kind = "add"
+            else:
+                value = operation.get("value")
+            if not path:
+                if kind == "remove":
+                    raise PatchConflict("cannot remove the whole document")
+                document = value
+                continue
+            tokens = _tokens(path)
+            parent = document
+            for token in tokens[:-1]:
+                parent = _child(parent, token)
+            key = tokens[-1]
+            if isinstance(parent, list):
+                index = len(parent) if key == "-" else int(key)
+                if kind == "add":
+                    parent.insert(index, value)
+                elif kind == "replace":
+                    parent[index] = value
+                else:
+                    del parent[index]
+            elif kind == "add":
+                parent[key] = value
+            elif key not in parent:
+                raise PatchConflict(f"{kind} {path}: no such member")
+            elif kind == "replace":
+                parent[key] = value
+            else:
+                del parent[key]
+        except PatchConflict:
+            raise
+        except (KeyError, IndexError, ValueError, TypeError) as e:
+            raise PatchConflict(f"{kind} {path}: {e!r}") from e
+    return document
+
+
+def changed_players(operations):
+    """Player ids touched by `operations`; None when a patch spans all players."""
+    changed = set()
+    for operation in operations:
+        for path in (operation["path"], operation.get("from")):
+            if path is None:
+                continue
+            match = PLAYER_PATH.match(path)
+            if match:
+                changed.add(int(match.group(1)))
+            elif ALL_PLAYERS.match(path):
+                return None
+    return changed
+
+
+class GameFeed:
+    """One game's live feed, kept current with diffPatch requests."""
+
+    def __init__(self, game_pk, get=None):
+        self.game_pk = game_pk
+        self.get = get or statsapi.get
+        self.document = None
+        self.timecode = None
+        self.full_fetches = 0
+        self.diff_fetches = 0
+
+    @property
+    def state(self):
+        return self.document["gameData"]["status"]["abstractGameState"] if self.document else None
+
+    def _load(self, document=None):
+        self.document = document or self.get("game", {"gamePk": self.game_pk})
+        self.timecode = self.document.get("metaData", {}).get("timeStamp")
+        self.full_fetches += 1
+        return None
+
+    def refresh(self):
+        """Bring the feed up to date.
+
+        Returns the ids of players whose lines may have changed, or None when
+        any may have (first load, or the API sent the whole feed back).
+        """
+        if self.document is None:
+            return self._load()
+        timestamps = self.get("game_timestamps", {"gamePk": self.game_pk})
+        latest = timestamps[-1] if timestamps else None
+        if latest is None or latest == self.timecode:
+            return set()
+        response = self.get("game_diff", {"gamePk": self.game_pk, "startTimecode": self.timecode,
+                                          "endTimecode": latest})
+        self.diff_fetches += 1
+        if isinstance(response, dict):
+            # Too far behind for a diff: the API answers with the full feed
+            return self._load(response)
+        changed = set()
+        try:
+            for patch in response:
+                operations = patch.get("diff", [patch]) if isinstance(patch, dict) else patch
+                self.document = apply_patch(self.document, operations)
+                players = changed_players(operations)
+                if players is None:
+                    changed = None
+                elif changed is not None:
+                    changed |= players
+        except PatchConflict:
+            return self._load()
+        self.timecode = latest
+        return changed
+
+    def lines(self, player_ids=None):
+        """PlayerLines for `player_ids` (every player when None)."""
+        result = []
+        if self.document is None:
+            return result
+        for side in self.document["liveData"]["boxscore"]["teams"].values():
+            team_id = side["team"]["id"]
+            for player in side.get("players", {}).values():
+                person = player["person"]
+                if player_ids is not None and person["id"] not in player_ids:
+                    continue
+                # Copies, since later patches modify the feed's dicts in place
+                stats = player.get("stats", {})
+                result.append(PlayerLine(person["id"], person.get("fullName", ""), team_id,
+                                         self.game_pk, self.timecode or "",
+                                         dict(stats.get("batting", {})),
+                                         dict(stats.get("pitching", {})),
+                                         dict(stats.get("fielding", {}))))
+        return result
+
+
+class LiveStream:
+    """Publishes changed in-game lines for players on `team_ids` or in `player_ids`."""
+
+    def __init__(self, team_ids=(), player_ids=(), sport_ids=ALL_SPORT_IDS, get=None,
+                 interval=10.0):
+        self.team_ids = set(team_ids)
+        self.player_ids = set(player_ids)
+        self.sport_ids = list(sport_ids)
+        self.get = get or statsapi.get
+        self.interval = interval
+        self.feeds = {}
+        self.lines = {}
+        self._subscribers = []
+
+    def subscribe(self, callback):
+        """Call `callback(line)` for every published update; returns `callback`."""
+        self._subscribers.append(callback)
+        return callback
+
+    def unsubscribe(self, callback):
+        self._subscribers.remove(callback)
+
+    def watching(self, line):
+        return line.team_id in self.team_ids or line.player_id in self.player_ids
+
+    def active_games(self, date=None):
+        """gamePks of today's (or `date`'s) live games for the watched teams."""
+        params = {"sportId": ",".join(str(s) for s in self.sport_ids),
+                  "date": date or datetime.now().strftime("%m/%d/%Y")}
+        if self.team_ids and not self.player_ids:
+            params["teamId"] = ",".join(str(t) for t in sorted(self.team_ids))
+        response = self.get("schedule", params)
+        return [game["gamePk"] for day in response.get("dates", []) for game in day["games"]
+                if game["status"]["abstractGameState"] == "Live"]
+
+    def poll(self):
+        """Run one update cycle; publish and return the lines that changed.
+
+        Games that stopped being live get one last refresh and are dropped.
+        """
+        live = set(self.active_games())
+        for game_pk in live - self.feeds.keys():
+            self.feeds[game_pk] = GameFeed(game_pk, self.get)
+        updates = []
+        for game_pk, feed in list(self.feeds.items()):
+            for line in feed.lines(feed.refresh()):
+                if self.watching(line) and not line.same_stats(self.lines.get(line.player_id)):
+                    self.lines[line.player_id] = line
+                    updates.append(line)
+            if game_pk not in live:
+                del self.feeds[game_pk]
+        for line in updates:
+            for callback in list(self._subscribers):
+                callback(line)
+        return updates
+
+    def run(self, stop=None, on_error=None):
+        """Poll every `interval` seconds until `stop` (a threading.Event) is set."""
+        stop = stop or threading.Event()
+        while not stop.is_set():
+            try:
+                self.poll()
+            except Exception as e:
+                if on_error is None:
+                    raise
+                on_error(e)
+            stop.wait(self.interval)
+
+    async def updates(self):
+        """Async iterator of changed lines; polls in a worker thread."""
+        while True:
+            for line in await asyncio.to_thread(self.poll):
+                yield line
+            await asyncio.sleep(self.interval)
@@ -0,0 +1,119 @@
+"""
+Organization Graph
+Every MLB organization's affiliates across all minor league levels
+
+One teams request for every sport ID returns each affiliate's parentOrgId,
+which is enough to map all 30 organizations to their Triple-A through
+Rookie clubs. Organization-wide questions ("every prospect in the Guardians
+system") then need only the affiliates' rosters and one batched stat pull
+per level, instead of a crawl over every team in every league.
+"""
+
+import json
+from collections import defaultdict
+
+import statsapi
+
+from .bulk import STAT_GROUPS, STAT_TYPES, bulk_player_stat_data
+from .crawl import MILB_SPORT_IDS, crawl_roster_entries
+from .registry import team_record
+
+ORG_SPORT_IDS = [1] + MILB_SPORT_IDS
+
+TEAM_FIELDS = "teams,id,name,abbreviation,teamName,clubName,sport,parentOrgId"
+
+
+class OrgGraph:
+    """MLB parent -> affiliates, from teams carrying parentOrgId."""
+
+    def __init__(self, teams):
+        self.teams = {}
+        self.team_names = {}
+        self.parent_of = {}
+        self.affiliate_ids = defaultdict(list)
+        for team in teams:
+            record = team_record(team)
+            self.teams[record.team_id] = record
+            self.team_names[record.team_id] = {
+                team.get(k, "").lower() for k in ("name", "abbreviation", "teamName", "clubName")
+            } - {""}
+            if record.sport_id == 1:
+                self.affiliate_ids.setdefault(record.team_id, [])
+            elif record.parent_org_id:
+                self.parent_of[record.team_id] = record.parent_org_id
+                self.affiliate_ids[record.parent_org_id].append(record.team_id)
+        self._raw = list(teams)
+
+    @classmethod
+    def fetch(cls, sport_ids=ORG_SPORT_IDS, season=None, get=None):
+        """Build the graph from a single teams request covering `sport_ids`."""
+        get = get or statsapi.get
+        params = {"sportIds": ",".join(str(s) for s in sport_ids), "fields": TEAM_FIELDS}
+        if season:
+            params["season"] = season
+        return cls(get("teams", params).get("teams", []))
+
+    def save(self, path):
+        with open(path, "w") as f:
+            json.dump(self._raw, f)
+
+    @classmethod
+    def load(cls, path):
+        with open(path) as f:
+            return cls(json.load(f))
+
+    def team(self, team_id):
+        """Return the TeamRecord for an id, or None."""
+        return self.teams.get(team_id)
+
+    def organizations(self):
+        """TeamRecords of every MLB parent club."""
+        return [self.teams[i] for i in self.affiliate_ids if i in self.teams]
+
+    def org_of(self, team_id):
+        """The MLB parent of `team_id` (itself for an MLB team), or None."""
+        if team_id in self.affiliate_ids:
+            return team_id
+        return self.parent_of.get(team_id)
+
+    def find(self, name):
+        """Resolve an organization by id, name, club name or abbreviation.
+
+        "Guardians", "Cleveland Guardians", "CLE" and a Columbus affiliate
+        name all resolve to the same parent. Returns None when not found.
+        """
+        if str(name).isdigit():
+            return self.org_of(int(name))
+        name = str(name).strip().lower()
+        matches = [tid for tid, names in self.team_names.items()
+                   if name in names or any(name in n.split() for n in names)]
+        orgs = {self.org_of(tid) for tid in matches} - {None}
+        return orgs.pop() if len(orgs) == 1 else None
+
+    def affiliates(self, org_id, sport_ids=MILB_SPORT_IDS):
+        """TeamRecords of the organization's affiliates at `sport_ids` levels."""
+        sport_ids = set(sport_ids)
+        return [self.teams[i] for i in self.affiliate_ids.get(org_id, [])
+                if self.teams[i].sport_id in sport_ids]
+
+    def org_players(self, org_id, sport_ids=MILB_SPORT_IDS, get=None, **crawl_kwargs):
+        """(team_id, player_id, full_name) for everyone on the affiliates' rosters."""
+        teams = [{"id": t.team_id, "name": t.name} for t in self.affiliates(org_id, sport_ids)]
+        return [(team["id"], entry["person"]["id"], entry["person"]["fullName"])
+                for team, entry in crawl_roster_entries(get=get, teams=teams, **crawl_kwargs)]
+
+    def org_stats(self, org_id, sport_ids=MILB_SPORT_IDS, groups=STAT_GROUPS, types=STAT_TYPES,
+                  season=None, get=None, **crawl_kwargs):
+        """{player_id: record} for the whole system, one batched pull per level.
+
+        Stats are hydrated at each player's own level (sportId), since the
+        API only returns splits for the level asked for.
+        """
+        by_level = defaultdict(list)
+        for team_id, player_id, _ in self.org_players(org_id, sport_ids, get, **crawl_kwargs):
+            by_level[self.teams[team_id].sport_id].append(player_id)
+        players = {}
+        for sport_id, player_ids in by_level.items():
+            players.update(bulk_player_stat_data(player_ids, groups, types, sport_id, season,
+                                                 get=get))
+        return players
@@ -0,0 +1,257 @@
+"""
+Rate Limiting
+Thread-safe pacing, retries and circuit breaking for MLB Stats API calls
+"""
+
+import random
+import threading
+import time
+
+import requests
+import statsapi
+
+
+class RateLimiter:
+    """Spaces calls so no more than `rate` start per second."""
+
+    def __init__(self, rate):
+        self.interval = 1.0 / rate if rate else 0.0
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self):
+        """Block until the next call is allowed to start."""
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next)
+            self._next = start + self.interval
+        if start > now:
+            time.sleep(start - now)
+
+
+class TokenBucket:
+    """Token bucket whose refill rate backs off on throttling (AIMD).
+
+    `rate` tokens per second refill up to `burst`. throttled() halves the
+    rate, down to `min_rate`; each ok() adds back `step` until the
+    configured rate is reached again. A `rate` of None or 0 never waits,
+    like RateLimiter.
+    """
+
+    def __init__(self, rate, burst=None, min_rate=0.5, step=0.1):
+        if rate is not None and rate < 0:
+            raise ValueError(f"rate must be positive or None, not {rate!r}")
+        self.max_rate = rate or 0.0
+        self.rate = self.max_rate
+        self.burst = burst or max(1, int(self.rate))
+        self.min_rate = min_rate
+        self.step = step
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a token is available and take it."""
+        if not self.max_rate:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                delay = (1 - self._tokens) / self.rate
+            time.sleep(delay)
+
+    def throttled(self):
+        if not self.max_rate:
+            return
+        with self._lock:
+            self.rate = max(self.min_rate, self.rate / 2)
+
+    def ok(self):
+        if not self.max_rate:
+            return
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + self.step)
+
+
+class CircuitOpen(RuntimeError):
+    """Raised instead of calling an endpoint whose breaker is open.
+
+    `retry_in` is roughly how many seconds until a call may get through.
+    """
+
+    def __init__(self, message, retry_in=0.0):
+        super().__init__(message)
+        self.retry_in = retry_in
+
+
+class CircuitBreaker:
+    """Stops calls to an endpoint after repeated failures.
+
+    After `threshold` consecutive failures the breaker opens and rejects
+    calls for `reset_after` seconds, then lets one trial call through
+    (half-open); its outcome closes or re-opens the breaker.
+    """
+
+    def __init__(self, threshold=5, reset_after=30.0):
+        self.threshold = threshold
+        self.reset_after = reset_after
+        self.failures = 0
+        self.opened_at = None
+        self._trial = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_after:
+            return "half-open"
+        return "open"
+
+    def retry_in(self):
+        """Seconds until the breaker lets a trial call through.
+
+        While a trial is already in flight its outcome is not known yet, so
+        this is a tenth of `reset_after`.
+        """
+        with self._lock:
+            if self.opened_at is None:
+                return 0.0
+            remaining = self.reset_after - (time.monotonic() - self.opened_at)
+            if remaining <= 0:
+                return self.reset_after / 10 if self._trial else 0.0
+            return remaining
+
+    def allow(self):
+        with self._lock:
+            state = self.state
+            if state == "closed":
+                return True
+            if state == "half-open" and not self._trial:
+                self._trial = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._trial = False
+
+    def release(self):
+        """End a call without an outcome; a half-open trial slot is freed."""
+        with self._lock:
+            self._trial = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self._trial or self.failures >= self.threshold:
+                self.opened_at = time.monotonic()
+            self._trial = False
+
+
+def _status(exc):
+    response = getattr(exc, "response", None)
+    return getattr(response, "status_code", None)
+
+
+def is_retryable(exc):
+    """True for throttling, 5xx responses, timeouts and dropped connections."""
+    if isinstance(exc, (requests.ConnectionError, requests.Timeout)):
+        return True
+    status = _status(exc)
+    return status is not None and (status == 429 or status >= 500)
+
+
+def retry_after(exc):
+    """Seconds from a Retry-After header, if the server sent one."""
+    response = getattr(exc, "response", None)
+    try:
+        return float(response.headers["Retry-After"])
+    except (AttributeError, KeyError, TypeError, ValueError):
+        return None
+
+
+class RequestScheduler:
+    """A get that rate-limits, retries and circuit-breaks statsapi traffic.
+
+    All calls share one TokenBucket. Retryable failures are retried up to
+    `max_retries` times with full-jitter exponential backoff (or the
+    server's Retry-After), and each endpoint has its own CircuitBreaker.
+    The breaker sees each call once, however many attempts it took: a call
+    that exhausts its retries is one failure, and one that fails for a
+    non-retryable reason (a 404, a bad argument) leaves it unchanged.
+    """
+
+    def __init__(self, get=None, rate=10.0, burst=None, max_retries=4, base_delay=0.5,
+                 max_delay=30.0, breaker_threshold=5, breaker_reset=30.0, seed=None):
+        self.get = get or statsapi.get
+        self.bucket = TokenBucket(rate, burst)
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.breaker_threshold = breaker_threshold
+        self.breaker_reset = breaker_reset
+        self.breakers = {}
+        self.retries = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def breaker(self, endpoint):
+        with self._lock:
+            if endpoint not in self.breakers:
+                self.breakers[endpoint] = CircuitBreaker(self.breaker_threshold,
+                                                         self.breaker_reset)
+            return self.breakers[endpoint]
+
+    def backoff(self, attempt, exc=None):
+        """Delay before retry number `attempt` (0-based)."""
+        hinted = retry_after(exc)
+        if hinted is not None:
+            return min(hinted, self.max_delay)
+        with self._lock:
+            return self._random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+    def __call__(self, endpoint, params={}, *args, **kwargs):
+        return self.run(endpoint, self.get, endpoint, params, *args, **kwargs)
+
+    def run(self, endpoint, fetch, *args, **kwargs):
+        """Call fetch(*args, **kwargs) as one request to `endpoint`.
+
+        The call is rate limited, retried and circuit-broken like any other
+        get, which lets callers that do their own HTTP (see streaming) share
+        the scheduler.
+        """
+        breaker = self.breaker(endpoint)
+        if not breaker.allow():
+            raise CircuitOpen(f"Circuit open for {endpoint}", breaker.retry_in())
+        for attempt in range(self.max_retries + 1):
+            self.bucket.acquire()
+            try:
+                result = fetch(*args, **kwargs)
+            except Exception as e:
+                if not is_retryable(e):
+                    # The request itself was bad, which says nothing about the
+                    # endpoint's health: leave the breaker as it is
+                    breaker.release()
+                    raise
+                if _status(e) == 429:
+                    self.bucket.throttled()
+                if attempt == self.max_retries:
+                    breaker.record_failure()
+                    raise
+                with self._lock:
+                    self.retries += 1
+                time.sleep(self.backoff(attempt, e))
+                continue
+            breaker.record_success()
+            self.bucket.ok()
+            return result
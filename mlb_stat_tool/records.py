@@ -0,0 +1,158 @@
+"""
+Structured Records
+Compact typed records for rosters, standings and leaders, built straight from JSON
+"""
+
+from dataclasses import dataclass
+from datetime import datetime
+
+import statsapi
+
+DEFAULT_LEADER_CATEGORIES = ["homeRuns", "battingAverage", "runsBattedIn", "earnedRunAverage",
+                             "strikeouts", "wins"]
+
+
+@dataclass(frozen=True, slots=True)
+class RosterEntry:
+    player_id: int
+    full_name: str
+    jersey_number: str
+    position: str
+    status: str
+
+
+@dataclass(frozen=True, slots=True)
+class StandingsRecord:
+    team_id: int
+    name: str
+    division_id: int
+    division_name: str
+    division_rank: str
+    wins: int
+    losses: int
+    games_back: str
+    wild_card_rank: str
+    league_rank: str
+    sport_rank: str
+
+
+@dataclass(frozen=True, slots=True)
+class LeaderEntry:
+    rank: int
+    player_id: int
+    full_name: str
+    value: str
+
+
+class Roster:
+    """One team's roster with O(1) membership checks by player ID."""
+
+    __slots__ = ("team_id", "entries", "_by_id")
+
+    def __init__(self, team_id, entries):
+        self.team_id = team_id
+        self.entries = tuple(entries)
+        self._by_id = {entry.player_id: entry for entry in self.entries}
+
+    def __contains__(self, player_id):
+        return player_id in self._by_id
+
+    def __iter__(self):
+        return iter(self.entries)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, player_id):
+        return self._by_id.get(player_id)
+
+    @property
+    def player_ids(self):
+        return self._by_id.keys()
+
+
+def parse_roster(team_id, response):
+    """Build a Roster from a team_roster response."""
+    return Roster(team_id, (
+        RosterEntry(
+            x["person"]["id"],
+            x["person"]["fullName"],
+            x.get("jerseyNumber", ""),
+            x.get("position", {}).get("abbreviation", ""),
+            x.get("status", {}).get("code", ""),
+        )
+        for x in response.get("roster", [])
+    ))
+
+
+def roster_records(teamId, rosterType="active", season=None, date=None, get=None):
+    """Return a team's Roster; the structured counterpart to statsapi.roster()."""
+    get = get or statsapi.get
+    params = {"teamId": teamId, "rosterType": rosterType,
+              "season": season or datetime.now().year,
+              "fields": "roster,person,id,fullName,jerseyNumber,position,abbreviation,status,code"}
+    if date:
+        params["date"] = date
+    return parse_roster(teamId, get("team_roster", params))
+
+
+def parse_standings(response):
+    """Flatten a standings response into StandingsRecords."""
+    records = []
+    for division in response.get("records", []):
+        for x in division.get("teamRecords", []):
+            team = x["team"]
+            records.append(StandingsRecord(
+                team["id"],
+                team["name"],
+                team.get("division", {}).get("id", 0),
+                team.get("division", {}).get("name", ""),
+                x.get("divisionRank", "-"),
+                x["wins"],
+                x["losses"],
+                x.get("gamesBack", "-"),
+                x.get("wildCardRank", "-"),
+                x.get("leagueRank", "-"),
+                x.get("sportRank", "-"),
+            ))
+    return records
+
+
+def standings_records(leagueId="103,104", season=None, teamId=None, standingsTypes="regularSeason",
+                      date=None, get=None):
+    """Return StandingsRecords, optionally only the one for `teamId`."""
+    get = get or statsapi.get
+    params = {"leagueId": leagueId, "season": season or datetime.now().year,
+              "standingsTypes": standingsTypes, "hydrate": "team(division)",
+              "fields": "records,teamRecords,team,id,name,division,divisionRank,wins,losses,"
+                        "gamesBack,wildCardRank,leagueRank,sportRank"}
+    if date:
+        params["date"] = date
+    records = parse_standings(get("standings", params))
+    if teamId is not None:
+        records = [r for r in records if r.team_id == teamId]
+    return records
+
+
+def parse_leaders(response, key):
+    """Map leader category -> [LeaderEntry] for a team or league leaders response."""
+    boards = {}
+    for board in response.get(key, []):
+        boards[board.get("leaderCategory")] = [
+            LeaderEntry(x["rank"], x["person"]["id"], x["person"]["fullName"], x["value"])
+            for x in board.get("leaders", [])
+        ]
+    return boards
+
+
+def team_leader_records(teamId, leaderCategories=DEFAULT_LEADER_CATEGORIES, season=None,
+                        leaderGameTypes="R", limit=10, get=None):
+    """Return {category: [LeaderEntry]} for one team in a single request."""
+    get = get or statsapi.get
+    if not isinstance(leaderCategories, str):
+        leaderCategories = ",".join(leaderCategories)
+    params = {"teamId": teamId, "leaderCategories": leaderCategories,
+              "season": season or datetime.now().year, "leaderGameTypes": leaderGameTypes,
+              "limit": limit,
+              "fields": "teamLeaders,leaderCategory,leaders,rank,value,person,id,fullName"}
+    return parse_leaders(get("team_leaders", params), "teamLeaders")
@@ -0,0 +1,237 @@
+"""
+Player/Team Registry
+Compact in-memory registry of every crawled team and rostered player
+
+Teams and players come back as slotted records rather than the nested
+dicts statsapi returns, with repeated strings (position, status, jersey,
+team names) interned so each distinct value is stored once. Player ids
+resolve through an int-array hash table, and the team -> players,
+position -> players and sport -> teams indexes are CSR-style int arrays:
+one offsets array plus one flat array of ids, with a dict from key to slot.
+Every lookup is O(1) and each index costs 4 bytes per member.
+"""
+
+import sys
+from array import array
+from dataclasses import dataclass
+
+from .crawl import SPORT_IDS, crawl_roster_entries, list_teams
+
+
+@dataclass(frozen=True, slots=True)
+class TeamRecord:
+    team_id: int
+    name: str
+    abbreviation: str
+    sport_id: int
+    parent_org_id: int
+
+
+@dataclass(frozen=True, slots=True)
+class PlayerRecord:
+    player_id: int
+    full_name: str
+    team_id: int
+    position: str
+    jersey_number: str
+    status: str
+
+
+def _intern(value):
+    return sys.intern(value) if value else ""
+
+
+def team_record(team):
+    """Build a TeamRecord from a teams-endpoint dict."""
+    return TeamRecord(
+        team["id"], _intern(team.get("name")), _intern(team.get("abbreviation")),
+        team.get("sport", {}).get("id", 0), team.get("parentOrgId") or 0,
+    )
+
+
+def player_record(team_id, entry):
+    """Build a PlayerRecord from a raw team_roster entry."""
+    person = entry["person"]
+    return PlayerRecord(
+        person["id"], _intern(person.get("fullName")), team_id,
+        _intern(entry.get("position", {}).get("abbreviation")),
+        _intern(entry.get("jerseyNumber")), _intern(entry.get("status", {}).get("code")),
+    )
+
+
+class GroupIndex:
+    """Immutable key -> ids index stored as offsets plus one flat int array."""
+
+    __slots__ = ("slots", "offsets", "ids")
+
+    def __init__(self, pairs):
+        groups = {}
+        for key, value in pairs:
+            groups.setdefault(key, []).append(value)
+        self.slots = {}
+        self.offsets = array("i", [0])
+        self.ids = array("i")
+        for slot, (key, values) in enumerate(groups.items()):
+            self.slots[key] = slot
+            self.ids.extend(values)
+            self.offsets.append(len(self.ids))
+
+    def __getitem__(self, key):
+        slot = self.slots.get(key)
+        if slot is None:
+            return self.ids[:0]
+        return self.ids[self.offsets[slot]:self.offsets[slot + 1]]
+
+    def keys(self):
+        return self.slots.keys()
+
+
+class IdTable:
+    """Open-addressing hash table from positive int ids to row numbers.
+
+    Two flat int arrays instead of a dict, so no boxed int keys or entries.
+    """
+
+    __slots__ = ("keys", "rows", "mask")
+
+    def __init__(self, ids):
+        size = 1 << max(3, (2 * len(ids)).bit_length())
+        self.mask = size - 1
+        self.keys = array("i", bytes(4 * size))
+        self.rows = array("i", bytes(4 * size))
+        for row, key in enumerate(ids):
+            slot = self._slot(key)
+            self.keys[slot] = key
+            self.rows[slot] = row
+
+    def _slot(self, key):
+        slot = (key * 2654435761) & self.mask
+        while self.keys[slot] and self.keys[slot] != key:
+            slot = (slot + 1) & self.mask
+        return slot
+
+    def get(self, key, default=-1):
+        slot = self._slot(key)
+        return self.rows[slot] if self.keys[slot] == key else default
+
+
+class Strings:
+    """Distinct strings stored once, referenced by small int codes."""
+
+    __slots__ = ("values", "codes")
+
+    def __init__(self):
+        self.values = []
+        self.codes = {}
+
+    def code(self, value):
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(sys.intern(value))
+        return code
+
+
+class Registry:
+    """Teams and players by id, with team, position and sport indexes.
+
+    Teams are held as TeamRecords. Players are held column-wise (id, team,
+    position, jersey and status codes in int arrays, names in one string)
+    and a PlayerRecord is built on lookup: a few hundred bytes of Python
+    objects per player would otherwise dominate the footprint.
+    """
+
+    __slots__ = ("teams", "by_team", "by_position", "by_sport", "_rows", "_ids", "_team_ids",
+                 "_positions", "_jerseys", "_statuses", "_strings", "_names", "_name_offsets")
+
+    def __init__(self, teams=(), players=()):
+        self.teams = {t.team_id: t for t in teams}
+        # A player on two rosters (e.g. mid-crawl transaction) keeps the last one
+        latest = {p.player_id: p for p in players}
+        self._strings = Strings()
+        code = self._strings.code
+        self._ids = array("i", latest)
+        self._team_ids = array("i", (p.team_id for p in latest.values()))
+        self._positions = array("H", (code(p.position) for p in latest.values()))
+        self._jerseys = array("H", (code(p.jersey_number) for p in latest.values()))
+        self._statuses = array("H", (code(p.status) for p in latest.values()))
+        self._name_offsets = array("i", [0])
+        for p in latest.values():
+            self._name_offsets.append(self._name_offsets[-1] + len(p.full_name))
+        self._names = "".join(p.full_name for p in latest.values())
+        self._rows = IdTable(self._ids)
+        self.by_team = GroupIndex(zip(self._team_ids, self._ids))
+        self.by_position = GroupIndex(
+            (self._strings.values[c], pid) for c, pid in zip(self._positions, self._ids))
+        self.by_sport = GroupIndex((t.sport_id, t.team_id) for t in self.teams.values())
+
+    @classmethod
+    def from_json(cls, teams, entries):
+        """Build from team dicts and (team_id, raw roster entry) pairs."""
+        return cls((team_record(t) for t in teams),
+                   (player_record(team_id, entry) for team_id, entry in entries))
+
+    @classmethod
+    def from_crawl(cls, sport_ids=SPORT_IDS, get=None, **crawl_kwargs):
+        """Build from a full team list and roster crawl (see crawl_roster_entries)."""
+        teams = list_teams(sport_ids, get)
+        return cls.from_json(teams, ((team["id"], entry) for team, entry in
+                                     crawl_roster_entries(sport_ids, get, teams=teams,
+                                                          **crawl_kwargs)))
+
+    def __len__(self):
+        return len(self._ids)
+
+    def __contains__(self, player_id):
+        return self._rows.get(player_id) >= 0
+
+    def __iter__(self):
+        return (self._record(row) for row in range(len(self._ids)))
+
+    def _record(self, row):
+        strings = self._strings.values
+        return PlayerRecord(
+            self._ids[row], self._names[self._name_offsets[row]:self._name_offsets[row + 1]],
+            self._team_ids[row], strings[self._positions[row]], strings[self._jerseys[row]],
+            strings[self._statuses[row]],
+        )
+
+    def player(self, player_id):
+        """Return the PlayerRecord for an id, or None."""
+        row = self._rows.get(player_id)
+        return self._record(row) if row >= 0 else None
+
+    def team(self, team_id):
+        """Return the TeamRecord for an id, or None."""
+        return self.teams.get(team_id)
+
+    def players_on(self, team_id):
+        return [self.player(i) for i in self.by_team[team_id]]
+
+    def players_at(self, position):
+        return [self.player(i) for i in self.by_position[position]]
+
+    def teams_in(self, sport_id):
+        return [self.teams[i] for i in self.by_sport[sport_id]]
+
+    def footprint(self):
+        """Approximate bytes held by the registry, counting shared objects once."""
+        return deep_sizeof(self)
+
+
+def deep_sizeof(obj, seen=None):
+    """sys.getsizeof over everything reachable from `obj`, each object once."""
+    seen = set() if seen is None else seen
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(deep_sizeof(k, seen) + deep_sizeof(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(deep_sizeof(item, seen) for item in obj)
+    elif hasattr(obj, "__slots__"):
+        size += sum(deep_sizeof(getattr(obj, name), seen)
+                    for cls in type(obj).__mro__ for name in getattr(cls, "__slots__", ())
+                    if hasattr(obj, name))
+    return size
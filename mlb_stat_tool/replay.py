@@ -0,0 +1,154 @@
+"""
+Record / Replay
+Captures statsapi responses to gzip fixtures and serves them back offline
+
+Usage:
+    python -m mlb_stat_tool.replay record FIXTURES tests/test_team_player_id.py:get_teams_and_players
+    python -m mlb_stat_tool.replay replay FIXTURES tests/test_minor_league_player.py:main --latency 0.05
+"""
+
+import argparse
+import gzip
+import hashlib
+import importlib.util
+import json
+import os
+import random
+import sys
+import threading
+import time
+
+import requests
+import statsapi
+
+from . import transport
+from .keys import request_key
+
+
+class FixtureMissing(LookupError):
+    """Raised when replaying a request that was never recorded."""
+
+
+def fixture_path(directory, endpoint, params):
+    digest = hashlib.sha1(request_key(endpoint, params).encode("utf-8")).hexdigest()
+    return os.path.join(directory, endpoint, digest + ".json.gz")
+
+
+def http_error(status, endpoint):
+    """Build the HTTPError statsapi.get would raise for `status`."""
+    response = requests.Response()
+    response.status_code = status
+    response.reason = "Injected"
+    response.url = endpoint
+    return requests.HTTPError(f"{status} Injected error for {endpoint}", response=response)
+
+
+class Recorder:
+    """A get that calls through to the live API and saves every response."""
+
+    def __init__(self, directory, get=None):
+        self.directory = directory
+        self.get = get or statsapi.get
+        self.recorded = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, endpoint, params={}, *args, **kwargs):
+        response = self.get(endpoint, params, *args, **kwargs)
+        path = fixture_path(self.directory, endpoint, params)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{threading.get_ident()}.tmp"
+        with gzip.open(tmp, "wt", encoding="utf-8") as f:
+            json.dump({"endpoint": endpoint, "params": params, "response": response}, f)
+        os.replace(tmp, path)
+        with self._lock:
+            self.recorded += 1
+        return response
+
+
+class Replayer:
+    """A get that answers from recorded fixtures.
+
+    `latency` is seconds per call, or a callable taking the endpoint.
+    `error_rate` is the chance a call raises an HTTPError with a status
+    drawn from `error_statuses`; pass `seed` for a reproducible profile.
+    """
+
+    def __init__(self, directory, latency=0.0, error_rate=0.0, error_statuses=(429, 503),
+                 seed=None):
+        self.directory = directory
+        self.latency = latency
+        self.error_rate = error_rate
+        self.error_statuses = error_statuses
+        self.calls = 0
+        self.bytes_read = 0
+        self._random = random.Random(seed)
+        self._loaded = {}
+        self._lock = threading.Lock()
+
+    def _load(self, endpoint, params):
+        path = fixture_path(self.directory, endpoint, params)
+        with self._lock:
+            if path in self._loaded:
+                return self._loaded[path]
+        if not os.path.exists(path):
+            raise FixtureMissing(f"No fixture for {request_key(endpoint, params)}")
+        with gzip.open(path, "rb") as f:
+            raw = f.read()
+        response = json.loads(raw)["response"]
+        with self._lock:
+            self.bytes_read += len(raw)
+            self._loaded[path] = response
+        return response
+
+    def __call__(self, endpoint, params={}, *args, **kwargs):
+        with self._lock:
+            self.calls += 1
+            fail = self.error_rate and self._random.random() < self.error_rate
+            status = self._random.choice(self.error_statuses) if fail else None
+        delay = self.latency(endpoint) if callable(self.latency) else self.latency
+        if delay:
+            time.sleep(delay)
+        if status:
+            raise http_error(status, endpoint)
+        # Callers may mutate what they get back, so hand out a fresh copy
+        return json.loads(json.dumps(self._load(endpoint, params)))
+
+
+def load_target(target):
+    """Resolve "path/to/file.py:function" or "package.module:function"."""
+    location, _, name = target.partition(":")
+    if location.endswith(".py"):
+        spec = importlib.util.spec_from_file_location(
+            os.path.splitext(os.path.basename(location))[0], location)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+    else:
+        module = importlib.import_module(location)
+    return getattr(module, name or "main")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("mode", choices=["record", "replay"])
+    parser.add_argument("fixtures")
+    parser.add_argument("target", help="file.py:function or module:function to run")
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args(argv)
+
+    if args.mode == "record":
+        get = Recorder(args.fixtures)
+    else:
+        get = Replayer(args.fixtures, args.latency, args.error_rate, seed=args.seed)
+    func = load_target(args.target)
+    start = time.perf_counter()
+    with transport.using(get):
+        func()
+    elapsed = time.perf_counter() - start
+    count = get.recorded if args.mode == "record" else get.calls
+    print(f"\n{args.mode}: {count} requests in {elapsed:.3f}s", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
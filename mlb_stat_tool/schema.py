@@ -0,0 +1,119 @@
+"""
+Stat Schemas
+Declarative per-group field lists driving fixed-width stat extraction
+
+Each group lists the stats the trade engine uses and how to read them.
+extractor() builds, once per group, a function that turns a split's
+"stat" dict into a tuple in schema order; records() packs many of them
+into a NumPy structured array. stats_fields() gives the matching
+server-side fields= value so nothing else is downloaded.
+
+A stat the API leaves out or reports as "-.--" is NaN, never 0, so "not
+reported" stays distinct from zero. Counts are float32 for that reason:
+the same width as int32 and exact for any realistic count.
+"""
+
+import math
+
+import numpy as np
+
+from .store import TYPE_CODES, innings, to_float
+
+
+KINDS = {
+    "count": (to_float, np.float32),
+    "rate": (to_float, np.float64),
+    "innings": (innings, np.float64),
+}
+
+SCHEMAS = {
+    "hitting": {
+        "gamesPlayed": "count", "plateAppearances": "count", "atBats": "count",
+        "hits": "count", "doubles": "count", "triples": "count", "homeRuns": "count",
+        "runs": "count", "rbi": "count", "baseOnBalls": "count", "intentionalWalks": "count",
+        "hitByPitch": "count", "strikeOuts": "count", "sacFlies": "count",
+        "stolenBases": "count", "caughtStealing": "count",
+        "avg": "rate", "obp": "rate", "slg": "rate", "ops": "rate", "babip": "rate",
+    },
+    "pitching": {
+        "gamesPlayed": "count", "gamesStarted": "count", "inningsPitched": "innings",
+        "battersFaced": "count", "outs": "count", "wins": "count", "losses": "count",
+        "saves": "count", "holds": "count", "hits": "count", "homeRuns": "count",
+        "baseOnBalls": "count", "intentionalWalks": "count", "hitByPitch": "count",
+        "strikeOuts": "count", "earnedRuns": "count",
+        "era": "rate", "whip": "rate", "strikeoutsPer9Inn": "rate", "walksPer9Inn": "rate",
+        "homeRunsPer9": "rate", "avg": "rate",
+    },
+    "fielding": {
+        "gamesPlayed": "count", "gamesStarted": "count", "innings": "innings",
+        "chances": "count", "putOuts": "count", "assists": "count", "errors": "count",
+        "doublePlays": "count", "fielding": "rate", "rangeFactorPerGame": "rate",
+    },
+    "catching": {
+        "gamesPlayed": "count", "stolenBases": "count", "caughtStealing": "count",
+        "passedBall": "count", "wildPitches": "count", "catchersInterference": "count",
+        "stolenBasePercentage": "rate",
+    },
+    "running": {
+        "stolenBases": "count", "caughtStealing": "count", "stolenBasePercentage": "rate",
+    },
+}
+
+# The Stats API calls baserunning "running"
+ALIASES = {"baserunning": "running"}
+
+KEYS = [("player_id", np.int32), ("season", np.int32), ("type", np.int8)]
+
+_extractors = {}
+
+
+def schema(group):
+    group = group.strip("[]").lower()
+    return SCHEMAS[ALIASES.get(group, group)]
+
+
+def dtype(group):
+    """Structured dtype for one group's fixed-width records."""
+    return np.dtype(KEYS + [(name, KINDS[kind][1]) for name, kind in schema(group).items()])
+
+
+def extractor(group):
+    """Return (cached) stat dict -> tuple converter for `group`."""
+    group = ALIASES.get(group.strip("[]").lower(), group.strip("[]").lower())
+    if group not in _extractors:
+        steps = tuple((name, KINDS[kind][0]) for name, kind in schema(group).items())
+        nan = math.nan
+
+        def extract(stat):
+            get = stat.get
+            return tuple(convert(get(name, nan)) for name, convert in steps)
+
+        _extractors[group] = extract
+    return _extractors[group]
+
+
+def records(players, group):
+    """Pack every `group` split from player records into one structured array."""
+    extract = extractor(group)
+    wanted = ALIASES.get(group.strip("[]").lower(), group.strip("[]").lower())
+    rows = [
+        (player["id"], int(entry.get("season") or 0), TYPE_CODES.get(entry["type"].lower(), -1))
+        + extract(entry["stats"])
+        for player in players
+        for entry in player["stats"]
+        if entry["group"].lower() == wanted
+    ]
+    return np.array(rows, dtype=dtype(group))
+
+
+def stats_fields(groups):
+    """fields= value for people/person requests hydrated with these stat groups."""
+    names = ["people", "id", "fullName", "useName", "firstName", "lastName", "birthDate",
+             "active", "currentTeam", "name", "primaryPosition", "abbreviation",
+             "stats", "type", "group", "displayName", "splits", "season", "team", "sport",
+             "stat"]
+    for group in groups:
+        for name in schema(group):
+            if name not in names:
+                names.append(name)
+    return ",".join(names)
@@ -0,0 +1,126 @@
+"""
+Pooled HTTP Session
+One keep-alive connection pool shared by every statsapi call
+
+statsapi.get makes each request with the module-level requests.get,
+which opens a fresh connection (and TLS handshake) per call. install()
+points statsapi at a PooledSession instead, so every entry point reuses
+pooled connections. HTTP/2 is used when httpx with h2 is installed and
+requested; otherwise requests/urllib3 with HTTP/1.1 keep-alive.
+"""
+
+import threading
+from collections import Counter
+from contextlib import contextmanager
+
+import requests
+import statsapi
+from requests.adapters import HTTPAdapter
+from urllib3.util import make_headers
+
+try:
+    import httpx
+    import h2  # noqa: F401  (httpx needs it for http2=True)
+except ImportError:
+    httpx = None
+
+# (connect, read) seconds
+DEFAULT_TIMEOUT = (3.05, 30.0)
+
+
+class PooledSession:
+    """requests-compatible .get() over a shared connection pool.
+
+    `pool_maxsize` bounds connections kept per host, so it should match
+    the largest number of concurrent workers. Accept-Encoding lists every
+    content coding the installed decoders support (brotli and zstd when
+    their packages are present).
+    """
+
+    def __init__(self, pool_maxsize=16, pool_connections=4, timeout=DEFAULT_TIMEOUT,
+                 http2=False):
+        self.timeout = timeout
+        self.http2 = bool(http2 and httpx)
+        headers = {"Accept-Encoding": make_headers(accept_encoding=True)["accept-encoding"]}
+        if self.http2:
+            self.client = httpx.Client(
+                http2=True, headers=headers, timeout=httpx.Timeout(timeout[1], connect=timeout[0]),
+                limits=httpx.Limits(max_connections=pool_maxsize,
+                                    max_keepalive_connections=pool_maxsize),
+            )
+        else:
+            self.client = requests.Session()
+            self.client.headers.update(headers)
+            adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+            self.client.mount("https://", adapter)
+            self.client.mount("http://", adapter)
+        self.requests = 0
+        self.versions = Counter()
+        self._lock = threading.Lock()
+
+    def get(self, url, **kwargs):
+        if not self.http2:
+            kwargs.setdefault("timeout", self.timeout)
+        response = self.client.get(url, **kwargs)
+        self._count(response)
+        return response
+
+    @contextmanager
+    def stream(self, url, chunk_size):
+        """GET `url` without reading the body; yield an iterator over its chunks."""
+        if self.http2:
+            with self.client.stream("GET", url) as response:
+                self._count(response)
+                response.raise_for_status()
+                yield response.iter_bytes(chunk_size)
+        else:
+            with self.client.get(url, stream=True, timeout=self.timeout) as response:
+                self._count(response)
+                response.raise_for_status()
+                yield response.iter_content(chunk_size)
+
+    def _count(self, response):
+        version = getattr(response, "http_version", None) or {10: "HTTP/1.0", 11: "HTTP/1.1"}.get(
+            getattr(getattr(response, "raw", None), "version", None), "unknown")
+        with self._lock:
+            self.requests += 1
+            self.versions[version] += 1
+
+    def stats(self):
+        """Request and connection counts, to show how much reuse is happening."""
+        opened = None
+        if not self.http2:
+            opened = 0
+            for adapter in set(self.client.adapters.values()):
+                for key in adapter.poolmanager.pools.keys():
+                    opened += adapter.poolmanager.pools[key].num_connections
+        stats = {"requests": self.requests, "connections_opened": opened,
+                 "http_versions": dict(self.versions)}
+        if opened is not None and self.requests:
+            stats["reused"] = self.requests - opened
+            stats["reuse_ratio"] = round(1 - opened / self.requests, 4)
+        return stats
+
+    def close(self):
+        self.client.close()
+
+
+def _replace_client(client):
+    # An instrument.InstrumentedClient stays on top, whichever was installed first
+    current = statsapi.requests
+    if hasattr(current, "target"):
+        current.target = client
+    else:
+        statsapi.requests = client
+
+
+def install(session=None):
+    """Send every statsapi request through `session` and return it."""
+    session = session or PooledSession()
+    _replace_client(session)
+    return session
+
+
+def uninstall():
+    """Go back to statsapi's per-call requests.get."""
+    _replace_client(requests)
@@ -0,0 +1,124 @@
+"""
+Single-Flight Requests
+Concurrent identical calls share one in-flight fetch
+
+When several threads (or tasks) ask for the same player_stat_data() or
+roster() at once, the first caller makes the request and the rest wait for
+its result instead of issuing their own. Calls are keyed on the normalized
+arguments, with equivalent stat group spellings ("hitting", "[hitting]",
+"Hitting") treated as the same call. Nothing is kept once the
+call finishes; combine with the response cache for that.
+
+Waiters receive the very object the first caller got, so results must be
+treated as read-only.
+"""
+
+import asyncio
+import functools
+import threading
+
+from . import transport
+from .keys import canonical, normalize_arguments, request_key
+
+# statsapi functions coalesced by install(); get covers every other entry point
+COALESCED_FUNCTIONS = ["get", "player_stat_data", "roster", "lookup_player"]
+
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Thread-safe call coalescing; `calls` ran, `shared` piggybacked."""
+
+    def __init__(self):
+        self.calls = 0
+        self.shared = 0
+        self._lock = threading.Lock()
+        self._inflight = {}
+
+    def do(self, key, func, *args, **kwargs):
+        """Return func(*args, **kwargs), sharing it with concurrent callers of `key`."""
+        with self._lock:
+            call = self._inflight.get(key)
+            leader = call is None
+            if leader:
+                call = self._inflight[key] = _Call()
+                self.calls += 1
+            else:
+                self.shared += 1
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+        try:
+            call.result = func(*args, **kwargs)
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._inflight[key]
+            call.done.set()
+        return call.result
+
+    def wrap(self, func, name=None):
+        """Return `func` with concurrent identical calls coalesced."""
+        name = name or func.__name__
+
+        @functools.wraps(func)
+        def coalesced(*args, **kwargs):
+            key = request_key(name, canonical(normalize_arguments(func, args, kwargs)))
+            return self.do(key, func, *args, **kwargs)
+
+        coalesced.__wrapped__ = func
+        return coalesced
+
+
+class AsyncSingleFlight:
+    """Call coalescing for coroutines on one event loop."""
+
+    def __init__(self):
+        self.calls = 0
+        self.shared = 0
+        self._inflight = {}
+
+    async def do(self, key, coroutine_function, *args, **kwargs):
+        """Await coroutine_function(*args, **kwargs), shared by concurrent callers of `key`.
+
+        The fetch runs as its own task, so one waiter being cancelled does
+        not cancel it for the others.
+        """
+        task = self._inflight.get(key)
+        if task is None:
+            self.calls += 1
+            task = asyncio.ensure_future(coroutine_function(*args, **kwargs))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        else:
+            self.shared += 1
+        return await asyncio.shield(task)
+
+
+def install(flight=None, names=COALESCED_FUNCTIONS):
+    """Coalesce the named statsapi functions through `flight` and return it.
+
+    The wrapper sits just outside the cache layer and replaces any
+    single-flight layer installed before it, so installing twice is harmless.
+    """
+    flight = flight or SingleFlight()
+    for name in names:
+        transport.add_layer(name, "singleflight", functools.partial(flight.wrap, name=name))
+    return flight
+
+
+def uninstall(names=COALESCED_FUNCTIONS):
+    """Remove the single-flight layer install() added."""
+    for name in names:
+        transport.remove_layer(name, "singleflight")
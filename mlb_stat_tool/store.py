@@ -0,0 +1,198 @@
+"""
+Columnar Stat Store
+Flattens player_stat_data()-shaped records into typed NumPy columns
+"""
+
+import json
+import math
+import os
+
+import numpy as np
+
+# Stat types are stored as int8 codes in the "type" column
+STAT_TYPES = ["career", "season", "yearByYear", "gameLog"]
+TYPE_CODES = {name.lower(): code for code, name in enumerate(STAT_TYPES)}
+
+KEY_COLUMNS = {
+    "player_id": np.int32,
+    "season": np.int32,
+    "team_id": np.int32,
+    "sport_id": np.int32,
+    "type": np.int8,
+    "game_pk": np.int32,
+    "age": np.float32,
+}
+
+
+def to_float(value):
+    """Convert an API stat value (12, ".285", "-.--", "1.000") to float."""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return math.nan
+
+
+def innings(value):
+    """Innings as thirds-aware float: "45.1" -> 45.333..."""
+    value = to_float(value)
+    if math.isnan(value):
+        return value
+    whole = math.floor(value)
+    return whole + round((value - whole) * 10) / 3
+
+
+# Stats reported in baseball notation, where ".1" and ".2" are thirds
+INNINGS_COLUMNS = {"inningsPitched", "innings"}
+
+
+def _is_stat(value):
+    return isinstance(value, (int, float, str)) and not isinstance(value, bool)
+
+
+def _age(birth_date, season):
+    if not birth_date or not season:
+        return math.nan
+    # Baseball age: age on July 1st of the season
+    year, month = int(birth_date[:4]), int(birth_date[5:7])
+    return season - year - (1 if month > 6 else 0)
+
+
+class StatTable:
+    """One stat group as parallel arrays: key columns plus one per stat."""
+
+    def __init__(self, columns, group=None):
+        self.columns = dict(columns)
+        self.group = group
+
+    def __len__(self):
+        return len(self.columns["player_id"])
+
+    def __getitem__(self, name):
+        return self.columns[name]
+
+    def __contains__(self, name):
+        return name in self.columns
+
+    @property
+    def stat_names(self):
+        return [name for name in self.columns if name not in KEY_COLUMNS]
+
+    def filter(self, mask):
+        """Return a new table with only the rows where `mask` is true."""
+        return StatTable({name: col[mask] for name, col in self.columns.items()}, self.group)
+
+    def rows_for(self, player_id):
+        return self.filter(self.columns["player_id"] == player_id)
+
+    def column(self, name, rows):
+        """Column `name` at `rows` as float64 with missing values as 0; zeros if absent."""
+        if name in self.columns:
+            return np.nan_to_num(np.asarray(self.columns[name][rows], np.float64))
+        return np.zeros(len(rows))
+
+    def per_player(self, rows, names):
+        """Sum columns per player; returns (player_ids, {name: sums}, inverse)."""
+        ids, inverse = np.unique(self.columns["player_id"][rows], return_inverse=True)
+        sums = {name: np.bincount(inverse, self.column(name, rows), minlength=len(ids))
+                for name in names}
+        return ids, sums, inverse
+
+    def nbytes(self):
+        return sum(col.nbytes for col in self.columns.values())
+
+    def save(self, directory):
+        os.makedirs(directory, exist_ok=True)
+        for name, col in self.columns.items():
+            np.save(os.path.join(directory, name + ".npy"), col)
+        with open(os.path.join(directory, "columns.json"), "w") as f:
+            json.dump(list(self.columns), f)
+
+    @classmethod
+    def load(cls, directory, mmap=True):
+        """Load a saved table; with `mmap` columns are paged in on demand."""
+        with open(os.path.join(directory, "columns.json")) as f:
+            names = json.load(f)
+        mode = "r" if mmap else None
+        return cls({name: np.load(os.path.join(directory, name + ".npy"), mmap_mode=mode)
+                    for name in names}, os.path.basename(os.path.normpath(directory)))
+
+
+def build_tables(players):
+    """Flatten player records into {group: StatTable}.
+
+    `players` is an iterable of player_stat_data()/bulk_player_stat_data()
+    records. Every split becomes a row; career rows have season 0. Stats a
+    row does not report are NaN. Innings ("45.1") are read as thirds.
+    """
+    rows = {}
+    for player in players:
+        for entry in player["stats"]:
+            rows.setdefault(entry["group"].lower(), []).append((player, entry))
+
+    tables = {}
+    for group, entries in rows.items():
+        stat_names = []
+        seen = set()
+        for _, entry in entries:
+            for name, value in entry["stats"].items():
+                if name not in seen and _is_stat(value):
+                    seen.add(name)
+                    stat_names.append(name)
+
+        n = len(entries)
+        columns = {name: np.zeros(n, dtype) for name, dtype in KEY_COLUMNS.items()}
+        columns.update({name: np.full(n, np.nan) for name in stat_names})
+        for i, (player, entry) in enumerate(entries):
+            season = int(entry.get("season") or 0)
+            columns["player_id"][i] = player["id"]
+            columns["season"][i] = season
+            columns["team_id"][i] = entry.get("team_id") or player.get("team_id") or 0
+            columns["sport_id"][i] = entry.get("sport_id") or 1
+            columns["type"][i] = TYPE_CODES.get(entry["type"].lower(), -1)
+            columns["game_pk"][i] = entry.get("game_pk") or 0
+            columns["age"][i] = _age(player.get("birth_date"), season)
+            for name, value in entry["stats"].items():
+                if name in seen:
+                    columns[name][i] = (innings if name in INNINGS_COLUMNS else to_float)(value)
+        tables[group] = StatTable(columns, group)
+    return tables
+
+
+def concat_tables(tables):
+    """Stack tables of one group; stats missing from a table are NaN."""
+    tables = [t for t in tables if len(t)]
+    if not tables:
+        return StatTable({name: np.zeros(0, dtype) for name, dtype in KEY_COLUMNS.items()})
+    names = list(dict.fromkeys(name for t in tables for name in t.columns))
+    columns = {}
+    for name in names:
+        parts = [t[name] if name in t else np.full(len(t), np.nan) for t in tables]
+        columns[name] = np.concatenate(parts)
+    return StatTable(columns, tables[0].group)
+
+
+class StatStore:
+    """The per-group tables for a population of players."""
+
+    def __init__(self, tables=None):
+        self.tables = dict(tables or {})
+
+    @classmethod
+    def from_players(cls, players):
+        return cls(build_tables(players))
+
+    def __getitem__(self, group):
+        return self.tables[group]
+
+    def __contains__(self, group):
+        return group in self.tables
+
+    def save(self, root):
+        for group, table in self.tables.items():
+            table.save(os.path.join(root, group))
+
+    @classmethod
+    def load(cls, root, mmap=True):
+        return cls({group: StatTable.load(os.path.join(root, group), mmap)
+                    for group in sorted(os.listdir(root))
+                    if os.path.isfile(os.path.join(root, group, "columns.json"))})
@@ -0,0 +1,185 @@
+"""
+Streaming Decode
+Yields projected elements of a large JSON array without materializing the payload
+
+statsapi.get() loads the whole response into nested dicts. For the big
+teams/people/stats lists, stream() reads the body in chunks, decodes one
+array element at a time and keeps only the requested fields, so peak
+memory is one element plus one chunk. The server-side fields= parameter
+is sent too, so unused keys are not transferred at all.
+
+Only statsapi's own get can be bypassed like this. It is still bypassed
+when it is wrapped in transport layers (the cache, single-flight or
+instrument wrappers) or used by a RequestScheduler; a scheduler runs the
+streamed request under its rate limit, retries and circuit breaker. When
+a Recorder, Replayer or any other get is installed (or passed in), the
+request goes through it so it is recorded or replayed like every other
+call, and the elements are projected from its decoded response instead.
+"""
+
+import codecs
+import json
+import re
+from contextlib import ExitStack, contextmanager
+
+import statsapi
+from statsapi.endpoints import ENDPOINTS
+
+from . import transport
+from .ratelimit import RequestScheduler
+from .session import PooledSession
+
+CHUNK_SIZE = 64 * 1024
+
+_decoder = json.JSONDecoder()
+_WHITESPACE = re.compile(r"[\s,]*")
+_DELIMITER = re.compile(r"\s*[,\]]")
+
+
+def endpoint_url(endpoint, params):
+    """Build the request URL the same way statsapi.get() does."""
+    ep = ENDPOINTS.get(endpoint)
+    if not ep:
+        raise ValueError("Invalid endpoint (" + str(endpoint) + ").")
+    url = ep["url"]
+    for name, spec in ep["path_params"].items():
+        value = params.get(name, spec["default"])
+        if value in (None, ""):
+            if spec["required"]:
+                raise ValueError("Missing required path parameter {%s}" % name)
+            url = url.replace("{" + name + "}", "")
+            continue
+        url = url.replace("{" + name + "}", ("/" if spec["leading_slash"] else "") + str(value)
+                          + ("/" if spec["trailing_slash"] else ""))
+    query = [(k, str(v)) for k, v in params.items() if k in ep["query_params"]]
+    if query:
+        url += "?" + "&".join(f"{k}={v}" for k, v in query)
+    return url
+
+
+def fields_param(key, fields):
+    """The statsapi fields= value that keeps `key` and every dotted field."""
+    names = [key]
+    for field in fields:
+        for part in field.split("."):
+            if part not in names:
+                names.append(part)
+    return ",".join(names)
+
+
+def project(element, fields):
+    """Return {dotted_field: value} for the requested fields; missing ones are None."""
+    projected = {}
+    for field in fields:
+        value = element
+        for part in field.split("."):
+            value = value.get(part) if isinstance(value, dict) else None
+        projected[field] = value
+    return projected
+
+
+def iter_array(chunks, key, fields=None):
+    """Yield each element of the first array stored under `key` in a JSON stream.
+
+    `chunks` is an iterable of bytes. Elements are decoded one at a time
+    with JSONDecoder.raw_decode; when `fields` is given each is projected
+    before being yielded.
+    """
+    text = codecs.getincrementaldecoder("utf-8")()
+    chunks = iter(chunks)
+    buffer = ""
+    start = re.compile(r'"' + re.escape(key) + r'"\s*:\s*\[')
+    exhausted = False
+
+    def more():
+        nonlocal buffer, exhausted
+        chunk = next(chunks, None)
+        if chunk is None:
+            exhausted = True
+            buffer += text.decode(b"", final=True)
+        else:
+            buffer += text.decode(chunk)
+
+    while True:
+        match = start.search(buffer)
+        if match:
+            pos = match.end()
+            break
+        if exhausted:
+            return
+        # Keep a tail in case the key straddles two chunks
+        buffer = buffer[-(len(key) + 16):]
+        more()
+
+    while True:
+        pos = _WHITESPACE.match(buffer, pos).end()
+        if pos >= len(buffer):
+            if exhausted:
+                raise ValueError(f"Unterminated array under {key!r}")
+            buffer, pos = buffer[pos:], 0
+            more()
+            continue
+        if buffer[pos] == "]":
+            return
+        try:
+            element, end = _decoder.raw_decode(buffer, pos)
+        except json.JSONDecodeError:
+            element, end = None, None
+        # raw_decode accepts a prefix of a number cut by a chunk boundary
+        # ("-1." of "-1.5"), so only take an element once a delimiter follows
+        if end is None or not _DELIMITER.match(buffer, end):
+            if exhausted:
+                raise json.JSONDecodeError("Unterminated element", buffer, pos)
+            buffer, pos = buffer[pos:], 0
+            more()
+            continue
+        yield project(element, fields) if fields else element
+        buffer, pos = buffer[end:], 0
+
+
+@contextmanager
+def _body(url, session, chunk_size):
+    client = session or statsapi.requests
+    # Unwrap an instrument.InstrumentedClient
+    client = getattr(client, "target", client)
+    if isinstance(client, PooledSession):
+        with client.stream(url, chunk_size) as chunks:
+            yield chunks
+    else:
+        with client.get(url, stream=True, timeout=30) as r:
+            r.raise_for_status()
+            yield r.iter_content(chunk_size)
+
+
+def _run_once(endpoint, fetch):
+    return fetch()
+
+
+def stream(endpoint, params, key, fields=None, session=None, chunk_size=CHUNK_SIZE, get=None):
+    """Stream `key`'s array from a Stats API endpoint, projected to `fields`.
+
+    `session` is a PooledSession or requests-style client; it defaults to
+    the one statsapi uses. `get`, or a replaced statsapi.get, is called
+    instead of streaming unless it is statsapi's own get under transport
+    layers, or a RequestScheduler around one.
+    """
+    params = dict(params)
+    if fields:
+        params.setdefault("fields", fields_param(key, fields))
+    get = get or statsapi.get
+    run, inner = (get.run, get.get) if isinstance(get, RequestScheduler) else (_run_once, get)
+    if transport.underlying(inner) is not transport.ORIGINAL_GET:
+        for element in get(endpoint, params).get(key, []):
+            yield project(element, fields) if fields else element
+        return
+    url = endpoint_url(endpoint, params)
+    with ExitStack() as stack:
+        # Only opening the response is retried; elements already yielded stay yielded
+        chunks = run(endpoint, lambda: stack.enter_context(_body(url, session, chunk_size)))
+        yield from iter_array(chunks, key, fields)
+
+
+def iter_teams(sport_id, fields=("id", "name", "sport.id", "parentOrgId"), session=None,
+               get=None):
+    """Yield projected team records for one sport ID."""
+    return stream("teams", {"sportId": sport_id}, "teams", fields, session, get=get)
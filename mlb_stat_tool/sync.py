@@ -0,0 +1,224 @@
+"""
+Incremental Sync
+Keeps a local roster/stat snapshot current by fetching only what changed
+"""
+
+import hashlib
+import json
+import os
+from datetime import datetime, timedelta, timezone
+
+import statsapi
+
+from .bulk import STAT_GROUPS, STAT_TYPES, bulk_player_stat_data
+from .constants import LEVELS
+from .crawl import SPORT_IDS, crawl_rosters, list_teams
+
+
+def content_hash(value):
+    """Stable SHA-1 of any JSON-serializable value."""
+    return hashlib.sha1(json.dumps(value, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def classify_move(old_sport_id, new_sport_id):
+    """Name a roster move by the levels it crosses."""
+    if old_sport_id is None:
+        return "added"
+    if new_sport_id is None:
+        return "removed"
+    old, new = LEVELS.get(old_sport_id, 9), LEVELS.get(new_sport_id, 9)
+    if old == new:
+        return "trade"
+    if new == 0:
+        return "call-up"
+    if old == 0:
+        return "option"
+    return "promotion" if new < old else "demotion"
+
+
+class Snapshot:
+    """JSON file holding the last seen rosters, stat hashes, pending moves and change log."""
+
+    def __init__(self, path):
+        self.path = path
+        self.data = {"rosters_synced_at": None, "stats_synced_at": None,
+                     "teams": {}, "players": {}, "moved": [], "changes": []}
+        if os.path.exists(path):
+            with open(path) as f:
+                self.data.update(json.load(f))
+
+    def save(self):
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        tmp = self.path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(self.data, f)
+        os.replace(tmp, self.path)
+
+    @property
+    def teams(self):
+        return self.data["teams"]
+
+    @property
+    def players(self):
+        return self.data["players"]
+
+    @property
+    def moved(self):
+        return self.data["moved"]
+
+    @property
+    def changes(self):
+        return self.data["changes"]
+
+
+def players_who_played(start_date, end_date, sport_ids=SPORT_IDS, get=None):
+    """Return IDs of players with a batting or pitching line in a final game."""
+    get = get or statsapi.get
+    played = set()
+    for sport_id in sport_ids:
+        schedule = get("schedule", {"sportId": sport_id, "startDate": start_date,
+                                    "endDate": end_date})
+        for day in schedule.get("dates", []):
+            for game in day.get("games", []):
+                if game.get("status", {}).get("abstractGameState") != "Final":
+                    continue
+                box = get("game_boxscore", {"gamePk": game["gamePk"]})
+                for side in box.get("teams", {}).values():
+                    for player in side.get("players", {}).values():
+                        stats = player.get("stats", {})
+                        if stats.get("batting") or stats.get("pitching"):
+                            played.add(player["person"]["id"])
+    return played
+
+
+class DeltaSync:
+    """Incremental roster and stat refresh against a Snapshot.
+
+    Rosters have no conditional-request support through statsapi.get, so
+    each roster is fetched and compared by content hash; only teams whose
+    hash moved are diffed. Stats are refetched only for players who moved,
+    whose person record changed (people/changes?updatedSince=) or who
+    appeared in a final game since the last stat sync.
+    """
+
+    def __init__(self, path, sport_ids=SPORT_IDS, get=None, max_workers=8):
+        self.snapshot = Snapshot(path)
+        self.sport_ids = sport_ids
+        self._get = get
+        self.max_workers = max_workers
+        self.moved = set(self.snapshot.moved)
+
+    @property
+    def get(self):
+        return self._get or statsapi.get
+
+    def sync_rosters(self, now=None):
+        """Refresh rosters and return the roster moves detected."""
+        now = now or datetime.now(timezone.utc)
+        teams = list_teams(self.sport_ids, self.get)
+        sport_of = {team["id"]: team.get("sport", {}).get("id") for team in teams}
+        fetched, failed = {}, set()
+        for team_id, player_id, full_name in crawl_rosters(
+            teams=teams, get=self.get, max_workers=self.max_workers,
+            on_error=lambda team, e: failed.add(team["id"]),
+        ):
+            fetched.setdefault(team_id, {})[str(player_id)] = full_name
+
+        old_home = {pid: int(tid) for tid, team in self.snapshot.teams.items()
+                    for pid in team["players"]}
+        changed = {}
+        for team in teams:
+            team_id = team["id"]
+            if team_id in failed:
+                continue
+            players = fetched.get(team_id, {})
+            digest = content_hash(sorted(players))
+            entry = self.snapshot.teams.get(str(team_id))
+            if entry and entry["hash"] == digest:
+                continue
+            changed[team_id] = players
+            self.snapshot.teams[str(team_id)] = {
+                "sport_id": sport_of[team_id], "hash": digest, "players": players}
+
+        new_home = dict(old_home)
+        names = {}
+        for team_id, players in changed.items():
+            for pid, tid in old_home.items():
+                if tid == team_id and pid not in players:
+                    new_home.pop(pid, None)
+        for team_id, players in changed.items():
+            for pid, name in players.items():
+                new_home[pid] = team_id
+                names[pid] = name
+
+        def sport(team_id):
+            return self.snapshot.teams.get(str(team_id), {}).get("sport_id", sport_of.get(team_id))
+
+        moves = []
+        if self.snapshot.data["rosters_synced_at"]:
+            for pid in sorted(set(old_home) | set(new_home), key=int):
+                old, new = old_home.get(pid), new_home.get(pid)
+                if old == new:
+                    continue
+                if new is None and old not in changed:
+                    continue
+                moves.append({
+                    "player_id": int(pid),
+                    "full_name": names.get(pid) or self.snapshot.teams.get(str(old), {})
+                    .get("players", {}).get(pid),
+                    "from_team": old,
+                    "to_team": new,
+                    "kind": classify_move(old and sport(old), new and sport(new)),
+                    "detected_at": now.isoformat(),
+                })
+        self.moved.update(m["player_id"] for m in moves)
+        self.snapshot.data["moved"] = sorted(self.moved)
+        self.snapshot.changes.extend(moves)
+        self.snapshot.data["rosters_synced_at"] = now.isoformat()
+        return moves
+
+    def stale_players(self, now=None):
+        """IDs whose stats may have changed since the last stat sync."""
+        now = now or datetime.now(timezone.utc)
+        since = self.snapshot.data["stats_synced_at"]
+        if since is None:
+            return {int(pid) for team in self.snapshot.teams.values() for pid in team["players"]}
+        since = datetime.fromisoformat(since)
+        stale = set(self.moved)
+        updated = self.get("people_changes", {"updatedSince": since.isoformat(),
+                                              "fields": "people,id"})
+        stale.update(p["id"] for p in updated.get("people", []))
+        # Games are scheduled by local date, so include the day before
+        start = (since - timedelta(days=1)).strftime("%Y-%m-%d")
+        stale |= players_who_played(start, now.strftime("%Y-%m-%d"), self.sport_ids, self.get)
+        return stale
+
+    def sync_stats(self, player_ids=None, groups=STAT_GROUPS, types=STAT_TYPES, now=None):
+        """Refetch stats for stale players; return {player_id: record} that changed."""
+        now = now or datetime.now(timezone.utc)
+        if player_ids is None:
+            player_ids = self.stale_players(now)
+        records = bulk_player_stat_data(sorted(player_ids), groups, types, get=self.get)
+        changed = {}
+        for player_id, record in records.items():
+            digest = content_hash(record["stats"])
+            if self.snapshot.players.get(str(player_id)) != digest:
+                self.snapshot.players[str(player_id)] = digest
+                changed[player_id] = record
+        self.moved.clear()
+        self.snapshot.data["moved"] = []
+        self.snapshot.data["stats_synced_at"] = now.isoformat()
+        return changed
+
+    def sync(self, now=None):
+        """Run a roster then stat refresh, save the snapshot, return both results.
+
+        The snapshot is also saved between the two steps so players who moved
+        are still refetched if the stat refresh never finishes.
+        """
+        moves = self.sync_rosters(now)
+        self.snapshot.save()
+        changed = self.sync_stats(now=now)
+        self.snapshot.save()
+        return moves, changed
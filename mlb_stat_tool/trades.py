@@ -0,0 +1,187 @@
+"""
+Trade Evaluation
+Scores batches of candidate trade packages as matrix operations
+"""
+
+import heapq
+import itertools
+from typing import NamedTuple
+
+import numpy as np
+
+from .store import TYPE_CODES
+
+POSITIONS = ["P", "C", "1B", "2B", "3B", "SS", "LF", "CF", "RF", "DH"]
+POSITION_CODES = {name: code for code, name in enumerate(POSITIONS)}
+# Outfield and two-way abbreviations the API also uses
+POSITION_CODES.update({"OF": POSITION_CODES["CF"], "TWP": POSITION_CODES["P"],
+                       "SP": POSITION_CODES["P"], "RP": POSITION_CODES["P"]})
+
+# Players each team wants at a position before it stops adding value there
+DEPTH_TARGETS = {"P": 13, "C": 2, "1B": 1, "2B": 1, "3B": 1, "SS": 1, "LF": 1, "CF": 1, "RF": 1,
+                 "DH": 1}
+
+
+class Trade(NamedTuple):
+    team_a: int
+    gives: tuple
+    team_b: int
+    gets: tuple
+    score: float
+    gain_a: float
+    gain_b: float
+
+
+def player_values(store, season=None, stat_type="season"):
+    """Return {player_id: runs above average} from summed counting stats.
+
+    Hitters: (OPS - league OPS) * PA / 10. Pitchers: (league ERA - ERA)
+    * IP / 9. A rough scale, but on runs, so the two are comparable.
+    """
+    values = {}
+    for group in ("hitting", "pitching"):
+        if group not in store:
+            continue
+        table = store[group]
+        mask = table["type"] == TYPE_CODES[stat_type.lower()]
+        if season is not None:
+            mask &= table["season"] == season
+        rows = np.flatnonzero(mask)
+        if group == "hitting":
+            names = ["plateAppearances", "atBats", "hits", "doubles", "triples", "homeRuns",
+                     "baseOnBalls", "hitByPitch", "sacFlies"]
+            ids, s, _ = table.per_player(rows, names)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                on_base = s["hits"] + s["baseOnBalls"] + s["hitByPitch"]
+                chances = s["atBats"] + s["baseOnBalls"] + s["hitByPitch"] + s["sacFlies"]
+                bases = s["hits"] + s["doubles"] + 2 * s["triples"] + 3 * s["homeRuns"]
+                ops = np.nan_to_num(on_base / chances) + np.nan_to_num(bases / s["atBats"])
+                league = (on_base.sum() / max(chances.sum(), 1)
+                          + bases.sum() / max(s["atBats"].sum(), 1))
+            value = (ops - league) * s["plateAppearances"] / 10
+        else:
+            ids, s, _ = table.per_player(rows, ["earnedRuns", "outs"])
+            innings = s["outs"] / 3
+            with np.errstate(divide="ignore", invalid="ignore"):
+                era = np.nan_to_num(9 * s["earnedRuns"] / innings)
+            league = 9 * s["earnedRuns"].sum() / max(innings.sum(), 1)
+            value = (league - era) * innings / 9
+        for pid, v in zip(ids.tolist(), value.tolist()):
+            values[pid] = values.get(pid, 0.0) + v
+    return values
+
+
+class TradeEngine:
+    """Vectorized trade scoring over a fixed player pool.
+
+    Each player has a value and a position; each team has a roster limit
+    and a positional-need vector (how much a player at each position is
+    worth to it on top of his value). Every candidate package pair
+    between two teams is scored at once as an (n_a x n_b) matrix:
+
+        gain_a = value(gets) - value(gives) + need_a . (pos(gets) - pos(gives))
+        score  = min(gain_a, gain_b)
+
+    so the best trades are the ones both sides like. Pairs that push
+    either roster past its limit score -inf.
+    """
+
+    def __init__(self, player_ids, team_ids, values, positions, roster_limit=40, needs=None):
+        self.player_ids = np.asarray(player_ids, np.int64)
+        self.team_ids = np.asarray(team_ids, np.int64)
+        n = len(self.player_ids)
+        # Index n is padding for short packages: no value, no position
+        self.values = np.append(np.asarray(values, np.float64), 0.0)
+        codes = np.array([POSITION_CODES.get(p, POSITION_CODES["DH"]) for p in positions])
+        self.onehot = np.zeros((n + 1, len(POSITIONS)))
+        self.onehot[np.arange(n), codes] = 1.0
+        self.roster_limit = roster_limit
+        self.roster_sizes = {int(t): int(c) for t, c in
+                             zip(*np.unique(self.team_ids, return_counts=True))}
+        self.needs = needs if needs is not None else self.positional_needs()
+        self.evaluated = 0
+
+    def positional_needs(self, weight=2.0):
+        """Default needs: `weight` runs per missing player below DEPTH_TARGETS."""
+        targets = np.array([DEPTH_TARGETS[p] for p in POSITIONS], np.float64)
+        needs = {}
+        for team_id in self.roster_sizes:
+            depth = self.onehot[:-1][self.team_ids == team_id].sum(axis=0)
+            needs[team_id] = weight * np.clip(targets - depth, 0, None) / targets
+        return needs
+
+    def packages(self, team_id, max_size=2, top_n=15):
+        """Index matrix of every package of up to `max_size` of a team's top players."""
+        members = np.flatnonzero(self.team_ids == team_id)
+        members = members[np.argsort(-self.values[members], kind="stable")][:top_n]
+        pad = len(self.player_ids)
+        rows = [combo + (pad,) * (max_size - size)
+                for size in range(1, max_size + 1)
+                for combo in itertools.combinations(members.tolist(), size)]
+        return np.array(rows, np.int64).reshape(-1, max_size)
+
+    def score(self, team_a, team_b, packages_a, packages_b):
+        """Return (score, gain_a, gain_b), each shaped (len(packages_a), len(packages_b))."""
+        pad = len(self.player_ids)
+        value_a = self.values[packages_a].sum(axis=1)
+        value_b = self.values[packages_b].sum(axis=1)
+        pos_a = self.onehot[packages_a].sum(axis=1)
+        pos_b = self.onehot[packages_b].sum(axis=1)
+        need_a, need_b = self.needs[team_a], self.needs[team_b]
+
+        gain_a = (value_b[None, :] - value_a[:, None]
+                  + (pos_b @ need_a)[None, :] - (pos_a @ need_a)[:, None])
+        gain_b = (value_a[:, None] - value_b[None, :]
+                  + (pos_a @ need_b)[:, None] - (pos_b @ need_b)[None, :])
+        score = np.minimum(gain_a, gain_b)
+
+        size_a = (packages_a != pad).sum(axis=1)
+        size_b = (packages_b != pad).sum(axis=1)
+        delta = size_b[None, :] - size_a[:, None]
+        fits = ((self.roster_sizes[team_a] + delta <= self.roster_limit)
+                & (self.roster_sizes[team_b] - delta <= self.roster_limit))
+        score = np.where(fits, score, -np.inf)
+        self.evaluated += score.size
+        return score, gain_a, gain_b
+
+    def _trades(self, team_a, team_b, packages_a, packages_b, n):
+        score, gain_a, gain_b = self.score(team_a, team_b, packages_a, packages_b)
+        flat = score.ravel()
+        n = min(n, int(np.isfinite(flat).sum()))
+        if n <= 0:
+            return []
+        best = np.argpartition(-flat, n - 1)[:n]
+        best = best[np.argsort(-flat[best], kind="stable")]
+        pad = len(self.player_ids)
+        trades = []
+        for i, j in zip(*np.unravel_index(best, score.shape)):
+            trades.append(Trade(
+                team_a, tuple(int(self.player_ids[p]) for p in packages_a[i] if p != pad),
+                team_b, tuple(int(self.player_ids[p]) for p in packages_b[j] if p != pad),
+                float(score[i, j]), float(gain_a[i, j]), float(gain_b[i, j])))
+        return trades
+
+    def best_trades(self, team_a, team_b, n=10, max_size=2, top_n=15):
+        """The `n` best trades between two teams, best first."""
+        return self._trades(team_a, team_b, self.packages(team_a, max_size, top_n),
+                            self.packages(team_b, max_size, top_n), n)
+
+    def best_trades_for(self, team_id, n=10, partners=None, max_size=2, top_n=15,
+                        min_score=0.0):
+        """Yield the `n` best trades for one team across all partners, best first."""
+        own = self.packages(team_id, max_size, top_n)
+        partners = partners if partners is not None else [t for t in self.roster_sizes
+                                                           if t != team_id]
+        heap = []
+        for partner in partners:
+            for trade in self._trades(team_id, partner, own,
+                                      self.packages(partner, max_size, top_n), n):
+                if trade.score < min_score:
+                    break
+                item = (trade.score, trade.team_b, trade.gives, trade.gets, trade)
+                if len(heap) < n:
+                    heapq.heappush(heap, item)
+                elif item > heap[0]:
+                    heapq.heapreplace(heap, item)
+        for item in sorted(heap, reverse=True):
+            yield item[-1]
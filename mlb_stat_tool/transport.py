@@ -0,0 +1,86 @@
+"""
+Transport Installation
+Swaps the function statsapi uses for every HTTP call
+
+statsapi's helpers (player_stat_data, roster, lookup_player, ...) all call
+the module-level statsapi.get, so replacing that one attribute routes
+every entry point through a wrapper such as a recorder or rate limiter.
+Wrappers must capture the get they wrap when they are created.
+
+The cache, single-flight, validation and instrumentation wrappers are
+installed as layers instead (add_layer), which keeps them stacked in
+LAYERS order however many times and in whatever order they are installed.
+"""
+
+import weakref
+from contextlib import contextmanager
+
+import statsapi
+
+ORIGINAL_GET = statsapi.get
+
+# Wrapper layers, innermost first
+LAYERS = ("cache", "singleflight", "capabilities", "instrument")
+
+# wrapper -> (layer, function rebuilding it around another function)
+_layered = weakref.WeakKeyDictionary()
+
+
+def install(get):
+    """Make `get` the function statsapi uses; return the one it replaced."""
+    previous = statsapi.get
+    statsapi.get = get
+    return previous
+
+
+def restore(previous=None):
+    """Put back `previous`, or the library's own get."""
+    statsapi.get = previous or ORIGINAL_GET
+
+
+@contextmanager
+def using(get):
+    """Route statsapi through `get` for the duration of a with block."""
+    previous = install(get)
+    try:
+        yield get
+    finally:
+        restore(previous)
+
+
+def _unstack(func):
+    """Split a statsapi function into the function under its layers and {layer: rewrap}."""
+    layers = {}
+    while func in _layered:
+        layer, rewrap = _layered[func]
+        layers.setdefault(layer, rewrap)
+        func = func.__wrapped__
+    return func, layers
+
+
+def underlying(func):
+    """The function under `func`'s layers, or `func` itself if it has none."""
+    return _unstack(func)[0]
+
+
+def _stack(func, layers):
+    for layer in LAYERS:
+        if layer in layers:
+            rewrap = layers[layer]
+            func = rewrap(func)
+            _layered[func] = (layer, rewrap)
+    return func
+
+
+def add_layer(name, layer, rewrap):
+    """Wrap statsapi.`name` as `layer` with `rewrap(func)`, replacing any earlier one."""
+    base, layers = _unstack(getattr(statsapi, name))
+    layers[layer] = rewrap
+    setattr(statsapi, name, _stack(base, layers))
+
+
+def remove_layer(name, layer):
+    """Take `layer` off statsapi.`name`, leaving its other layers in place."""
+    base, layers = _unstack(getattr(statsapi, name))
+    layers.pop(layer, None)
+    setattr(statsapi, name, _stack(base, layers))
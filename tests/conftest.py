@@ -0,0 +1,16 @@
+import pytest
+
+from mlb_stat_tool.bulk import bulk_player_stat_data
+from mlb_stat_tool.fake import FakeStatsAPI
+from mlb_stat_tool.store import StatStore
+
+
+@pytest.fixture(scope="session")
+def league_store():
+    """A small MLB + Triple-A league, built once and shared (tests only read it)."""
+    api = FakeStatsAPI(mlb_teams=4, milb_teams=4, roster_size=10)
+    ids = sorted(api.team_of)
+    players = bulk_player_stat_data(ids, get=api)
+    for pid, record in bulk_player_stat_data(ids, sport_id=11, get=api).items():
+        players[pid]["stats"] += record["stats"]
+    return StatStore.from_players(players.values())
@@ -0,0 +1,122 @@
+import asyncio
+
+import pytest
+import requests
+import statsapi
+
+from mlb_stat_tool import transport
+from mlb_stat_tool.aio import AsyncStatsAPI, _read_chunked
+from mlb_stat_tool.fake import FakeStatsAPI, FakeStatsServer
+
+
+def serve(coroutine_function, chunked=False, coalesce=True, redirects=None, **api_kwargs):
+    """Run `coroutine_function(api, server)` against a FakeStatsServer."""
+    async def main():
+        server = FakeStatsServer(FakeStatsAPI(mlb_teams=4, milb_teams=4, roster_size=5,
+                                              **api_kwargs), chunked=chunked, redirects=redirects)
+        base_url = await server.start()
+        try:
+            async with AsyncStatsAPI(max_concurrency=4, base_url=base_url,
+                                     coalesce=coalesce) as api:
+                return await coroutine_function(api, server)
+        finally:
+            await server.stop()
+
+    return asyncio.run(main())
+
+
+CALLS = [
+    ("roster", (100,), {}),
+    ("standings", (), {}),
+    ("standings_data", (), {"division": "all", "include_wildcard": False}),
+    ("team_leaders", (101, "homeRuns"), {}),
+    ("team_leader_data", (101, "homeRuns"), {}),
+    ("league_leaders", ("homeRuns",), {"season": 2024}),
+    ("league_leader_data", ("homeRuns",), {"statGroup": "batting", "sportId": 11}),
+    ("player_stat_data", (10002,), {"type": "career"}),
+    ("player_stat_data", (10002,), {"group": "[hitting]", "season": 2024}),
+    ("lookup_player", ("Player 10003",), {}),
+]
+
+
+@pytest.mark.parametrize("name, args, kwargs", CALLS, ids=[c[0] for c in CALLS])
+def test_results_match_the_sync_library(name, args, kwargs):
+    fake = FakeStatsAPI(mlb_teams=4, milb_teams=4, roster_size=5)
+
+    async def check(api, server):
+        return await getattr(api, name)(*args, **kwargs)
+
+    asynchronous = serve(check)
+    with transport.using(fake):
+        synchronous = getattr(statsapi, name)(*args, **kwargs)
+    assert asynchronous == synchronous
+
+
+def test_lookup_player_awaits_both_of_its_requests():
+    async def check(api, server):
+        return await api.lookup_player("Player 10003")
+
+    assert [p["id"] for p in serve(check)] == [10003]
+
+
+@pytest.mark.parametrize("chunked", [False, True])
+def test_gathered_lookups_share_pooled_connections(chunked):
+    async def check(api, server):
+        rosters = await asyncio.gather(*(api.roster_data(team_id)
+                                         for team_id in (100, 101, 102, 103) * 10))
+        return rosters, api.client.connections_opened, server.requests
+
+    rosters, opened, requests_served = serve(check, chunked=chunked, coalesce=False)
+    assert [r.team_id for r in rosters[:4]] == [100, 101, 102, 103]
+    assert [e.player_id for e in rosters[0]] == [10000 + i for i in range(5)]
+    assert requests_served == 40
+    assert opened <= 4
+
+
+def test_relative_and_absolute_redirects_are_followed():
+    async def check(api, server):
+        server.redirects["/api/v1/teams/102/roster"] = api.base_url + "v1/teams/103/roster"
+        return await api.roster_data(100), await api.roster_data(102), api.client.requests
+
+    moved, absolute, requests_made = serve(check, redirects={
+        "/api/v1/teams/100/roster": "/api/v1/teams/101/roster"})
+    assert [e.player_id for e in moved] == [10100 + i for i in range(5)]
+    assert [e.player_id for e in absolute] == [10300 + i for i in range(5)]
+    assert requests_made == 4
+
+
+def test_redirect_loops_stop():
+    async def check(api, server):
+        await api.get("teams", {})
+
+    with pytest.raises(requests.TooManyRedirects):
+        serve(check, redirects={"/api/v1/teams": "/api/v1/teams"})
+
+
+def test_http_errors_raise_like_statsapi():
+    async def check(api, server):
+        await api.get("person", {"personId": 1})
+
+    with pytest.raises(requests.HTTPError) as error:
+        serve(check)
+    assert error.value.response.status_code == 404
+
+
+@pytest.mark.parametrize("data, expected", [
+    (b"3;ext=1\r\nabc\r\n2\r\nde\r\n0\r\nX-Trailer: 1\r\n\r\n", b"abcde"),
+    (b"3\r\nabcde\r\n0\r\n\r\n", requests.exceptions.ChunkedEncodingError),
+    (b"zz\r\nabc\r\n0\r\n\r\n", requests.exceptions.ChunkedEncodingError),
+    (b"3\r\nabc\r\n", asyncio.IncompleteReadError),
+])
+def test_chunked_bodies_are_framed_strictly(data, expected):
+    async def read():
+        reader = asyncio.StreamReader()
+        reader.feed_data(data)
+        reader.feed_eof()
+        return await _read_chunked(reader)
+
+    if isinstance(expected, bytes):
+        assert asyncio.run(read()) == expected
+    else:
+        with pytest.raises(expected):
+            asyncio.run(read())
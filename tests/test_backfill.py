@@ -0,0 +1,45 @@
+import pytest
+
+from mlb_stat_tool.backfill import Backfill, load_partitions
+from mlb_stat_tool.fake import FakeStatsAPI
+
+
+class Interrupt(Exception):
+    pass
+
+
+def interrupted_after(get, people_calls):
+    def wrapped(endpoint, params):
+        if endpoint == "people":
+            wrapped.people += 1
+            if wrapped.people > people_calls:
+                raise Interrupt()
+        return get(endpoint, params)
+    wrapped.people = 0
+    return wrapped
+
+
+def test_backfill_resumes_from_checkpoint(tmp_path):
+    api = FakeStatsAPI(mlb_teams=2, milb_teams=2, roster_size=5, season=2023)
+    root = str(tmp_path)
+
+    # 20 players in batches of 4 = 5 batches; each batch makes one people call per sport
+    first = Backfill(root, [2023], chunk_size=4, workers=2, game_logs=False,
+                     get=interrupted_after(api, 4))
+    with pytest.raises(Interrupt):
+        first.run()
+    assert 0 < len(first.state["done"]) < 5
+
+    calls_before = api.calls
+    resumed = Backfill(root, [2023], chunk_size=4, workers=2, game_logs=False, get=api)
+    assert resumed.run() == 5 - len(first.state["done"])
+    assert sorted(resumed.state["done"]) == [0, 1, 2, 3, 4]
+    # No re-crawl on resume: one people call per sport for each remaining batch
+    assert api.calls - calls_before == 2 * (5 - len(first.state["done"]))
+
+    hitting = load_partitions(root, "hitting")
+    pitching = load_partitions(root, "pitching")
+    fielding = load_partitions(root, "fielding", seasons={2023})
+    assert len(set(hitting["player_id"].tolist()) | set(pitching["player_id"].tolist())) == 20
+    assert len(fielding) == 20
+    assert set(fielding["season"].tolist()) == {2023}
@@ -0,0 +1,43 @@
+from mlb_stat_tool.bench import compare, percentile, run_benchmarks
+
+
+def test_percentile_uses_nearest_rank():
+    values = [float(i) for i in range(1, 101)]
+    assert percentile(values, 0.50) == 50.0
+    assert percentile(values, 0.99) == 99.0
+    assert percentile([], 0.5) == 0.0
+
+
+def test_small_run_reports_every_scenario():
+    results = run_benchmarks(mlb_teams=2, milb_teams=3, roster_size=4, stat_players=2)
+    crawl = results["scenarios"]["roster_crawl"]
+    assert (crawl["requests"], crawl["players"]) == (2 + 5, 20)
+    assert results["scenarios"]["per_player_stats"]["requests"] == 2 * 6
+    assert results["scenarios"]["bulk_stats"]["players"] == 20
+    assert all(m["bytes_decoded"] > 0 for m in results["scenarios"].values())
+    assert results["peak_rss_bytes"] > 0
+    assert all(m["decode_seconds"] > 0 for m in results["scenarios"].values())
+
+
+def test_peak_memory_is_measured_per_scenario():
+    scenarios = run_benchmarks(mlb_teams=4, milb_teams=8, roster_size=20,
+                               stat_players=1)["scenarios"]
+    # A later, smaller scenario does not inherit the bulk pull's high-water mark
+    assert 0 < scenarios["leaders_and_standings"]["peak_alloc_bytes"] \
+        < scenarios["bulk_stats"]["peak_alloc_bytes"]
+    assert run_benchmarks(mlb_teams=1, milb_teams=0, roster_size=1, stat_players=1,
+                          trace_memory=False)["scenarios"]["bulk_stats"]["peak_alloc_bytes"] is None
+
+
+def test_compare_flags_only_regressions():
+    before = {"scenarios": {"crawl": {"seconds": 1.0, "requests_per_sec": 100.0}}}
+    after = {"scenarios": {"crawl": {"seconds": 0.5, "requests_per_sec": 50.0}}}
+    assert compare(after, before) == [("crawl", "requests_per_sec", 100.0, 50.0)]
+
+
+def test_compare_checks_process_peak_rss():
+    before = {"scenarios": {}, "peak_rss_bytes": 100_000_000}
+    assert compare({"scenarios": {}, "peak_rss_bytes": 105_000_000}, before) == []
+    assert compare({"scenarios": {}, "peak_rss_bytes": 120_000_000}, before) == [
+        ("process", "peak_rss_bytes", 100_000_000, 120_000_000)]
+    assert compare({"scenarios": {}, "peak_rss_bytes": 120_000_000}, {"scenarios": {}}) == []
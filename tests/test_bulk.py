@@ -0,0 +1,45 @@
+from mlb_stat_tool.bulk import bulk_player_stat_data, stats_hydrate
+
+
+def fake_people(calls):
+    def get(endpoint, params):
+        calls.append((endpoint, params))
+        ids = [int(i) for i in params["personIds"].split(",")]
+        return {"people": [{
+            "id": i,
+            "useName": "Player",
+            "lastName": str(i),
+            "active": True,
+            "currentTeam": {"id": 445, "name": "Columbus Clippers"},
+            "primaryPosition": {"abbreviation": "P"},
+            "batSide": {"description": "Right"},
+            "pitchHand": {"description": "Right"},
+            "stats": [{
+                "type": {"displayName": "career"},
+                "group": {"displayName": "pitching"},
+                "splits": [{"stat": {"era": "3.50"}, "sport": {"id": 11}}],
+            }],
+        } for i in ids if i != 404]}
+    return get
+
+
+def test_stats_hydrate_accepts_bracketed_and_list_forms():
+    assert stats_hydrate("[hitting,pitching]", ["career"]) == \
+        "stats(group=[hitting,pitching],type=[career],sportId=1),currentTeam"
+
+
+def test_bulk_fetch_chunks_requests_and_merges_players():
+    calls = []
+    players = bulk_player_stat_data(range(1, 121), chunk_size=50, get=fake_people(calls))
+    assert len(calls) == 3
+    assert calls[0][0] == "people"
+    assert len(players) == 120
+    stat = players[7]["stats"][0]
+    assert (stat["group"], stat["team_id"], stat["sport_id"]) == ("pitching", 445, 11)
+
+
+def test_bulk_fetch_skips_unknown_and_duplicate_ids():
+    calls = []
+    players = bulk_player_stat_data([1, 1, 404, 2], get=fake_people(calls))
+    assert sorted(players) == [1, 2]
+    assert calls[0][1]["personIds"] == "1,404,2"
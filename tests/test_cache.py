@@ -0,0 +1,86 @@
+import time
+
+import statsapi
+
+from mlb_stat_tool import instrument
+from mlb_stat_tool.cache import DAY, HOUR, ResponseCache, default_ttl, install, uninstall
+
+
+def stat_data(personId, group="[hitting]", type="season"):
+    stat_data.calls += 1
+    return {"id": personId, "group": group, "type": type}
+
+
+def test_wrap_reuses_results_across_spellings(tmp_path):
+    stat_data.calls = 0
+    cache = ResponseCache(str(tmp_path / "c.sqlite"))
+    cached = cache.wrap(stat_data)
+    first = cached(592885, group="[hitting]", type="career")
+    second = cached(592885, "[hitting]", "career")
+    assert first == second
+    assert stat_data.calls == 1
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_cache_survives_reopen(tmp_path):
+    path = str(tmp_path / "c.sqlite")
+    ResponseCache(path).set("k", {"a": 1}, 60)
+    assert ResponseCache(path).get("k") == (True, {"a": 1})
+
+
+def test_expired_entries_miss():
+    cache = ResponseCache(":memory:")
+    cache.set("k", [1], -1)
+    assert cache.get("k") == (False, None)
+
+
+def test_eviction_drops_least_recently_used():
+    cache = ResponseCache(":memory:", max_bytes=30)
+    cache.set("old", "x" * 10, 60)
+    time.sleep(0.01)
+    cache.set("new", "y" * 10, 60)
+    time.sleep(0.01)
+    cache.get("old")
+    cache.set("newest", "z" * 10, 60)
+    assert cache.get("new") == (False, None)
+    assert cache.get("old")[0] and cache.get("newest")[0]
+
+
+def test_career_stats_live_longer_than_season_stats():
+    assert default_ttl("player_stat_data", {"type": "career"}) >= DAY
+    assert default_ttl("player_stat_data", {"type": "season"}) <= 6 * HOUR
+
+
+def test_hits_do_not_write_until_the_next_set():
+    cache = ResponseCache(":memory:")
+    cache.set("k", [1], 60)
+    changes = cache._db.total_changes
+    for _ in range(5):
+        assert cache.get("k") == (True, [1])
+    assert cache._db.total_changes == changes
+
+
+def test_install_stacks_layers_in_a_fixed_order(monkeypatch):
+    def roster(teamId):
+        roster.calls += 1
+        return f"roster {teamId}"
+
+    roster.calls = 0
+    monkeypatch.setattr(statsapi, "roster", roster)
+    monkeypatch.setattr(statsapi, "get", statsapi.get)
+    first, second = ResponseCache(":memory:"), ResponseCache(":memory:")
+    # Instrumentation first, then the cache twice: the second cache replaces
+    # the first and still sits underneath the instrumentation
+    metrics = instrument.install(names=["roster"])
+    install(first, ["roster"])
+    install(second, ["roster"])
+    statsapi.roster(100)
+    statsapi.roster(100)
+    assert roster.calls == 1
+    assert metrics.calls["roster"] == 2
+    assert (second.hits, second.misses) == (1, 1)
+    assert (first.hits, first.misses) == (0, 0)
+
+    instrument.uninstall(metrics, ["roster"])
+    uninstall(["roster"])
+    assert statsapi.roster is roster
@@ -0,0 +1,80 @@
+import inspect
+
+import pytest
+import statsapi
+
+from mlb_stat_tool import capabilities, transport
+from mlb_stat_tool.capabilities import Capabilities, InvalidParameter
+from mlb_stat_tool.fake import FakeStatsAPI
+
+
+@pytest.fixture
+def fake():
+    return FakeStatsAPI(mlb_teams=2, milb_teams=2, roster_size=3)
+
+
+def test_load_probes_once_then_reads_the_saved_matrix(fake, tmp_path):
+    path = str(tmp_path / "capabilities.json")
+    first = Capabilities.load(path, get=fake)
+    assert fake.calls == len(capabilities.META_TYPES) + 1
+    second = Capabilities.load(path, get=fake)
+    assert fake.calls == len(capabilities.META_TYPES) + 1
+    assert second.values == first.values and second.sports == first.sports
+
+    Capabilities.load(path, max_age=0, get=fake)
+    assert fake.calls == 2 * (len(capabilities.META_TYPES) + 1)
+
+
+def test_equivalent_spellings_normalize_to_the_api_form(fake):
+    caps = Capabilities.probe(fake)
+    for group in ("hitting", "[hitting]", "Hitting", "[Hitting]"):
+        assert caps.validate("player_stat_data", {"group": group})["group"] == "[hitting]"
+    assert caps.validate("player_stat_data", {"group": "baserunning",
+                                              "type": "yearbyyear"}) == {
+        "group": "[running]", "type": "[yearByYear]"}
+    assert caps.validate("league_leaders", {"leaderCategories": "HOMERUNS",
+                                            "sportId": 11})["leaderCategories"] == "homeRuns"
+
+
+@pytest.mark.parametrize("name, arguments", [
+    ("player_stat_data", {"group": "[hittin]"}),
+    ("player_stat_data", {"type": "vsPlayer"}),
+    ("player_stat_data", {"sportId": 99}),
+    ("team_leaders", {"leaderCategories": "homeRuns,dingers"}),
+    ("roster", {"rosterType": "bench"}),
+])
+def test_invalid_arguments_fail_without_a_request(fake, name, arguments):
+    caps = Capabilities.probe(fake)
+    calls = fake.calls
+    with pytest.raises(InvalidParameter):
+        caps.validate(name, arguments)
+    assert fake.calls == calls
+
+
+def test_install_validates_statsapi_calls(fake):
+    caps = Capabilities.probe(fake)
+    capabilities.install(caps)
+    try:
+        with transport.using(fake):
+            with pytest.raises(InvalidParameter, match="valid: hitting, pitching"):
+                statsapi.player_stat_data(10001, group="hiting")
+            calls = fake.calls
+            data = statsapi.player_stat_data(10001, group="Hitting", type="CAREER")
+            assert fake.calls == calls + 1
+            assert data["id"] == 10001
+    finally:
+        capabilities.uninstall()
+    assert not hasattr(statsapi.player_stat_data, "__wrapped__")
+
+
+def test_calls_that_do_not_bind_pass_through_unchanged(fake):
+    caps = Capabilities.probe(fake)
+
+    def player_stat_data(*args, **kwargs):
+        return args, kwargs
+
+    # A signature narrower than what the function accepts, as a decorator might report
+    player_stat_data.__signature__ = inspect.signature(lambda personId, group=None: None)
+    wrapped = caps.wrap(player_stat_data)
+    assert wrapped(10001, "Hitting", 3) == ((10001, "Hitting", 3), {})
+    assert wrapped(10001, group="Hitting") == ((10001, "[hitting]"), {})
@@ -0,0 +1,64 @@
+import threading
+import time
+
+from mlb_stat_tool.crawl import crawl_rosters, list_teams
+
+
+class FakeStatsAPI:
+    """Stands in for statsapi.get with canned teams and rosters"""
+
+    def __init__(self, teams_per_sport=5, roster_size=3, delay=0.0, broken=()):
+        self.teams_per_sport = teams_per_sport
+        self.roster_size = roster_size
+        self.delay = delay
+        self.broken = set(broken)
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+
+    def __call__(self, endpoint, params):
+        if endpoint == "teams":
+            base = params["sportId"] * 1000
+            return {"teams": [{"id": base + i, "name": f"Team {base + i}"}
+                              for i in range(self.teams_per_sport)]}
+        with self.lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            time.sleep(self.delay)
+            team_id = params["teamId"]
+            if team_id in self.broken:
+                raise RuntimeError("boom")
+            return {"roster": [{"person": {"id": team_id * 100 + i,
+                                           "fullName": f"Player {team_id * 100 + i}"}}
+                               for i in range(self.roster_size)]}
+        finally:
+            with self.lock:
+                self.in_flight -= 1
+
+
+def test_crawl_yields_every_player():
+    fake = FakeStatsAPI()
+    records = list(crawl_rosters([1, 11], get=fake, max_workers=4))
+    assert len(records) == 2 * 5 * 3
+    assert (1000, 100000, "Player 100000") in records
+
+
+def test_crawl_bounds_in_flight_requests():
+    fake = FakeStatsAPI(teams_per_sport=20, delay=0.01)
+    list(crawl_rosters([1], get=fake, max_workers=3))
+    assert 1 < fake.max_in_flight <= 3
+
+
+def test_crawl_reports_failed_rosters_and_continues():
+    fake = FakeStatsAPI(broken={1002})
+    failed = []
+    records = list(crawl_rosters([1], get=fake,
+                                 on_error=lambda team, e: failed.append(team["id"])))
+    assert failed == [1002]
+    assert len(records) == 4 * 3
+
+
+def test_list_teams_covers_each_sport():
+    teams = list_teams([1, 11], get=FakeStatsAPI(teams_per_sport=2))
+    assert [t["id"] for t in teams] == [1000, 1001, 11000, 11001]
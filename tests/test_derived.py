@@ -0,0 +1,145 @@
+import numpy as np
+import pytest
+
+from mlb_stat_tool.derived import (derive, league_constants, load_constants, save_constants,
+                                   translation_factors, TRANSLATION)
+from mlb_stat_tool.store import StatStore, StatTable, TYPE_CODES
+
+
+@pytest.fixture
+def store(league_store):
+    return league_store
+
+
+def test_league_average_hitter_and_pitcher_score_100(store):
+    metrics = derive(store)
+    hitting, pitching = metrics["hitting"], metrics["pitching"]
+    for sport_id in (1, 11):
+        h = hitting.filter(hitting["sport_id"] == sport_id)
+        pa = store["hitting"].filter((store["hitting"]["sport_id"] == sport_id)
+                                     & (store["hitting"]["type"] == TYPE_CODES["season"]))
+        pa = pa["plateAppearances"]
+        assert np.average(h["wrc_plus"], weights=pa) == pytest.approx(100)
+        assert abs(np.sum(h["wraa"])) < 1e-6
+
+        p = pitching.filter(pitching["sport_id"] == sport_id)
+        outs = store["pitching"].filter((store["pitching"]["sport_id"] == sport_id)
+                                        & (store["pitching"]["type"] == TYPE_CODES["season"]))
+        assert np.average(p["fip_minus"], weights=outs["outs"]) == pytest.approx(100)
+
+
+def test_rate_stats_match_their_definitions(store):
+    hitting = derive(store)["hitting"]
+    raw = store["hitting"].filter(store["hitting"]["type"] == TYPE_CODES["season"])
+    iso = (raw["doubles"] + 2 * raw["triples"] + 3 * raw["homeRuns"]) / raw["atBats"]
+    np.testing.assert_allclose(hitting["iso"], iso)
+    np.testing.assert_allclose(hitting["k_minus_bb"],
+                               (raw["strikeOuts"] - raw["baseOnBalls"]) / raw["plateAppearances"])
+    milb = hitting["sport_id"] == 11
+    np.testing.assert_allclose(hitting["woba_mlb"][milb], hitting["woba"][milb] * TRANSLATION[11])
+
+
+def test_hitter_friendly_parks_lower_wrc_plus(store):
+    neutral = derive(store)["hitting"]
+    team = int(neutral["team_id"][0])
+    adjusted = derive(store, park_factors={team: 1.1})["hitting"]
+    at_team = neutral["team_id"] == team
+    assert np.all(adjusted["wrc_plus"][at_team] < neutral["wrc_plus"][at_team])
+    np.testing.assert_allclose(adjusted["wrc_plus"][~at_team], neutral["wrc_plus"][~at_team])
+
+
+def test_constants_round_trip_through_a_local_file(store, tmp_path):
+    constants = league_constants(store)
+    path = str(tmp_path / "constants.json")
+    save_constants(constants, path)
+    assert load_constants(path) == constants
+    cached = derive(store, constants=load_constants(path))["hitting"]
+    np.testing.assert_allclose(cached["woba"], derive(store)["hitting"]["woba"])
+
+
+def synthetic_store(players, seasons=(2023, 2024), sport_ids=(1, 11, 12, 13, 14, 16), seed=0):
+    rng = np.random.default_rng(seed)
+    n = players * len(seasons)
+    pa = rng.integers(50, 700, n).astype(float)
+    bb, hbp, sf = (np.floor(pa * rng.uniform(0, high, n)) for high in (0.12, 0.02, 0.01))
+    ab = pa - bb - hbp - sf
+    hits = np.floor(ab * rng.uniform(0.18, 0.32, n))
+    hr = np.floor(hits * rng.uniform(0.03, 0.2, n))
+    doubles = np.floor((hits - hr) * 0.2)
+    columns = {
+        "player_id": np.repeat(np.arange(players, dtype=np.int32), len(seasons)),
+        "season": np.tile(np.array(seasons, np.int32), players),
+        "team_id": rng.integers(100, 400, n).astype(np.int32),
+        "sport_id": rng.choice(np.array(sport_ids, np.int32), n),
+        "type": np.full(n, TYPE_CODES["season"], np.int8),
+        "game_pk": np.zeros(n, np.int32), "age": np.full(n, np.nan, np.float32),
+        "plateAppearances": pa, "atBats": ab, "hits": hits, "doubles": doubles,
+        "triples": np.zeros(n), "homeRuns": hr, "baseOnBalls": bb, "hitByPitch": hbp,
+        "sacFlies": sf, "strikeOuts": np.floor(pa * 0.22),
+    }
+    return columns
+
+
+def test_translation_factors_come_from_players_seen_at_both_levels():
+    columns = synthetic_store(200, seasons=(2024,), sport_ids=(1,))
+    mlb = StatTable(columns, "hitting")
+    # The same players again at Triple-A, hitting 20% more productively
+    aaa = dict(columns, sport_id=np.full(len(mlb), 11, np.int32))
+    for name in ("hits", "doubles", "homeRuns"):
+        aaa[name] = columns[name] * 1.2
+    aaa["atBats"] = columns["atBats"]
+    merged = StatTable({k: np.concatenate([columns[k], aaa[k]]) for k in columns}, "hitting")
+    factors = translation_factors(StatStore({"hitting": merged}))
+    assert 0.8 < factors[11] < 0.9
+    assert factors[12] == TRANSLATION[12]
+
+
+def paired_pitchers(players, level_era_ratio, seed=0):
+    """Pitchers with an MLB and a Triple-A line in 2024, and Double-A pitchers with no pair."""
+    rng = np.random.default_rng(seed)
+    outs = rng.integers(60, 600, players).astype(float)
+    earned = np.floor(outs / 27 * rng.uniform(3, 5, players))
+    columns = {
+        "player_id": np.tile(np.arange(players, dtype=np.int32), 3),
+        "season": np.full(3 * players, 2024, np.int32),
+        "team_id": np.full(3 * players, 100, np.int32),
+        "sport_id": np.repeat(np.array([1, 11, 12], np.int32), players),
+        "type": np.full(3 * players, TYPE_CODES["season"], np.int8),
+        "game_pk": np.zeros(3 * players, np.int32),
+        "age": np.full(3 * players, np.nan, np.float32),
+        "outs": np.tile(outs, 3),
+        "earnedRuns": np.concatenate([earned, earned * level_era_ratio, earned]),
+        "battersFaced": np.tile(outs * 1.4, 3), "homeRuns": np.tile(np.floor(outs / 30), 3),
+        "baseOnBalls": np.tile(np.floor(outs / 9), 3), "hitByPitch": np.zeros(3 * players),
+        "strikeOuts": np.tile(np.floor(outs / 4), 3),
+    }
+    # The Double-A pitchers are different people, so that level has no pairs
+    columns["player_id"][2 * players:] += players
+    return StatStore({"pitching": StatTable(columns, "pitching")})
+
+
+def test_pitching_factors_come_from_paired_pitcher_lines():
+    # The same pitchers allow 30% fewer earned runs at Triple-A than in MLB
+    store = paired_pitchers(100, 0.7)
+    factors = translation_factors(store, group="pitching")
+    assert factors[11] == pytest.approx(0.7)
+    assert factors[12] == TRANSLATION[12]
+    assert translation_factors(store) == TRANSLATION
+
+    pitching = derive(store)["pitching"]
+    aaa = pitching["sport_id"] == 11
+    np.testing.assert_allclose(pitching["fip_mlb"][aaa], pitching["fip"][aaa] / factors[11])
+    aa = pitching["sport_id"] == 12
+    np.testing.assert_allclose(pitching["fip_mlb"][aa], pitching["fip"][aa] / TRANSLATION[12])
+
+
+def test_pitching_factors_fall_back_with_too_few_pairs():
+    factors = translation_factors(paired_pitchers(10, 0.7), group="pitching")
+    assert factors == TRANSLATION
+
+
+def test_full_population_recomputes_in_one_pass():
+    store = StatStore({"hitting": StatTable(synthetic_store(50_000), "hitting")})
+    metrics = derive(store)
+    assert len(metrics["hitting"]) == 100_000
+    assert np.isfinite(metrics["hitting"]["wrc_plus"]).all()
@@ -0,0 +1,43 @@
+from mlb_stat_tool.index import PlayerIndex, normalize_name
+
+PLAYERS = [
+    (592885, "Christian Yelich", 158),
+    (690440, "Bradley Hanner", 445),
+    (593160, "Whit Merrifield", 144),
+    (672515, "Gabriel Moreno", 109),
+    (665161, "Jeremy Peña", 117),
+    (500001, "J.D. Martinez", 121),
+    (500002, "Nick Martinez", 113),
+    (500003, "Seth Martinez", 117),
+    (500004, "Vladimir Guerrero Jr.", 141),
+]
+
+
+def test_normalize_name_strips_accents_punctuation_and_suffixes():
+    assert normalize_name("Jeremy Peña") == "jeremy pena"
+    assert normalize_name("Vladimir Guerrero Jr.") == "vladimir guerrero"
+    assert normalize_name("J.D. Martinez") == "j d martinez"
+
+
+def test_exact_and_id_lookup():
+    index = PlayerIndex(PLAYERS)
+    assert [p.player_id for p in index.resolve("bradley hanner")] == [690440]
+    assert index.get(592885).full_name == "Christian Yelich"
+
+
+def test_common_surname_returns_every_candidate():
+    index = PlayerIndex(PLAYERS)
+    assert {p.player_id for p in index.resolve("Martinez")} == {500001, 500002, 500003}
+    assert [p.player_id for p in index.resolve("Martinez", team_id=117)] == [500003]
+
+
+def test_prefix_and_fuzzy_fallbacks():
+    index = PlayerIndex(PLAYERS)
+    assert [p.player_id for p in index.resolve("Yel")] == [592885]
+    assert index.resolve("Cristian Yellich")[0].player_id == 592885
+
+
+def test_save_and_load_round_trip(tmp_path):
+    path = tmp_path / "players.json"
+    PlayerIndex(PLAYERS).save(path)
+    assert len(PlayerIndex.load(path).resolve("Martinez")) == 3
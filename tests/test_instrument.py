@@ -0,0 +1,133 @@
+import json
+import time
+
+import pytest
+import requests
+import statsapi
+
+from mlb_stat_tool import instrument
+from mlb_stat_tool.cache import ResponseCache
+from mlb_stat_tool.cache import install as install_cache
+from mlb_stat_tool.cache import uninstall as uninstall_cache
+from mlb_stat_tool.fake import FakeStatsAPI, FakeStatsServer
+from mlb_stat_tool.session import PooledSession
+from mlb_stat_tool.session import install as install_session
+from mlb_stat_tool.session import uninstall as uninstall_session
+
+
+class FakeClient:
+    """Answers statsapi's requests.get() from a FakeStatsAPI."""
+
+    def __init__(self):
+        self.server = FakeStatsServer(FakeStatsAPI(mlb_teams=2, milb_teams=0, roster_size=3))
+
+    def get(self, url, **kwargs):
+        endpoint, params = self.server.route(url.split("statsapi.mlb.com", 1)[1])
+        response = requests.Response()
+        response.status_code = 200
+        response._content = json.dumps(self.server.api(endpoint, params)).encode()
+        return response
+
+
+@pytest.fixture
+def client():
+    statsapi.requests = FakeClient()
+    yield statsapi.requests
+    statsapi.requests = requests
+
+
+def test_counts_latency_bytes_and_decode_time_per_endpoint(client):
+    metrics = instrument.install()
+    try:
+        statsapi.roster(100)
+        statsapi.roster(101)
+        statsapi.player_stat_data(10001, group="[hitting]", type="career")
+        with pytest.raises(ValueError):
+            statsapi.meta("notAType")
+    finally:
+        instrument.uninstall(metrics)
+    assert statsapi.requests is client and not hasattr(statsapi.get, "__wrapped__")
+
+    report = metrics.to_json()
+    assert report["functions"]["roster"]["calls"] == 2
+    assert report["endpoints"]["team_roster"]["requests"] == 2
+    assert report["endpoints"]["person"]["bytes"] > 0
+    assert report["endpoints"]["person"]["decode_seconds"] >= 0
+    assert report["errors"] == {"meta:ValueError": 1}
+    assert report["cache"] is None
+
+    text = metrics.to_prometheus()
+    assert 'mlb_stat_tool_calls_total{function="roster"} 2' in text
+    assert 'mlb_stat_tool_request_seconds_count{endpoint="team_roster"} 2' in text
+    assert 'mlb_stat_tool_call_seconds_bucket{function="roster",le="+Inf"} 2' in text
+
+
+def test_installing_twice_counts_each_request_once(client):
+    instrument.install()
+    metrics = instrument.install()
+    try:
+        statsapi.roster(100)
+    finally:
+        instrument.uninstall(metrics)
+    assert statsapi.requests is client and not hasattr(statsapi.roster, "__wrapped__")
+    assert metrics.to_json()["endpoints"]["team_roster"]["requests"] == 1
+    assert metrics.to_json()["functions"]["roster"]["calls"] == 1
+
+
+@pytest.mark.parametrize("session_first", [False, True])
+def test_session_and_instrument_install_in_either_order(client, session_first):
+    session = PooledSession()
+    if session_first:
+        install_session(session)
+    metrics = instrument.install()
+    if not session_first:
+        install_session(session)
+    try:
+        assert isinstance(statsapi.requests, instrument.InstrumentedClient)
+        assert statsapi.requests.target is session
+    finally:
+        uninstall_session()
+        instrument.uninstall(metrics)
+    assert statsapi.requests is requests
+
+
+def test_cache_hit_ratio_comes_from_the_response_cache(client):
+    cache = install_cache(ResponseCache(":memory:"), ["roster"])
+    metrics = instrument.install(cache=cache)
+    try:
+        for _ in range(4):
+            statsapi.roster(100)
+    finally:
+        instrument.uninstall(metrics)
+        uninstall_cache(["roster"])
+    assert metrics.to_json()["cache"] == {"hits": 3, "misses": 1, "hit_ratio": 0.75}
+    assert metrics.requests["team_roster"] == 1
+    assert "mlb_stat_tool_cache_hits_total 3" in metrics.to_prometheus()
+
+
+def busy_parse(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        sum(range(100))
+
+
+def test_sampler_profiles_named_stages():
+    metrics = instrument.Metrics()
+    metrics.sampler = instrument.Sampler(interval=0.001).start()
+    try:
+        with metrics.stage("parse"):
+            busy_parse(0.1)
+    finally:
+        metrics.sampler.stop()
+    assert metrics.stages["parse"].count == 1
+    assert any(frame.startswith("busy_parse") for frame, _ in metrics.sampler.top("parse"))
+
+
+def test_histogram_quantiles_use_bucket_bounds():
+    histogram = instrument.Histogram((0.1, 1.0))
+    for value in (0.05, 0.05, 0.5, 3.0):
+        histogram.observe(value)
+    assert histogram.quantile(0.5) == 0.1
+    assert histogram.quantile(0.75) == 1.0
+    assert histogram.quantile(1.0) == float("inf")
+    assert histogram.cumulative() == [(0.1, 2), (1.0, 3), (float("inf"), 4)]
@@ -0,0 +1,37 @@
+import numpy as np
+
+from mlb_stat_tool.leaders import leaderboards, top_k
+from mlb_stat_tool.store import StatTable, TYPE_CODES
+
+
+def hitting_table():
+    season = TYPE_CODES["season"]
+    return StatTable({
+        "player_id": np.array([1, 2, 3, 4, 5, 6], np.int32),
+        "season": np.full(6, 2024, np.int32),
+        "team_id": np.array([158, 158, 158, 445, 445, 445], np.int32),
+        "sport_id": np.array([1, 1, 1, 11, 11, 11], np.int32),
+        "type": np.array([season] * 5 + [TYPE_CODES["career"]], np.int8),
+        "homeRuns": np.array([30, 12, np.nan, 25, 8, 99]),
+        "strikeOuts": np.array([150, 60, 90, 120, 40, 10]),
+        "plateAppearances": np.array([600, 300, 50, 550, 200, 5000]),
+    }, "hitting")
+
+
+def test_top_k_ranks_season_rows_and_skips_missing_values():
+    leaders = top_k(hitting_table(), "homeRuns", k=3)
+    assert [(l.rank, l.player_id, l.value) for l in leaders] == \
+        [(1, 1, 30.0), (2, 4, 25.0), (3, 2, 12.0)]
+
+
+def test_top_k_filters_by_sport_and_qualification():
+    assert [l.player_id for l in top_k(hitting_table(), "homeRuns", sport_id=11)] == [4, 5]
+    assert [l.player_id for l in top_k(hitting_table(), "strikeOuts", qualified=True)] == \
+        [5, 2, 4, 1]
+
+
+def test_leaderboards_cover_every_team_in_one_pass():
+    boards = leaderboards(hitting_table(), ["homeRuns", "strikeOuts"], k=1)
+    assert sorted(boards) == [158, 445]
+    assert boards[158]["homeRuns"][0].player_id == 1
+    assert boards[445]["strikeOuts"][0].player_id == 5
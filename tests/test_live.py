@@ -0,0 +1,160 @@
+import asyncio
+import copy
+
+import pytest
+
+from mlb_stat_tool.live import GameFeed, LiveStream, PatchConflict, apply_patch, changed_players
+
+
+def player(pid, hits=0):
+    return {"person": {"id": pid, "fullName": f"Player {pid}"},
+            "stats": {"batting": {"hits": hits, "atBats": 0}, "pitching": {}, "fielding": {}}}
+
+
+class FakeGame:
+    """A live game whose feed changes through recorded JSON patches."""
+
+    def __init__(self, game_pk=745001, home=158, away=112):
+        self.game_pk = game_pk
+        self.state = "Live"
+        self.feed = {
+            "metaData": {"timeStamp": "20240601_230000"},
+            "gameData": {"status": {"abstractGameState": "Live"}},
+            "liveData": {"boxscore": {"teams": {
+                "home": {"team": {"id": home}, "players": {"ID592885": player(592885),
+                                                           "ID669203": player(669203)}},
+                "away": {"team": {"id": away}, "players": {"ID500001": player(500001)}},
+            }}},
+        }
+        self.timestamps = ["20240601_230000"]
+        self.patches = {}
+        self.calls = []
+        self.full_diff = False
+
+    def advance(self, timecode, operations):
+        self.patches[(self.timestamps[-1], timecode)] = operations
+        apply_patch(self.feed, operations)
+        self.feed["metaData"]["timeStamp"] = timecode
+        self.timestamps.append(timecode)
+
+    def __call__(self, endpoint, params={}, *args, **kwargs):
+        self.calls.append(endpoint)
+        self.params = params
+        if endpoint == "schedule":
+            return {"dates": [{"games": [{"gamePk": self.game_pk,
+                                          "status": {"abstractGameState": self.state}}]}]}
+        if endpoint == "game":
+            return copy.deepcopy(self.feed)
+        if endpoint == "game_timestamps":
+            return list(self.timestamps)
+        if endpoint == "game_diff":
+            if self.full_diff:
+                return copy.deepcopy(self.feed)
+            return [{"diff": copy.deepcopy(self.patches[(params["startTimecode"],
+                                                         params["endTimecode"])])}]
+        raise ValueError(endpoint)
+
+
+def hit(pid, hits):
+    return [{"op": "replace", "value": hits,
+             "path": f"/liveData/boxscore/teams/home/players/ID{pid}/stats/batting/hits"}]
+
+
+def test_only_diffs_are_fetched_and_only_changed_lines_published():
+    game = FakeGame()
+    stream = LiveStream(team_ids=[158], get=game)
+    published = []
+    stream.subscribe(published.append)
+
+    assert sorted(line.player_id for line in stream.poll()) == [592885, 669203]
+
+    game.advance("20240601_230100", hit(592885, 1))
+    game.calls.clear()
+    (line,) = stream.poll()
+    assert (line.player_id, line.batting["hits"], line.timecode) == (592885, 1, "20240601_230100")
+    assert game.calls == ["schedule", "game_timestamps", "game_diff"]
+
+    game.calls.clear()
+    assert stream.poll() == []
+    assert game.calls == ["schedule", "game_timestamps"]
+    assert len(published) == 3
+    assert stream.lines[592885].batting["hits"] == 1
+
+
+def test_finished_games_get_a_last_refresh_and_are_dropped():
+    game = FakeGame()
+    stream = LiveStream(team_ids=[158], get=game)
+    stream.poll()
+    game.advance("20240601_235900", hit(669203, 2))
+    game.state = "Final"
+    (line,) = stream.poll()
+    assert line.player_id == 669203
+    assert stream.feeds == {}
+
+
+def test_feed_reloads_when_the_api_sends_the_full_feed_or_a_patch_conflicts():
+    game = FakeGame()
+    feed = GameFeed(game.game_pk, game)
+    assert feed.refresh() is None and feed.full_fetches == 1
+
+    game.full_diff = True
+    game.advance("20240601_230100", hit(592885, 1))
+    assert feed.refresh() is None and feed.full_fetches == 2
+
+    game.full_diff = False
+    game.patches[("20240601_230100", "20240601_230200")] = [
+        {"op": "remove", "path": "/liveData/nothing"}]
+    game.timestamps.append("20240601_230200")
+    game.feed["metaData"]["timeStamp"] = "20240601_230200"
+    assert feed.refresh() is None and feed.full_fetches == 3
+    assert feed.timecode == "20240601_230200"
+
+
+def test_async_updates_yield_changed_lines():
+    game = FakeGame()
+    stream = LiveStream(player_ids=[500001], get=game, interval=0)
+
+    async def first_two():
+        lines = []
+        async for line in stream.updates():
+            lines.append(line)
+            if len(lines) == 1:
+                game.advance("20240601_230100", [{
+                    "op": "replace", "value": 3,
+                    "path": "/liveData/boxscore/teams/away/players/ID500001/stats/batting/hits"}])
+            else:
+                return lines
+
+    lines = asyncio.run(first_two())
+    assert [(l.player_id, l.batting["hits"]) for l in lines] == [(500001, 0), (500001, 3)]
+
+
+def test_apply_patch_follows_rfc_6902():
+    document = {"a/b": [1, 2], "c": {"d": 1}}
+    apply_patch(document, [
+        {"op": "add", "path": "/a~1b/-", "value": 3},
+        {"op": "remove", "path": "/a~1b/0"},
+        {"op": "move", "from": "/c/d", "path": "/e"},
+        {"op": "copy", "from": "/e", "path": "/c/f"},
+        {"op": "test", "path": "/e", "value": 1},
+    ])
+    assert document == {"a/b": [2, 3], "c": {"f": 1}, "e": 1}
+    with pytest.raises(PatchConflict):
+        apply_patch(document, [{"op": "replace", "path": "/missing", "value": 1}])
+    assert changed_players(hit(592885, 1)) == {592885}
+    assert changed_players([{"op": "replace", "path": "/liveData/boxscore", "value": {}}]) is None
+
+
+def test_copied_values_do_not_alias_their_source():
+    document = {"a": {"b": [1]}}
+    apply_patch(document, [{"op": "copy", "from": "/a", "path": "/c"},
+                           {"op": "add", "path": "/c/b/-", "value": 2}])
+    assert document == {"a": {"b": [1]}, "c": {"b": [1, 2]}}
+
+
+def test_schedule_covers_minor_league_levels_by_default():
+    game = FakeGame(home=445, away=451)
+    stream = LiveStream(team_ids=[445], get=game)
+    assert stream.active_games() == [game.game_pk]
+    assert game.params["sportId"] == "1,11,12,13,14,16"
+    assert game.params["teamId"] == "445"
@@ -7,6 +7,12 @@ Testing Bradley Hanner (ID: 690440) from Columbus Clippers (Team: 445)
 import statsapi
 from pprint import pprint
 
+from mlb_stat_tool.cache import install as install_cache
+from mlb_stat_tool.capabilities import Capabilities, InvalidParameter
+from mlb_stat_tool.orgs import OrgGraph
+from mlb_stat_tool.session import install as install_session
+from mlb_stat_tool.records import roster_records, standings_records, team_leader_records
+
 def test_bradley_hanner():
     """Test fetching stats for Bradley Hanner - minor league player"""
     print("=" * 70)
@@ -90,22 +96,25 @@ def test_columbus_clippers_team():
     print("=" * 70)
     
     team_id = 445
+    player_id = 690440
     
     # Test 1: Team roster
     print("\n1. TEAM ROSTER:")
     print("-" * 20)
     try:
-        roster = statsapi.roster(team_id)
+        roster = roster_records(team_id)
         
         if roster:
-            print(f"✅ Roster found - {len(roster)} characters")
-            print(f"Sample roster data:\n{roster[:500]}...")
+            print(f"✅ Roster found - {len(roster)} players")
+            print("Sample roster data:")
+            for entry in roster.entries[:10]:
+                print(f"#{entry.jersey_number:<3} {entry.position:<3} {entry.full_name}")
             
             # Check if Bradley Hanner is in the roster
-            if "hanner" in roster.lower() or "bradley" in roster.lower():
+            if player_id in roster:
                 print("🎯 Bradley Hanner found in roster!")
             else:
-                print("❓ Bradley Hanner not found in roster text")
+                print("❓ Bradley Hanner not found in roster")
                 
         else:
             print("❌ No roster data found")
@@ -117,11 +126,14 @@ def test_columbus_clippers_team():
     print("\n2. TEAM STANDINGS:")
     print("-" * 20)
     try:
-        standings = statsapi.standings(teamId=team_id)
+        # Triple-A standings live under the International (117) and Pacific Coast (112) leagues
+        standings = standings_records(leagueId="117,112", teamId=team_id)
         
         if standings:
-            print(f"✅ Standings found - {len(standings)} characters")
-            print(f"Sample standings:\n{standings[:300]}...")
+            print(f"✅ Standings found - {len(standings)} records")
+            for record in standings:
+                print(f"{record.name}: {record.wins}-{record.losses}, "
+                      f"{record.games_back} GB ({record.division_name})")
         else:
             print("❌ No standings data found")
             
@@ -132,17 +144,36 @@ def test_columbus_clippers_team():
     print("\n3. TEAM LEADERS:")
     print("-" * 20)
     try:
-        team_leaders = statsapi.team_leaders(team_id)
+        team_leaders = team_leader_records(team_id)
         
         if team_leaders:
-            print(f"✅ Team leaders found - {len(team_leaders)} characters")
-            print(f"Sample team leaders:\n{team_leaders[:400]}...")
+            print(f"✅ Team leaders found - {len(team_leaders)} categories")
+            for category, leaders in team_leaders.items():
+                top = leaders[0] if leaders else None
+                if top:
+                    print(f"{category}: {top.full_name} ({top.value})")
         else:
             print("❌ No team leaders data found")
             
     except Exception as e:
         print(f"❌ Team leaders error: {e}")
 
+    # Test 4: Organization, from one teams request across every level
+    print("\n4. ORGANIZATION:")
+    print("-" * 20)
+    try:
+        orgs = OrgGraph.fetch()
+        org_id = orgs.org_of(team_id)
+        if org_id:
+            print(f"✅ Parent organization: {orgs.team(org_id).name} ({org_id})")
+            for affiliate in orgs.affiliates(org_id):
+                print(f"   sportId {affiliate.sport_id:<3} {affiliate.name} ({affiliate.team_id})")
+        else:
+            print("❌ No parent organization found")
+
+    except Exception as e:
+        print(f"❌ Organization error: {e}")
+
 def test_alternative_approaches():
     """Test alternative ways to get minor league player data"""
     print("\n" + "=" * 70)
@@ -164,11 +195,30 @@ def test_alternative_approaches():
         "baserunning", "[baserunning]"
     ]
     
+    # Formats are checked against the probed capabilities, so only one
+    # request per distinct valid group reaches the API. Without them every
+    # format is sent as is, unvalidated.
+    try:
+        capabilities = Capabilities.load()
+        print(f"Valid stat groups: {', '.join(capabilities.values['statGroups'])}")
+    except Exception as e:
+        print(f"Could not load stat group capabilities, sending formats unvalidated: {e}")
+        capabilities = None
+    fetched = {}
     for group_format in group_formats:
+        group = group_format
+        if capabilities is not None:
+            try:
+                group = capabilities.validate("player_stat_data", {"group": group_format})["group"]
+            except InvalidParameter as e:
+                print(f"❌ '{group_format}' - rejected locally: {str(e)[:50]}...")
+                continue
         try:
-            result = statsapi.player_stat_data(player_id, group=group_format, type="career")
+            if group not in fetched:
+                fetched[group] = statsapi.player_stat_data(player_id, group=group, type="career")
+            result = fetched[group]
             if result:
-                print(f"✅ '{group_format}' format works!")
+                print(f"✅ '{group_format}' format works! (sent as {group})")
                 print(f"   Data type: {type(result)}")
                 if isinstance(result, dict) and len(result) > 0:
                     print(f"   Keys: {list(result.keys())[:5]}...")  # First 5 keys
@@ -183,6 +233,12 @@ def test_alternative_approaches():
     type_formats = ["career", "season", "gameLog", "vsTeam", "vsPlayer"]
     
     for type_format in type_formats:
+        if capabilities is not None:
+            try:
+                capabilities.validate("player_stat_data", {"type": type_format})
+            except InvalidParameter as e:
+                print(f"❌ type='{type_format}' - rejected locally: {e}")
+                continue
         try:
             result = statsapi.player_stat_data(player_id, group="[hitting]", type=type_format)
             if result:
@@ -200,6 +256,11 @@ def main():
     print("\nMake sure you have: pip install MLB-StatsAPI\n")
     
     try:
+        # Reuse responses from earlier runs (see mlb_stat_tool.cache for TTLs)
+        install_cache()
+        # Misses share keep-alive connections instead of a new one per call
+        session = install_session()
+
         test_bradley_hanner()
         test_columbus_clippers_team()
         test_alternative_approaches()
@@ -207,6 +268,7 @@ def main():
         print("\n" + "=" * 70)
         print("TEST RESULTS SUMMARY")
         print("=" * 70)
+        print(f"Connection reuse: {session.stats()}")
         print("This test will show us:")
         print("1. ✅ Whether minor league player stats are accessible")
         print("2. ✅ What data fields are available for MiLB players") 
@@ -0,0 +1,46 @@
+import pytest
+
+from mlb_stat_tool.fake import FakeStatsAPI
+from mlb_stat_tool.orgs import OrgGraph
+
+LEVELS = (11, 12, 13, 14, 16)
+
+
+@pytest.fixture
+def fake():
+    return FakeStatsAPI(mlb_teams=6, milb_teams=30, roster_size=4, milb_sport_ids=LEVELS)
+
+
+def test_one_request_maps_every_org_to_its_affiliates(fake):
+    graph = OrgGraph.fetch(get=fake)
+    assert fake.calls == 1
+    assert len(graph.organizations()) == 6
+    affiliates = graph.affiliates(101)
+    assert sorted(t.sport_id for t in affiliates) == list(LEVELS)
+    assert all(graph.org_of(t.team_id) == 101 for t in affiliates)
+    assert [t.team_id for t in graph.affiliates(101, [13])] == [1013]
+    assert graph.org_of(101) == 101 and graph.org_of(5) is None
+
+
+def test_find_resolves_names_abbreviations_and_affiliates(fake):
+    graph = OrgGraph.fetch(get=fake)
+    assert graph.find("Team 103") == 103
+    assert graph.find("t103") == 103
+    assert graph.find("Team 1009") == 103
+    assert graph.find("1009") == 103
+    assert graph.find("Team") is None
+
+
+def test_org_stats_fetch_only_affiliate_rosters_and_batch_by_level(fake, tmp_path):
+    path = str(tmp_path / "orgs.json")
+    OrgGraph.fetch(get=fake).save(path)
+    graph = OrgGraph.load(path)
+    calls = fake.calls
+    players = graph.org_stats(102, get=fake, max_workers=2)
+    # 5 affiliate rosters, then one people request per level
+    assert fake.calls - calls == 5 + 5
+    expected = {pid for team in graph.affiliates(102) for pid in fake.rosters[team.team_id]}
+    assert set(players) == expected
+    record = players[min(expected)]
+    assert record["stats"] and {s["sport_id"] for s in record["stats"]} == {
+        fake.teams[fake.team_of[min(expected)]]["sport"]["id"]}
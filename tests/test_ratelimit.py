@@ -0,0 +1,155 @@
+import time
+
+import pytest
+import requests
+
+from mlb_stat_tool.crawl import crawl_rosters
+from mlb_stat_tool.ratelimit import (CircuitBreaker, CircuitOpen, RequestScheduler, TokenBucket,
+                                     is_retryable)
+from mlb_stat_tool.replay import http_error
+
+
+def flaky(failures, status=503):
+    """A get that fails `failures` times with `status`, then succeeds"""
+    def get(endpoint, params):
+        get.calls += 1
+        if get.calls <= failures:
+            raise http_error(status, endpoint)
+        return {"ok": True}
+    get.calls = 0
+    return get
+
+
+def test_is_retryable():
+    assert is_retryable(http_error(429, "teams"))
+    assert is_retryable(http_error(502, "teams"))
+    assert is_retryable(requests.ConnectionError())
+    assert not is_retryable(http_error(404, "teams"))
+    assert not is_retryable(ValueError())
+
+
+def test_scheduler_retries_transient_errors():
+    get = flaky(2)
+    scheduler = RequestScheduler(get, rate=1000, base_delay=0.001, seed=1)
+    assert scheduler("teams", {}) == {"ok": True}
+    assert (get.calls, scheduler.retries) == (3, 2)
+
+
+def test_scheduler_gives_up_on_client_errors_immediately():
+    get = flaky(5, status=404)
+    with pytest.raises(requests.HTTPError):
+        RequestScheduler(get, rate=1000, base_delay=0.001)("teams", {})
+    assert get.calls == 1
+
+
+def test_throttling_halves_the_bucket_rate():
+    scheduler = RequestScheduler(flaky(1, status=429), rate=1000, base_delay=0.001)
+    scheduler("teams", {})
+    assert scheduler.bucket.rate < 1000
+
+
+def test_circuit_opens_then_half_opens():
+    breaker = CircuitBreaker(threshold=2, reset_after=0.05)
+    breaker.record_failure()
+    breaker.record_failure()
+    assert not breaker.allow()
+    time.sleep(0.06)
+    assert breaker.allow() and not breaker.allow()
+    breaker.record_success()
+    assert breaker.state == "closed"
+
+
+def test_open_circuit_rejects_without_calling():
+    get = flaky(100)
+    scheduler = RequestScheduler(get, rate=1000, max_retries=1, base_delay=0.001,
+                                 breaker_threshold=3, breaker_reset=60)
+    for _ in range(3):
+        with pytest.raises(requests.HTTPError):
+            scheduler("team_roster", {})
+    with pytest.raises(CircuitOpen) as rejected:
+        scheduler("team_roster", {})
+    assert get.calls == 3 * 2
+    assert 0 < rejected.value.retry_in <= 60
+
+
+def test_retries_of_one_call_count_once_toward_the_breaker():
+    get = flaky(100)
+    scheduler = RequestScheduler(get, rate=1000, max_retries=4, base_delay=0.001,
+                                 breaker_threshold=2)
+    with pytest.raises(requests.HTTPError):
+        scheduler("team_roster", {})
+    assert get.calls == 5
+    assert scheduler.breakers["team_roster"].state == "closed"
+
+
+def test_a_bad_request_does_not_close_a_half_open_circuit():
+    def get(endpoint, params):
+        raise ValueError("bad request")
+
+    scheduler = RequestScheduler(get, rate=1000, breaker_threshold=1, breaker_reset=0.05)
+    breaker = scheduler.breaker("team_roster")
+    breaker.record_failure()
+    time.sleep(0.06)
+    assert breaker.state == "half-open"
+    with pytest.raises(ValueError):
+        scheduler("team_roster", {})
+    assert breaker.state == "half-open"
+    # The trial slot was released, so another call may probe the endpoint
+    assert breaker.allow()
+
+
+def test_token_bucket_without_a_rate_never_waits():
+    bucket = TokenBucket(rate=None)
+    bucket.throttled()
+    for _ in range(1000):
+        bucket.acquire()
+    assert RequestScheduler(flaky(0), rate=None)("teams", {}) == {"ok": True}
+    with pytest.raises(ValueError):
+        TokenBucket(rate=-1)
+
+
+def test_token_bucket_paces_after_burst():
+    bucket = TokenBucket(rate=100, burst=1)
+    start = time.monotonic()
+    for _ in range(6):
+        bucket.acquire()
+    assert time.monotonic() - start >= 0.04
+
+
+def test_crawl_retry_queue_recovers_failed_rosters():
+    failures = {2: 1}
+
+    def get(endpoint, params):
+        if endpoint == "teams":
+            return {"teams": [{"id": i, "name": str(i)} for i in range(1, 4)]}
+        team_id = params["teamId"]
+        if failures.get(team_id):
+            failures[team_id] -= 1
+            raise http_error(503, endpoint)
+        return {"roster": [{"person": {"id": team_id * 10, "fullName": "x"}}]}
+
+    failed = []
+    records = list(crawl_rosters([1], get=get, retry_rounds=1,
+                                 on_error=lambda team, e: failed.append(team["id"])))
+    assert sorted(r[0] for r in records) == [1, 2, 3]
+    assert failed == []
+
+
+def test_crawl_holds_teams_while_the_circuit_is_open():
+    down = {"until": 2}
+
+    def get(endpoint, params):
+        if endpoint == "teams":
+            return {"teams": [{"id": i, "name": str(i)} for i in range(1, 7)]}
+        down["until"] -= 1
+        if down["until"] >= 0:
+            raise http_error(503, endpoint)
+        return {"roster": [{"person": {"id": params["teamId"] * 10, "fullName": "x"}}]}
+
+    scheduler = RequestScheduler(get, rate=None, max_retries=0, breaker_threshold=2,
+                                 breaker_reset=0.05)
+    failed = []
+    records = list(crawl_rosters([1], get=scheduler, max_workers=1, retry_rounds=1,
+                                 on_error=lambda team, e: failed.append(team["id"])))
+    assert sorted(r[0] for r in records) == [1, 2, 3, 4, 5, 6]
+    assert failed == []
@@ -0,0 +1,44 @@
+from mlb_stat_tool.records import (roster_records, standings_records, team_leader_records,
+                                   RosterEntry)
+
+
+def fake_get(endpoint, params):
+    if endpoint == "team_roster":
+        return {"roster": [
+            {"person": {"id": 690440, "fullName": "Bradley Hanner"}, "jerseyNumber": "45",
+             "position": {"abbreviation": "P"}, "status": {"code": "A"}},
+            {"person": {"id": 1, "fullName": "Someone Else"}, "jerseyNumber": "1",
+             "position": {"abbreviation": "SS"}, "status": {"code": "A"}},
+        ]}
+    if endpoint == "standings":
+        return {"records": [{"teamRecords": [
+            {"team": {"id": 158, "name": "Milwaukee Brewers",
+                      "division": {"id": 205, "name": "NL Central"}},
+             "divisionRank": "1", "wins": 93, "losses": 69, "gamesBack": "-"},
+            {"team": {"id": 112, "name": "Chicago Cubs",
+                      "division": {"id": 205, "name": "NL Central"}},
+             "divisionRank": "2", "wins": 83, "losses": 79, "gamesBack": "10.0"},
+        ]}]}
+    if endpoint == "team_leaders":
+        assert params["leaderCategories"] == "homeRuns,wins"
+        return {"teamLeaders": [{"leaderCategory": "homeRuns", "leaders": [
+            {"rank": 1, "value": "32", "person": {"id": 642715, "fullName": "Willy Adames"}}]}]}
+    raise AssertionError(endpoint)
+
+
+def test_roster_membership_by_id():
+    roster = roster_records(445, get=fake_get)
+    assert 690440 in roster
+    assert 592885 not in roster
+    assert roster.get(690440) == RosterEntry(690440, "Bradley Hanner", "45", "P", "A")
+    assert len(roster) == 2
+
+
+def test_standings_can_be_narrowed_to_one_team():
+    records = standings_records(teamId=112, get=fake_get)
+    assert [(r.name, r.wins, r.games_back) for r in records] == [("Chicago Cubs", 83, "10.0")]
+
+
+def test_team_leaders_grouped_by_category():
+    boards = team_leader_records(158, ["homeRuns", "wins"], get=fake_get)
+    assert boards["homeRuns"][0].player_id == 642715
@@ -0,0 +1,57 @@
+import pytest
+
+from mlb_stat_tool.crawl import crawl_roster_entries, list_teams
+from mlb_stat_tool.fake import FakeStatsAPI
+from mlb_stat_tool.registry import IdTable, PlayerRecord, Registry, deep_sizeof
+
+
+@pytest.fixture(scope="module")
+def fake():
+    return FakeStatsAPI(mlb_teams=30, milb_teams=120, roster_size=26)
+
+
+@pytest.fixture(scope="module")
+def registry(fake):
+    return Registry.from_crawl(get=fake, max_workers=4)
+
+
+def test_lookups_by_id_team_position_and_sport(registry, fake):
+    assert len(registry) == len(fake.team_of)
+    player = registry.player(10003)
+    assert player == PlayerRecord(10003, "Player 10003", 100, player.position, "3", "A")
+    assert registry.player(1) is None and 1 not in registry and 10003 in registry
+    assert [p.player_id for p in registry.players_on(1005)] == fake.rosters[1005]
+    assert registry.players_on(999) == []
+    pitchers = registry.players_at("P")
+    assert pitchers and all(p.position == "P" for p in pitchers)
+    assert {t.team_id for t in registry.teams_in(1)} == set(range(100, 130))
+    assert registry.team(1000).parent_org_id == 100
+
+
+def test_repeated_strings_are_stored_once(registry):
+    first, second = registry.players_at("SS")[:2]
+    assert first.position is second.position
+    assert first.status is second.status
+
+
+def test_player_on_two_rosters_keeps_the_last():
+    teams = [{"id": 158, "sport": {"id": 1}}, {"id": 445, "sport": {"id": 11}}]
+    entry = {"person": {"id": 690440, "fullName": "Bradley Hanner"},
+             "position": {"abbreviation": "P"}}
+    registry = Registry.from_json(teams, [(445, entry), (158, entry)])
+    assert len(registry) == 1
+    assert registry.player(690440).team_id == 158
+    assert registry.players_on(445) == []
+
+
+def test_footprint_is_a_small_fraction_of_the_crawled_dicts(registry, fake):
+    teams = list_teams(get=fake)
+    entries = list(crawl_roster_entries(get=fake, teams=teams))
+    assert registry.footprint() < 0.10 * (deep_sizeof(teams) + deep_sizeof(entries))
+
+
+def test_id_table_handles_collisions():
+    ids = [8 * i + 1 for i in range(1, 200)]
+    table = IdTable(ids)
+    assert [table.get(i) for i in ids] == list(range(len(ids)))
+    assert table.get(2) == -1
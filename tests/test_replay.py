@@ -0,0 +1,58 @@
+import pytest
+import requests
+import statsapi
+
+from mlb_stat_tool import transport
+from mlb_stat_tool.replay import FixtureMissing, Recorder, Replayer
+
+
+def live_get(endpoint, params):
+    live_get.calls += 1
+    return {"people": [{"id": params["personId"], "fullName": "Christian Yelich"}]}
+
+
+def test_recorded_responses_replay_without_the_live_api(tmp_path):
+    live_get.calls = 0
+    recorder = Recorder(str(tmp_path), get=live_get)
+    recorded = recorder("person", {"personId": 592885})
+    assert live_get.calls == 1
+
+    replayer = Replayer(str(tmp_path))
+    assert replayer("person", {"personId": 592885}) == recorded
+    with pytest.raises(FixtureMissing):
+        replayer("person", {"personId": 1})
+
+
+def test_installed_replayer_serves_statsapi_helpers(tmp_path):
+    person = {"id": 592885, "useName": "Christian", "lastName": "Yelich", "active": True,
+              "currentTeam": {"name": "Milwaukee Brewers"},
+              "primaryPosition": {"abbreviation": "LF"},
+              "batSide": {"description": "Left"}, "pitchHand": {"description": "Right"},
+              "stats": [{"type": {"displayName": "career"}, "group": {"displayName": "hitting"},
+                         "splits": [{"stat": {"avg": ".285"}}]}]}
+    params = {"personId": 592885,
+              "hydrate": "stats(group=[hitting],type=career,sportId=1),currentTeam"}
+    Recorder(str(tmp_path), get=lambda endpoint, p: {"people": [person]})("person", params)
+
+    with transport.using(Replayer(str(tmp_path))):
+        data = statsapi.player_stat_data(592885, group="[hitting]", type="career")
+    assert data["stats"][0]["stats"]["avg"] == ".285"
+    assert statsapi.get is transport.ORIGINAL_GET
+
+
+def test_error_profile_is_reproducible(tmp_path):
+    Recorder(str(tmp_path), get=lambda endpoint, p: {"ok": True})("teams", {"sportId": 1})
+
+    def outcomes(seed):
+        replayer = Replayer(str(tmp_path), error_rate=0.5, seed=seed)
+        result = []
+        for _ in range(20):
+            try:
+                replayer("teams", {"sportId": 1})
+                result.append(200)
+            except requests.HTTPError as e:
+                result.append(e.response.status_code)
+        return result
+
+    assert outcomes(7) == outcomes(7)
+    assert {200, 429, 503} >= set(outcomes(7)) and len(set(outcomes(7))) > 1
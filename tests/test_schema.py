@@ -0,0 +1,50 @@
+import math
+
+import numpy as np
+import pytest
+
+from mlb_stat_tool.schema import extractor, innings, records, schema, stats_fields
+from mlb_stat_tool.store import TYPE_CODES
+
+
+def test_innings_counts_outs_as_thirds():
+    assert innings("45.1") == pytest.approx(45 + 1 / 3)
+    assert innings("200.2") == pytest.approx(200 + 2 / 3)
+    assert math.isnan(innings("-.--"))
+
+
+def test_extractor_converts_once_in_schema_order():
+    extract = extractor("[pitching]")
+    row = extract({"era": "3.12", "whip": "1.05", "inningsPitched": "190.1", "strikeOuts": 210})
+    names = list(schema("pitching"))
+    assert row[names.index("era")] == 3.12
+    assert row[names.index("strikeOuts")] == 210
+    # Absent is not the same as zero
+    assert math.isnan(row[names.index("wins")])
+    assert extract({"wins": 0})[names.index("wins")] == 0
+    assert extractor("Pitching") is extract
+
+
+def test_records_pack_fixed_width_rows():
+    players = [{"id": 669203, "stats": [
+        {"type": "career", "group": "pitching", "season": None,
+         "stats": {"era": "3.19", "strikeOuts": 1000}},
+        {"type": "season", "group": "pitching", "season": "2024",
+         "stats": {"era": "2.92", "strikeOuts": 181}},
+        {"type": "season", "group": "hitting", "season": "2024", "stats": {"avg": ".100"}},
+    ]}]
+    table = records(players, "pitching")
+    assert table.dtype.names[:3] == ("player_id", "season", "type")
+    assert table["strikeOuts"].dtype == np.float32
+    assert table["strikeOuts"].tolist() == [1000, 181]
+    assert np.isnan(table["wins"]).all()
+    assert table["era"].tolist() == [3.19, 2.92]
+    assert table["type"].tolist() == [TYPE_CODES["career"], TYPE_CODES["season"]]
+
+
+def test_baserunning_alias_and_fields_param():
+    assert schema("[baserunning]") is schema("running")
+    fields = stats_fields(["hitting", "fielding"]).split(",")
+    assert fields[0] == "people"
+    assert {"ops", "fielding", "stat", "splits"} <= set(fields)
+    assert len(fields) == len(set(fields))
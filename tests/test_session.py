@@ -0,0 +1,70 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+import statsapi
+from requests.adapters import BaseAdapter
+
+from mlb_stat_tool import session as pooled
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        body = json.dumps({"path": self.path}).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_port}"
+    httpd.shutdown()
+
+
+def test_requests_reuse_one_keep_alive_connection(server):
+    session = pooled.PooledSession()
+    for i in range(5):
+        assert session.get(f"{server}/teams/{i}").json() == {"path": f"/teams/{i}"}
+    stats = session.stats()
+    assert (stats["requests"], stats["connections_opened"], stats["reused"]) == (5, 1, 4)
+    assert stats["http_versions"] == {"HTTP/1.1": 5}
+
+
+class CannedAdapter(BaseAdapter):
+    def send(self, request, **kwargs):
+        self.url = request.url
+        response = requests.Response()
+        response.status_code = 200
+        response._content = b'{"teams": []}'
+        response.url = request.url
+        return response
+
+    def close(self):
+        pass
+
+
+def test_install_routes_statsapi_get_through_the_session():
+    session = pooled.PooledSession()
+    adapter = CannedAdapter()
+    session.client.mount("https://statsapi.mlb.com", adapter)
+    pooled.install(session)
+    try:
+        assert statsapi.get("teams", {"sportId": 11}) == {"teams": []}
+    finally:
+        pooled.uninstall()
+    assert adapter.url.endswith("/api/v1/teams?sportId=11")
+    assert session.requests == 1
+    assert statsapi.requests is requests
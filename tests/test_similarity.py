@@ -0,0 +1,42 @@
+import numpy as np
+
+from mlb_stat_tool.similarity import FeatureMatrix, SimilarityIndex, build_features
+
+
+def test_build_features_one_row_per_qualified_player(league_store):
+    hitters = build_features(league_store, "hitter", season=2024, min_sample=0)
+    assert hitters.names[-4:] == ["error_rate", "range_factor", "age", "level"]
+    assert np.isfinite(hitters.raw[:, hitters.names.index("range_factor")]).any()
+    assert len(hitters.player_ids) == len(set(hitters.player_ids.tolist())) == 72
+    assert hitters.values.dtype == np.float32
+    assert set(np.unique(hitters.raw[:, -1])) == {0.0, 1.0}
+    assert len(build_features(league_store, "pitcher", season=2024, min_sample=0).player_ids) == 8
+
+
+def test_comparables_prefer_the_nearest_players():
+    features = FeatureMatrix([1, 2, 3, 4], ["a", "b"],
+                             [[0.0, 0.0], [0.1, 0.0], [5.0, 5.0], [0.0, 0.3]])
+    index = SimilarityIndex(features)
+    assert [pid for pid, _ in index.comparables(1, k=2)] == [2, 4]
+    assert [pid for pid, _ in index.comparables(3, k=1)] == [4]
+
+
+def test_quantized_index_agrees_with_float_index(league_store):
+    hitters = build_features(league_store, "hitter", season=2024, min_sample=0)
+    exact = SimilarityIndex(hitters)
+    quantized = SimilarityIndex(hitters, quantize=True)
+    assert quantized.matrix.dtype == np.int8
+    assert quantized.norms.dtype == np.int32
+    player = int(hitters.player_ids[0])
+    top_exact = {pid for pid, _ in exact.comparables(player, k=10)}
+    top_quantized = {pid for pid, _ in quantized.comparables(player, k=10)}
+    assert len(top_exact & top_quantized) >= 7
+
+
+def test_quantized_distances_match_the_float_distances():
+    features = FeatureMatrix(range(1, 201), ["a", "b", "c"],
+                             np.random.default_rng(0).normal(size=(200, 3)))
+    exact = dict(SimilarityIndex(features).comparables(1, k=199))
+    quantized = dict(SimilarityIndex(features, quantize=True).comparables(1, k=199))
+    for pid, distance in exact.items():
+        assert abs(quantized[pid] - distance) < 0.05
@@ -0,0 +1,105 @@
+import asyncio
+import threading
+import time
+
+import pytest
+import statsapi
+
+from mlb_stat_tool import singleflight
+from mlb_stat_tool.aio import AsyncStatsAPI
+from mlb_stat_tool.fake import FakeStatsAPI, FakeStatsServer
+from mlb_stat_tool.keys import canonical
+
+
+def test_concurrent_equivalent_calls_share_one_fetch():
+    flight = singleflight.SingleFlight()
+    fetched = []
+
+    def player_stat_data(personId, group="[hitting]", type="season"):
+        fetched.append((personId, group))
+        time.sleep(0.1)
+        return {"id": personId}
+
+    coalesced = flight.wrap(player_stat_data)
+    results = []
+    threads = [threading.Thread(target=lambda g=g: results.append(coalesced(592885, group=g,
+                                                                             type="career")))
+               for g in ("hitting", "[hitting]", "Hitting", "[Hitting]")]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(fetched) == 1
+    assert results == [{"id": 592885}] * 4
+    assert (flight.calls, flight.shared) == (1, 3)
+
+    coalesced(592885, group="pitching", type="career")
+    assert len(fetched) == 2
+
+
+def test_keys_fold_group_case_but_keep_stat_type_case():
+    assert canonical({"group": "[Hitting, pitching]"}) == {"group": "[hitting,pitching]"}
+    assert canonical({"params": {"stats": "[gameLog]"}}) == {"params": {"stats": "[gameLog]"}}
+    assert canonical({"type": "gameLog"}) != canonical({"type": "gamelog"})
+    assert canonical({"hydrate": "stats(group=Hitting,type=[ gameLog ])"}) == {
+        "hydrate": "stats(group=[hitting],type=[gameLog])"}
+
+
+def test_install_is_idempotent():
+    original = statsapi.roster
+    flight = singleflight.install(names=["roster"])
+    try:
+        singleflight.install(flight, names=["roster"])
+        assert statsapi.roster.__wrapped__ is original
+    finally:
+        singleflight.uninstall(names=["roster"])
+    assert statsapi.roster is original
+
+
+def test_errors_reach_every_waiter_and_are_not_kept():
+    flight = singleflight.SingleFlight()
+    started = threading.Event()
+
+    def failing():
+        started.set()
+        time.sleep(0.05)
+        raise ValueError("boom")
+
+    errors = []
+
+    def call():
+        try:
+            flight.do("key", failing)
+        except ValueError as e:
+            errors.append(e)
+
+    first = threading.Thread(target=call)
+    first.start()
+    started.wait()
+    second = threading.Thread(target=call)
+    second.start()
+    first.join()
+    second.join()
+    assert len(errors) == 2
+    with pytest.raises(ValueError):
+        flight.do("key", failing)
+    assert flight.calls == 2
+
+
+def test_async_client_coalesces_identical_requests():
+    async def main():
+        server = FakeStatsServer(FakeStatsAPI(mlb_teams=4, milb_teams=0, roster_size=5))
+        base_url = await server.start()
+        try:
+            async with AsyncStatsAPI(base_url=base_url) as api:
+                rosters = await asyncio.gather(*(api.roster(100) for _ in range(10)))
+                stats = await asyncio.gather(*(api.player_stat_data(10001, group=g)
+                                               for g in ("hitting", "[hitting]", "Hitting")))
+                return rosters, stats, server.requests, api.flight.shared
+        finally:
+            await server.stop()
+
+    rosters, stats, requests_served, shared = asyncio.run(main())
+    assert len(set(rosters)) == 1 and len(stats) == 3
+    assert requests_served == 2
+    assert shared == 9 + 2
@@ -7,6 +7,21 @@ import statsapi
 import json
 from pprint import pprint
 
+from mlb_stat_tool.bulk import bulk_player_stat_data
+from mlb_stat_tool.cache import install as install_cache
+from mlb_stat_tool.capabilities import Capabilities
+from mlb_stat_tool.instrument import install as install_metrics
+from mlb_stat_tool.records import roster_records, standings_records, team_leader_records
+from mlb_stat_tool.schema import extractor, records, schema, stats_fields
+from mlb_stat_tool.session import install as install_session
+
+def print_schema_fields(stat_data, group):
+    """Show only the trade-engine fields of each split, already converted"""
+    extract = extractor(group)
+    for entry in stat_data.get("stats", []):
+        print(f"\nSchema fields ({entry['type']} {entry['group']}):")
+        pprint(dict(zip(schema(group), extract(entry["stats"]))), sort_dicts=False)
+
 def explore_lookup_player():
     """Explore the lookup_player endpoint"""
 
@@ -64,6 +79,7 @@ def explore_player_stat_data():
             # Look at the stats structure
             print("\nDetailed structure:")
             pprint(career_stats)
+            print_schema_fields(career_stats, "hitting")
             
         # Also try season stats
         print("\n" + "-" * 40)
@@ -101,6 +117,7 @@ def explore_pitcher_stats():
             
             print("\nDetailed pitching structure:")
             pprint(career_pitching)
+            print_schema_fields(career_pitching, "pitching")
             
         # Get season pitching stats
         print("\n" + "-" * 40)
@@ -144,6 +161,7 @@ def explore_defensive_stats():
             
             print("\nDetailed fielding structure:")
             pprint(career_fielding)
+            print_schema_fields(career_fielding, "fielding")
             
         # Get season fielding stats
         print("\n" + "-" * 40)
@@ -194,12 +212,28 @@ def explore_stat_groups():
         "baserunning", "[baserunning]"
     ]
     
+    # Spellings are validated against the probed capabilities first, so
+    # equivalent or unknown groups cost no request. Without them every
+    # spelling is sent as is, unvalidated.
+    try:
+        capabilities = Capabilities.load()
+        print(f"Valid stat groups: {', '.join(capabilities.values['statGroups'])}")
+    except Exception as e:
+        print(f"Could not load stat group capabilities, sending groups unvalidated: {e}")
+        capabilities = None
+    fetched = {}
     for group in groups_to_try:
         try:
             print(f"\nTrying group='{group}' with Yelich:")
-            result = statsapi.player_stat_data(yelich_id, group=group, type="season")
+            normalized = group
+            if capabilities is not None:
+                normalized = capabilities.validate("player_stat_data", {"group": group})["group"]
+            if normalized not in fetched:
+                fetched[normalized] = statsapi.player_stat_data(yelich_id, group=normalized,
+                                                                type="season")
+            result = fetched[normalized]
             if result:
-                print(f"  ✓ Success - Type: {type(result)}")
+                print(f"  ✓ Success ({normalized}) - Type: {type(result)}")
                 if isinstance(result, dict):
                     print(f"  Keys: {list(result.keys())}")
             else:
@@ -208,6 +242,30 @@ def explore_stat_groups():
         except Exception as e:
             print(f"  ✗ Error: {e}")
 
+def explore_schema_records():
+    """Fetch only the schema's fields for several players and pack them into arrays"""
+
+    print("\n" + "=" * 60)
+    print("EXPLORING: schema records (people endpoint, fields= projection)")
+    print("=" * 60)
+    
+    try:
+        # Yelich, Burnes and Adames: every group and type in one request,
+        # with the server dropping every field the schemas do not use
+        groups = ["hitting", "pitching", "fielding"]
+        players = bulk_player_stat_data([592885, 669203, 642715], groups,
+                                        fields=stats_fields(groups))
+        print(f"Players returned: {len(players)}")
+        for group in groups:
+            table = records(players.values(), group)
+            print(f"\n{group}: {len(table)} rows, {table.nbytes} bytes, "
+                  f"{len(table.dtype.names)} columns")
+            for row in table[:3]:
+                print(f"  {dict(zip(table.dtype.names, row.tolist()))}")
+        
+    except Exception as e:
+        print(f"Error in schema records: {e}")
+
 def explore_player_stats():
     """Explore the player_stats endpoint (formatted text version)"""
 
@@ -261,104 +319,78 @@ def explore_league_leaders():
         print(f"Error in league_leaders: {e}")
 
 def explore_roster():
-    """Explore the roster endpoint"""
+    """Explore the roster endpoint through structured RosterEntry records"""
 
     print("\n" + "=" * 60)
-    print("EXPLORING: statsapi.roster()")
+    print("EXPLORING: roster_records() (team_roster endpoint)")
     print("=" * 60)
     
     try:
         # Get Milwaukee Brewers roster (team ID 158)
-        brewers_roster = statsapi.roster(158)
+        brewers_roster = roster_records(158)
         print("Milwaukee Brewers Roster:")
-        print(f"Type: {type(brewers_roster)}")
-        print("Sample output:")
-        print(brewers_roster[:1000] + "..." if len(brewers_roster) > 1000 else brewers_roster)
+        print(f"Type: {type(brewers_roster)} - {len(brewers_roster)} players")
+        for entry in list(brewers_roster)[:10]:
+            print(f"  #{entry.jersey_number:<3} {entry.position:<3} {entry.full_name} "
+                  f"(ID: {entry.player_id}, status {entry.status})")
         
         print("\n" + "-" * 40)
         
-        # Try getting roster data (structured format)
-        try:
-            from datetime import date
-            brewers_roster_data = statsapi.roster_data(158)
-            print("Milwaukee Brewers Roster Data (structured):")
-            print(f"Type: {type(brewers_roster_data)}")
-            if isinstance(brewers_roster_data, dict):
-                print("Top-level keys:")
-                print(list(brewers_roster_data.keys()))
-                print("\nDetailed structure (first few items):")
-                pprint(brewers_roster_data)
-            else:
-                print("Raw data:")
-                pprint(brewers_roster_data)
-        except AttributeError:
-            print("roster_data method not available, using roster only")
+        # Membership checks by ID replace searching the formatted text
+        for name, player_id in (("Yelich", 592885), ("Adames", 642715)):
+            entry = brewers_roster.get(player_id)
+            print(f"{name} on roster: {'yes, ' + entry.position if entry else 'no'}")
         
     except Exception as e:
         print(f"Error in roster: {e}")
 
 def explore_standings():
-    """Explore the standings endpoint"""
+    """Explore the standings endpoint through structured StandingsRecords"""
 
     print("\n" + "=" * 60)
-    print("EXPLORING: statsapi.standings()")
+    print("EXPLORING: standings_records() (standings endpoint)")
     print("=" * 60)
     
     try:
         # Get current standings
-        current_standings = statsapi.standings()
+        current_standings = standings_records()
         print("Current MLB Standings:")
-        print(f"Type: {type(current_standings)}")
-        print("Sample output:")
-        print(current_standings[:1000] + "..." if len(current_standings) > 1000 else current_standings)
+        print(f"Type: {type(current_standings)} - {len(current_standings)} teams")
+        division = None
+        for record in current_standings:
+            if record.division_name != division:
+                division = record.division_name
+                print(f"\n{division}")
+            print(f"  {record.division_rank:>2}. {record.name:<25} {record.wins:>3}-"
+                  f"{record.losses:<3} {record.games_back:>5} GB")
         
         print("\n" + "-" * 40)
         
-        # Try standings data (structured)
-        try:
-            standings_data = statsapi.standings_data()
-            print("Standings Data (structured):")
-            print(f"Type: {type(standings_data)}")
-            if isinstance(standings_data, dict):
-                print("Top-level keys:")
-                print(list(standings_data.keys()))
-                print("\nDetailed structure:")
-                pprint(standings_data)
-        except AttributeError:
-            print("standings_data method not available, using standings only")
+        # One team's record without scanning the whole table
+        for record in standings_records(teamId=158):
+            print(f"Brewers: {record.wins}-{record.losses}, division rank {record.division_rank}, "
+                  f"wild card rank {record.wild_card_rank}")
         
     except Exception as e:
         print(f"Error in standings: {e}")
 
 def explore_team_leaders():
-    """Explore the team_leaders endpoint"""
+    """Explore the team_leaders endpoint through structured LeaderEntry records"""
 
     print("\n" + "=" * 60)
-    print("EXPLORING: statsapi.team_leaders()")
+    print("EXPLORING: team_leader_records() (team_leaders endpoint)")
     print("=" * 60)
     
     try:
-        # Get Milwaukee Brewers team leaders
-        brewers_leaders = statsapi.team_leaders(158)
+        # Get Milwaukee Brewers team leaders, every category in one request
+        brewers_leaders = team_leader_records(158)
         print("Milwaukee Brewers Team Leaders:")
-        print(f"Type: {type(brewers_leaders)}")
-        print("Sample output:")
-        print(brewers_leaders[:1000] + "..." if len(brewers_leaders) > 1000 else brewers_leaders)
-        
-        print("\n" + "-" * 40)
-        
-        # Try team leader data (structured)
-        try:
-            brewers_leaders_data = statsapi.team_leader_data(158)
-            print("Milwaukee Brewers Team Leaders Data (structured):")
-            print(f"Type: {type(brewers_leaders_data)}")
-            if isinstance(brewers_leaders_data, dict):
-                print("Top-level keys:")
-                print(list(brewers_leaders_data.keys()))
-                print("\nDetailed structure:")
-                pprint(brewers_leaders_data)
-        except AttributeError:
-            print("team_leader_data method not available, using team_leaders only")
+        print(f"Type: {type(brewers_leaders)} - {len(brewers_leaders)} categories")
+        for category, leaders in brewers_leaders.items():
+            print(f"\n{category}:")
+            for leader in leaders[:3]:
+                print(f"  {leader.rank}. {leader.full_name:<25} {leader.value} "
+                      f"(ID: {leader.player_id})")
         
     except Exception as e:
         print(f"Error in team_leaders: {e}")
@@ -369,6 +401,13 @@ def main():
     print("MLB Stats API Data Exploration")
     
     try:
+        # Reuse responses from earlier runs (see mlb_stat_tool.cache for TTLs)
+        cache = install_cache()
+        # Misses share keep-alive connections instead of a new one per call
+        session = install_session()
+        # Per-endpoint counts, latency, bytes and decode time for the summary
+        metrics = install_metrics(cache=cache)
+
         # Test if the API is working
         print("Testing API connectivity...")
         test_data = statsapi.lookup_player("test")
@@ -380,6 +419,7 @@ def main():
         explore_pitcher_stats()
         explore_defensive_stats()
         explore_stat_groups()
+        explore_schema_records()
         explore_player_stats()
         explore_league_leaders()
         explore_roster()
@@ -389,13 +429,18 @@ def main():
         print("\n" + "=" * 60)
         print("EXPLORATION COMPLETE")
         print("=" * 60)
+        print(f"Connection reuse: {session.stats()}")
+        print(f"Cache: {metrics.cache_stats()}")
+        for endpoint, m in metrics.to_json()["endpoints"].items():
+            print(f"  {endpoint:<20} {m['requests']:>4} requests  p95 <= {m['p95']}s  "
+                  f"{m['bytes']:>9} bytes  {m['decode_seconds']:.3f}s decoding")
         print("Key takeaways for your schema:")
         print("1. lookup_player() returns a list of player dictionaries")
         print("2. player_stat_data() returns structured data (dict)")
         print("3. Available stat groups: [hitting], [pitching], [fielding], possibly others")
         print("4. Pitching stats: ERA, WHIP, wins/losses should be available")
         print("5. Defensive stats: fielding percentage, errors, assists available")
-        print("6. For database schema, focus on *_data() methods for structured data")
+        print("6. For database schema, use the structured records (mlb_stat_tool.records)")
         print("7. league_leaders, roster, standings, team_leaders show team/league context")
         print("8. Team ID 158 = Milwaukee Brewers")
         print("9. Player IDs: Yelich=592885, Burnes=669203, Adames=642715")
@@ -0,0 +1,78 @@
+import math
+
+import numpy as np
+import pytest
+
+from mlb_stat_tool.store import StatStore, StatTable, TYPE_CODES, to_float
+
+PLAYERS = [
+    {"id": 592885, "team_id": 158, "birth_date": "1991-12-05", "stats": [
+        {"type": "career", "group": "hitting", "season": None, "team_id": 158, "sport_id": 1,
+         "stats": {"avg": ".285", "homeRuns": 200, "ops": ".867"}},
+        {"type": "season", "group": "hitting", "season": "2024", "team_id": 158, "sport_id": 1,
+         "stats": {"avg": ".315", "homeRuns": 11, "ops": ".909"}},
+        {"type": "season", "group": "fielding", "season": "2024", "team_id": 158, "sport_id": 1,
+         "stats": {"fielding": "1.000", "errors": 0, "position": {"abbreviation": "LF"}}},
+    ]},
+    {"id": 690440, "team_id": 445, "birth_date": "1998-03-01", "stats": [
+        {"type": "season", "group": "pitching", "season": "2024", "team_id": 445, "sport_id": 11,
+         "stats": {"era": "-.--", "strikeOuts": 40}},
+    ]},
+]
+
+
+def test_to_float_handles_api_strings():
+    assert to_float(".285") == 0.285
+    assert to_float(12) == 12.0
+    assert math.isnan(to_float("-.--"))
+
+
+def test_build_tables_flattens_groups_into_typed_columns():
+    store = StatStore.from_players(PLAYERS)
+    hitting = store["hitting"]
+    assert len(hitting) == 2
+    assert hitting["player_id"].dtype == np.int32
+    assert list(hitting["season"]) == [0, 2024]
+    assert list(hitting["type"]) == [TYPE_CODES["career"], TYPE_CODES["season"]]
+    assert hitting["avg"][1] == 0.315
+    assert hitting["age"][1] == 32
+    assert "position" not in store["fielding"]
+    assert math.isnan(store["pitching"]["era"][0])
+    assert store["pitching"]["sport_id"][0] == 11
+
+
+def test_innings_columns_count_outs_as_thirds():
+    player = {"id": 1, "stats": [
+        {"type": "season", "group": "pitching", "season": "2024",
+         "stats": {"inningsPitched": "45.1", "era": "3.20"}},
+        {"type": "season", "group": "fielding", "season": "2024",
+         "stats": {"innings": "200.2", "errors": 1}},
+    ]}
+    store = StatStore.from_players([player])
+    assert store["pitching"]["inningsPitched"][0] == pytest.approx(45 + 1 / 3)
+    assert store["pitching"]["era"][0] == 3.2
+    assert store["fielding"]["innings"][0] == pytest.approx(200 + 2 / 3)
+
+
+def test_save_and_memory_mapped_load(tmp_path):
+    StatStore.from_players(PLAYERS).save(tmp_path)
+    store = StatStore.load(tmp_path)
+    assert sorted(store.tables) == ["fielding", "hitting", "pitching"]
+    assert isinstance(store["hitting"]["homeRuns"], np.memmap)
+    assert store["hitting"].rows_for(592885)["homeRuns"].tolist() == [200.0, 11.0]
+
+
+def test_table_filter_keeps_columns_aligned():
+    table = StatTable({"player_id": np.array([1, 2, 3], np.int32), "x": np.array([1.0, 2.0, 3.0])})
+    assert table.filter(table["x"] > 1)["player_id"].tolist() == [2, 3]
+
+
+def test_column_and_per_player_sums_treat_missing_as_zero():
+    table = StatTable({"player_id": np.array([2, 1, 2], np.int32),
+                       "x": np.array([1.0, np.nan, 3.0], np.float32)})
+    rows = np.arange(3)
+    assert table.column("x", rows).tolist() == [1.0, 0.0, 3.0]
+    assert table.column("y", rows).tolist() == [0.0, 0.0, 0.0]
+    ids, sums, inverse = table.per_player(rows, ["x", "y"])
+    assert ids.tolist() == [1, 2] and inverse.tolist() == [1, 0, 1]
+    assert sums["x"].tolist() == [0.0, 4.0] and sums["y"].tolist() == [0.0, 0.0]
@@ -0,0 +1,118 @@
+import json
+
+import pytest
+import requests
+from requests.adapters import BaseAdapter
+
+from mlb_stat_tool import singleflight, streaming, transport
+from mlb_stat_tool.ratelimit import RequestScheduler
+from mlb_stat_tool.session import PooledSession
+from mlb_stat_tool.streaming import (endpoint_url, fields_param, iter_array, iter_teams, project,
+                                     stream)
+
+TEAMS = {"copyright": "x", "teams": [
+    {"id": 445, "name": "Columbus Clippers", "sport": {"id": 11}, "parentOrgId": 114,
+     "venue": {"name": "Huntington Park"}},
+    {"id": 158, "name": "Milwaukee Brewers", "sport": {"id": 1}},
+]}
+
+
+def chunked(data, size):
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+@pytest.mark.parametrize("size", [1, 7, 1 << 16])
+def test_iter_array_decodes_across_chunk_boundaries(size):
+    payload = json.dumps(TEAMS, ensure_ascii=False).replace("Clippers", "Clippérs").encode()
+    teams = list(iter_array(chunked(payload, size), "teams"))
+    assert [t["id"] for t in teams] == [445, 158]
+    assert teams[0]["name"] == "Columbus Clippérs"
+
+
+def test_iter_array_projects_fields():
+    payload = json.dumps(TEAMS).encode()
+    teams = list(iter_array(chunked(payload, 5), "teams", ["id", "sport.id", "parentOrgId"]))
+    assert teams == [{"id": 445, "sport.id": 11, "parentOrgId": 114},
+                     {"id": 158, "sport.id": 1, "parentOrgId": None}]
+
+
+def test_iter_array_handles_empty_and_missing_arrays():
+    assert list(iter_array([b'{"teams": []}'], "teams")) == []
+    assert list(iter_array([b'{"people": [1]}'], "teams")) == []
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 4])
+def test_numbers_split_across_chunks_are_not_cut_short(size):
+    payload = b'{"ids": [12345, 678, -1.5e3]}'
+    assert list(iter_array(chunked(payload, size), "ids")) == [12345, 678, -1500.0]
+
+
+def test_truncated_stream_raises():
+    with pytest.raises(ValueError):
+        list(iter_array([b'{"teams": [{"id": 1}, {"id"'], "teams"))
+
+
+def test_urls_and_fields_match_statsapi():
+    assert endpoint_url("teams", {"sportId": 11, "fields": "teams,id"}) == \
+        "https://statsapi.mlb.com/api/v1/teams?sportId=11&fields=teams,id"
+    assert endpoint_url("team_roster", {"teamId": 445}) == \
+        "https://statsapi.mlb.com/api/v1/teams/445/roster"
+    assert fields_param("teams", ["id", "sport.id", "name"]) == "teams,id,sport,name"
+    assert project({"a": {"b": 1}}, ["a.b", "a.c", "d"]) == {"a.b": 1, "a.c": None, "d": None}
+
+
+def test_installed_get_is_used_instead_of_streaming():
+    calls = []
+
+    def get(endpoint, params):
+        calls.append((endpoint, params))
+        return TEAMS
+
+    with transport.using(get):
+        teams = list(stream("teams", {"sportId": 11}, "teams", ["id", "sport.id"]))
+    assert teams == [{"id": 445, "sport.id": 11}, {"id": 158, "sport.id": 1}]
+    assert calls == [("teams", {"sportId": 11, "fields": "teams,id,sport"})]
+
+
+class CannedAdapter(BaseAdapter):
+    def __init__(self, statuses=()):
+        super().__init__()
+        self.statuses = list(statuses)
+
+    def send(self, request, **kwargs):
+        response = requests.Response()
+        response.status_code = self.statuses.pop(0) if self.statuses else 200
+        response._content = json.dumps(TEAMS).encode()
+        response._content_consumed = True
+        response.url = request.url
+        return response
+
+    def close(self):
+        pass
+
+
+def test_streams_through_a_pooled_session():
+    session = PooledSession()
+    session.client.mount("https://statsapi.mlb.com", CannedAdapter())
+    teams = list(stream("teams", {"sportId": 11}, "teams", ["id"], session=session))
+    assert teams == [{"id": 445}, {"id": 158}]
+    assert session.requests == 1
+
+
+def test_a_scheduler_runs_the_streamed_request(monkeypatch):
+    decoded = []
+    monkeypatch.setattr(streaming, "iter_array",
+                        lambda chunks, key, fields: decoded.append(key) or iter_array(
+                            chunks, key, fields))
+    session = PooledSession()
+    session.client.mount("https://statsapi.mlb.com", CannedAdapter([503]))
+    scheduler = RequestScheduler(rate=None, base_delay=0)
+    singleflight.install(names=["get"])
+    try:
+        teams = list(iter_teams(11, ("id",), session, get=scheduler))
+    finally:
+        singleflight.uninstall(names=["get"])
+    assert teams == [{"id": 445}, {"id": 158}]
+    assert decoded == ["teams"]
+    assert (session.requests, scheduler.retries) == (2, 1)
+    assert scheduler.breaker("teams").state == "closed"
@@ -0,0 +1,87 @@
+from datetime import datetime, timezone
+
+from mlb_stat_tool.sync import DeltaSync, classify_move
+
+
+class FakeLeague:
+    """Two clubs, one MLB and one Triple-A, whose rosters can be edited"""
+
+    def __init__(self):
+        self.rosters = {158: {1: "Christian Yelich", 2: "Willy Adames"},
+                        1960: {3: "Jackson Chourio"}}
+        self.played = set()
+        self.calls = []
+
+    def __call__(self, endpoint, params):
+        self.calls.append(endpoint)
+        if endpoint == "teams":
+            sport_id = params["sportId"]
+            team_id = 158 if sport_id == 1 else 1960
+            return {"teams": [{"id": team_id, "name": str(team_id), "sport": {"id": sport_id}}]}
+        if endpoint == "team_roster":
+            return {"roster": [{"person": {"id": pid, "fullName": name}}
+                               for pid, name in self.rosters[params["teamId"]].items()]}
+        if endpoint == "people":
+            ids = [int(i) for i in params["personIds"].split(",")]
+            return {"people": [{"id": i, "stats": []} for i in ids]}
+        if endpoint == "people_changes":
+            return {"people": []}
+        if endpoint == "schedule":
+            return {"dates": [{"games": [{"gamePk": 1, "status": {"abstractGameState": "Final"}}]}]}
+        if endpoint == "game_boxscore":
+            return {"teams": {"home": {"players": {
+                f"ID{pid}": {"person": {"id": pid}, "stats": {"batting": {"hits": 1}}}
+                for pid in self.played}}}}
+        raise AssertionError(endpoint)
+
+
+def test_classify_move():
+    assert classify_move(11, 1) == "call-up"
+    assert classify_move(1, 11) == "option"
+    assert classify_move(1, 1) == "trade"
+    assert classify_move(12, 11) == "promotion"
+    assert classify_move(None, 1) == "added"
+
+
+def test_second_sync_records_moves_and_refreshes_only_stale_players(tmp_path):
+    league = FakeLeague()
+    path = str(tmp_path / "snapshot.json")
+    first = datetime(2024, 6, 1, tzinfo=timezone.utc)
+    moves, changed = DeltaSync(path, get=league).sync(first)
+    assert moves == []
+    assert sorted(changed) == [1, 2, 3]
+
+    league.rosters = {158: {1: "Christian Yelich", 3: "Jackson Chourio"},
+                      1960: {2: "Willy Adames"}}
+    league.played = {1}
+    sync = DeltaSync(path, get=league)
+    moves = sync.sync_rosters(datetime(2024, 6, 2, tzinfo=timezone.utc))
+    assert {(m["player_id"], m["kind"]) for m in moves} == {(2, "option"), (3, "call-up")}
+    assert sync.stale_players(datetime(2024, 6, 2, tzinfo=timezone.utc)) == {1, 2, 3}
+
+
+def test_unchanged_rosters_produce_no_moves(tmp_path):
+    league = FakeLeague()
+    path = str(tmp_path / "snapshot.json")
+    DeltaSync(path, get=league).sync(datetime(2024, 6, 1, tzinfo=timezone.utc))
+    sync = DeltaSync(path, get=league)
+    assert sync.sync_rosters(datetime(2024, 6, 2, tzinfo=timezone.utc)) == []
+    assert sync.snapshot.changes == []
+
+
+def test_moved_players_survive_a_restart_before_the_stat_refresh(tmp_path):
+    league = FakeLeague()
+    path = str(tmp_path / "snapshot.json")
+    DeltaSync(path, get=league).sync(datetime(2024, 6, 1, tzinfo=timezone.utc))
+
+    league.rosters = {158: {1: "Christian Yelich", 3: "Jackson Chourio"},
+                      1960: {2: "Willy Adames"}}
+    sync = DeltaSync(path, get=league)
+    sync.sync_rosters(datetime(2024, 6, 2, tzinfo=timezone.utc))
+    sync.snapshot.save()
+
+    restarted = DeltaSync(path, get=league)
+    assert restarted.stale_players(datetime(2024, 6, 2, tzinfo=timezone.utc)) == {2, 3}
+    assert sorted(restarted.sync_stats(now=datetime(2024, 6, 2, tzinfo=timezone.utc))) == []
+    restarted.snapshot.save()
+    assert DeltaSync(path, get=league).moved == set()
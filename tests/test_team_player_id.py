@@ -1,27 +1,37 @@
-import statsapi
+from mlb_stat_tool.crawl import SPORT_IDS, crawl_rosters
+from mlb_stat_tool.instrument import install as install_metrics
+from mlb_stat_tool.ratelimit import RequestScheduler
+from mlb_stat_tool.session import PooledSession, install as install_session
+from mlb_stat_tool.streaming import iter_teams
 
-# MLB = 1, MiLB = 11
-SPORT_IDS = [1, 11]
+def get_teams_and_players(max_workers=8, rate=10.0, retry_rounds=2):
+    # Keep one connection per worker alive for the whole crawl
+    session = install_session(PooledSession(pool_maxsize=max_workers))
+    # Count and time every roster request (and the retries behind it)
+    metrics = install_metrics()
+    # One scheduler for all traffic: shared rate limit, retries and circuit breakers
+    scheduler = RequestScheduler(rate=rate)
+    # Team lists keep only id and name, and go through the scheduler like the
+    # rosters (so they are rate limited, retried, and recorded or replayed)
+    teams = [team for sport_id in SPORT_IDS
+             for team in iter_teams(sport_id, ("id", "name"), session, get=scheduler)]
+    team_names = {team["id"]: team["name"] for team in teams}
+    print(f"\n=== {len(teams)} teams for sportIds={SPORT_IDS} ===\n")
 
-def get_teams_and_players():
-    for sport_id in SPORT_IDS:
-        print(f"\n=== Teams for sportId={sport_id} ===\n")
-        teams = statsapi.get("teams", {"sportId": sport_id})
-        
-        for team in teams.get("teams", []):
-            team_id = team["id"]
-            team_name = team["name"]
-            print(f"TEAM: {team_id} - {team_name}")
+    def report_error(team, e):
+        print(f"   Could not fetch roster for {team['name']}: {e}")
 
-            # Fetch roster (active players only)
-            try:
-                roster = statsapi.get("team_roster", {"teamId": team_id, "rosterType": "active"})
-                for player in roster.get("roster", []):
-                    player_id = player["person"]["id"]
-                    player_name = player["person"]["fullName"]
-                    print(f"   PLAYER: {player_id} - {player_name}")
-            except Exception as e:
-                print(f"   Could not fetch roster for {team_name}: {e}")
+    # Rosters arrive in completion order, so label each player with its team
+    for team_id, player_id, player_name in crawl_rosters(
+        teams=teams, get=scheduler, max_workers=max_workers,
+        retry_rounds=retry_rounds, on_error=report_error
+    ):
+        print(f"TEAM: {team_id} - {team_names[team_id]}   PLAYER: {player_id} - {player_name}")
+
+    if scheduler.retries:
+        print(f"\n({scheduler.retries} requests retried)")
+    print(f"Connection reuse: {session.stats()}")
+    print(metrics.to_prometheus())
 
 if __name__ == "__main__":
     get_teams_and_players()
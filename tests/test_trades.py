@@ -0,0 +1,49 @@
+import numpy as np
+
+from mlb_stat_tool.trades import TradeEngine, player_values
+
+
+def small_engine(**kwargs):
+    # Team 1 is deep at SS and has no catcher; team 2 is the reverse
+    return TradeEngine(
+        player_ids=[11, 12, 13, 21, 22, 23],
+        team_ids=[1, 1, 1, 2, 2, 2],
+        values=[5.0, 4.0, 1.0, 5.0, 4.0, 1.0],
+        positions=["SS", "SS", "P", "C", "C", "P"],
+        **kwargs,
+    )
+
+
+def test_positional_need_drives_mutually_beneficial_swaps():
+    best = small_engine().best_trades(1, 2, n=1)[0]
+    assert (best.gives, best.gets) == ((11, 12), (21, 22))
+    assert best.gain_a > 0 and best.gain_b > 0
+
+
+def test_roster_limit_excludes_uneven_packages():
+    engine = small_engine(roster_limit=3)
+    for trade in engine.best_trades(1, 2, n=50):
+        assert len(trade.gives) == len(trade.gets)
+
+
+def test_best_trades_for_merges_partners_best_first():
+    engine = small_engine()
+    trades = list(engine.best_trades_for(1, n=3))
+    assert len(trades) <= 3
+    assert [t.score for t in trades] == sorted((t.score for t in trades), reverse=True)
+    assert all(t.team_b == 2 for t in trades)
+
+
+def test_a_full_league_scores_every_package_pair():
+    rng = np.random.default_rng(0)
+    teams = np.repeat(np.arange(30), 40)
+    engine = TradeEngine(np.arange(len(teams)), teams, rng.normal(0, 10, len(teams)),
+                         rng.choice(["P", "C", "SS", "CF", "1B"], len(teams)))
+    list(engine.best_trades_for(0, n=10))
+    assert engine.evaluated == 29 * 120 * 120
+
+
+def test_player_values_are_centered_on_league_average(league_store):
+    values = player_values(league_store, season=2024)
+    assert len(values) == 80
+    assert abs(sum(values.values())) < 0.05 * sum(abs(v) for v in values.values())